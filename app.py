@@ -50,8 +50,9 @@ def main():
     if uploaded_file is not None:
         # 1. Yüklenen dosyayı FastAPI'ye göndermek için hazırlayın
         # requests kütüphanesi için dosya formatı (dosyanın adı ve içeriği)
+        uploaded_file.seek(0)
         files = {
-            "file": (uploaded_file.name, uploaded_file.getvalue(), "application/pdf")
+            "file": (uploaded_file.name, uploaded_file, "application/pdf")
         }
         
         st.info("Makaleniz yükleniyor... Özet çıkarılması LLM çağrısı nedeniyle 5-30 saniye sürebilir.")
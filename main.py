@@ -1,24 +1,51 @@
-import io
 import os
+import sys
+import asyncio
 import json
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field 
-from fastapi import FastAPI, UploadFile, File, HTTPException
-from fastapi.responses import JSONResponse
-from google import genai
-from google.genai import types 
-import pdfplumber
+from fastapi import FastAPI, UploadFile, File, HTTPException, Query
+from fastapi.responses import JSONResponse, PlainTextResponse
+
+# Ortak yardımcı modüller (önbellek, PDF işleme vb.) multi_article/ altında tutulur
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "multi_article"))
+from gemini_client import GeminiClientProvider, GeminiUnavailableError
+from gemini_scheduler import GeminiScheduler, is_throttled
+from metrics import (
+    CACHE_REQUESTS,
+    CONTENT_TYPE as METRICS_CONTENT_TYPE,
+    FAILURES,
+    PROCESS_PEAK_RSS_MB,
+    LLM_REQUESTS,
+    current_timings,
+    record_llm_usage,
+    render_metrics,
+    stage,
+    track_timings,
+)
+from pdf_extraction import EXTRACTION_VERSION, PdfExtractionEngine, PdfExtractionError
+from summary_cache import SummaryCache, make_cache_key, prompt_version
+from single_flight import SingleFlight
+from uploads import SpooledPdf, UploadTooLargeError, peak_rss_mb, spool_upload, with_own_reference
 
 load_dotenv()
 
 GEMINI_MODEL = "gemini-2.0-flash"
+MAX_CHARACTERS = 15000
 
-try: 
-    client = genai.Client()
-    print(f"Gemini modeli hazır: {GEMINI_MODEL}")
-except Exception as e:
-    print(f"Gemini istemcisi başlatılamadı: {e}")
-    client = None 
+# Gemini istemcisi (ve google-genai importu) açılıştaki arka plan ısınmasında veya ilk kullanımda kurulur
+gemini_provider = GeminiClientProvider()
+client = None
+
+def _gemini_client():
+    """Gemini istemcisini döner; kurulamazsa GeminiUnavailableError fırlatır (bir süre sonra yeniden denenir)."""
+    global client
+    if client is None:
+        client = gemini_provider.get()
+    return client
 
 class ArticleSummary(BaseModel):
     veri_seti: str = Field(description="Çalışmada kullanılan veri setinin adı, boyutu ve kaynağı hakkında kısa bilgi.")
@@ -27,95 +54,168 @@ class ArticleSummary(BaseModel):
     kategori: str = Field(description="Makalenin ana konusunu (Örn: NLP, CV, RL, Hardware, Teorik) içeren tek kelime.")
     ozet_genel: str = Field(description="Makalenin genel amacını, yöntemini ve sonuçlarını kapsayan 3-4 cümlelik standart özet.")
 
+SYSTEM_PROMPT = (
+    "Sen bir yapay zeka araştırma asistanısın. "
+    "Görevin, sana verilen bilimsel makale metnini analiz ederek "
+    "kesinlikle ve sadece aşağıdaki JSON formatında Türkçe özet oluşturmaktır. "
+    "Başka hiçbir açıklama, giriş veya çıkış cümlesi ekleme."
+)
+
+JSON_FORMAT_DESCRIPTION = (
+    "{\n"
+    ' "veri_seti": "",\n'
+    ' "metodoloji": "",\n'
+    ' "sonuclar": "",\n'
+    ' "kategori": "",\n'
+    ' "ozet_genel": ""\n'
+    "}"
+)
+
+# Prompt veya metin çıkarma ayarları (arka uç, normalleştirme) değiştiğinde önbellekteki eski özetler otomatik olarak geçersiz olur
+PROMPT_VERSION = prompt_version(SYSTEM_PROMPT, JSON_FORMAT_DESCRIPTION, EXTRACTION_VERSION)
+
+summary_cache = SummaryCache()
+extraction_engine = PdfExtractionEngine()
+# Aynı içerikli eşzamanlı yüklemeleri tek bir çıkarma + LLM işinde birleştirir
+summary_flight = SingleFlight()
+# Gemini çağrıları için jeton kovası (GEMINI_RPM), AIMD eşzamanlılık sınırı ve yeniden deneme
+gemini_scheduler = GeminiScheduler()
+
+def _warm_up() -> None:
+    """PDF işleme süreç havuzunu ve Gemini istemcisini ilk istekten önce hazırlar."""
+    started = time.perf_counter()
+    extraction_engine.start()
+    try:
+        _gemini_client()
+        print(f"Gemini modeli hazır: {GEMINI_MODEL}")
+    except GeminiUnavailableError as e:
+        print(f"Gemini istemcisi başlatılamadı: {e}")
+    print(f"Isınma tamamlandı ({time.perf_counter() - started:.2f} sn).")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Isınma arka planda yapılır: worker hemen bağlantı kabul eder (/health/live),
+    # /health/ready ısınma bitince 200 döner
+    warm_up = asyncio.create_task(asyncio.to_thread(_warm_up))
+    yield
+    await asyncio.gather(warm_up, return_exceptions=True)
+    extraction_engine.shutdown()
+
 app = FastAPI(
     title = "Otomatik Makale Özetleyici",
-    description= "PDF yükleyerek yapılandırılmış özet ve kategori çıkaran API"
+    description= "PDF yükleyerek yapılandırılmış özet ve kategori çıkaran API",
+    lifespan=lifespan
 )
 
+@app.middleware("http")
+async def server_timing(request, call_next):
+    """İsteğin aşama sürelerini (upload, extraction, llm ...) Server-Timing başlığında döner."""
+    with track_timings() as timings:
+        response = await call_next(request)
+    response.headers["Server-Timing"] = timings.server_timing()
+    return response
+
 @app.get("/")
 def read_root():
     return {"message": "PDF Yükleme Hazır!"}
 
-@app.post("/upload-pdf")
-async def upload_pdf_and_extract_text(file: UploadFile = File(...)):
-    if client is None:
+@app.get("/health/live")
+def liveness():
+    """Süreç ayakta ve istek kabul ediyor; bağımlılıklar kontrol edilmez."""
+    return {"status": "ok", "pid": os.getpid()}
+
+@app.get("/health/ready")
+async def readiness():
+    """
+    Worker trafiğe hazır mı: PDF işleme havuzu ısındı ve Gemini istemcisi kuruldu.
+    Hazır değilse 503 döner. Gemini API'sine istek atılmaz.
+    """
+    if client is None and extraction_engine.ready:
+        # Isınmada kurulamayan istemci (örn. anahtar sonradan tanımlandı) yeniden denenir
+        try:
+            await asyncio.to_thread(_gemini_client)
+        except GeminiUnavailableError:
+            pass
+    checks = {"extraction_pool": extraction_engine.ready, "gemini_client": client is not None}
+    ready = all(checks.values())
+    content = {"status": "ready" if ready else "not_ready", "pid": os.getpid(), "checks": checks}
+    if gemini_provider.error:
+        content["gemini_error"] = gemini_provider.error
+    return JSONResponse(status_code=200 if ready else 503, content=content)
+
+@app.get("/metrics")
+def metrics():
+    """Aşama süreleri ve sayaçlar, Prometheus metin formatında."""
+    peak = peak_rss_mb()
+    if peak is not None:
+        PROCESS_PEAK_RSS_MB.set(peak)
+    return PlainTextResponse(render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
+async def _summarize_pdf(pdf: SpooledPdf, cache_key: str) -> Dict[str, Any]:
+    """
+    PDF'ten metin çıkarır, Gemini ile özetler, sonucu önbelleğe yazar ve döner.
+    Hatalar (HTTPException dahil) fırlatılır; aynı içeriği bekleyen tüm istekler aynı hatayı alır.
+    """
+    # 3. pdfplumber ile metin çıkarma (sayfalar süreç havuzunda paralel işlenir,
+    # modele gidecek MAX_CHARACTERS dolunca kalan sayfalar ayrıştırılmaz)
+    try:
+        clean_text, normalization = await asyncio.to_thread(
+            extraction_engine.extract_with_stats, pdf.path, None, MAX_CHARACTERS
+        )
+    except PdfExtractionError as e:
         raise HTTPException(
-            status_code=503,
-            detail="LLM (Mistral) modeli başlatılamadı. Sunucu loglarını kontrol edin."
+            status_code=400,
+            detail=f"PDF işlenemedi: {e}"
         )
 
-    # 1. Dosya Kontrolü 
-    if file.content_type != "application/pdf":
+    if len(clean_text) < 500:
         raise HTTPException(
             status_code=400,
-            detail="Yalnızca PDF formatındaki dosyalar kabul edilir."
+            detail=f"PDF'ten yeterli metin çıkarılamadı."
         )
-    
-    try:
-    # 2.Dosya içeriğini belleke oku 
-        contents = await file.read()
-
-    # 3. pdfplumber ile metin çıkarma 
-        with pdfplumber.open(io.BytesIO(contents)) as pdf:
-            extracted_text = ""
-            MAX_PAGES = 10 
-
-            for i, page in enumerate(pdf.pages):
-                if i >= MAX_PAGES:
-                    break
-                text = page.extract_text()
-                if text:
-                    extracted_text += page.extract_text() + "\n"
-        
-        clean_text = " ".join(extracted_text.split()).strip()
 
-        if len(clean_text) < 500:
-            raise HTTPException(
-                status_code=400,
-                detail=f"PDF'ten yeterli metin çıkarılamadı."
-            )
+    input_text = clean_text[:MAX_CHARACTERS]
+    print(f"Başarıyla çıkarılan metin uzunluğu: {len(clean_text)}. Modele gönderilen uzunluk: {len(input_text)}")
 
-        MAX_CHARACTERS = 15000 
-        input_text = clean_text[:MAX_CHARACTERS]
-        print(f"Başarıyla çıkarılan metin uzunluğu: {len(clean_text)}. Modele gönderilen uzunluk: {len(input_text)}")
+    user_prompt = (
+        f"{SYSTEM_PROMPT}\n\n"
+        f"Beklenen JSON Formatı:\n{JSON_FORMAT_DESCRIPTION}\n\n"
+        f"MAKALE METNİ:\n{input_text}"
+    )
 
-        system_prompt = (
-            "Sen bir yapay zeka araştırma asistanısın. "
-            "Görevin, sana verilen bilimsel makale metnini analiz ederek "
-            "kesinlikle ve sadece aşağıdaki JSON formatında Türkçe özet oluşturmaktır. "
-            "Başka hiçbir açıklama, giriş veya çıkış cümlesi ekleme."
-        )
-        
-        json_format_description = (
-            "{\n"
-    ' "veri_seti": "",\n'
-    ' "metodoloji": "",\n'
-    ' "sonuclar": "",\n'
-    ' "kategori": "",\n'
-    ' "ozet_genel": ""\n'
-    "}"
-        )
-
-        user_prompt = (
-            f"{system_prompt}\n\n"
-            f"Beklenen JSON Formatı:\n{json_format_description}\n\n"
-            f"MAKALE METNİ:\n{input_text}"
-        )
+    async def send():
+        # Senkron istemci event loop'u bloklamasın diye ayrı thread'de çağrılır
+        with stage("llm"):
+            try:
+                return await asyncio.to_thread(
+                    _gemini_client().models.generate_content,
+                    model = GEMINI_MODEL,
+                    contents = user_prompt,
+                )
+            except Exception:
+                LLM_REQUESTS.inc(status="error")
+                raise
 
-        try: 
-            gemini_response = client.models.generate_content(
-                model = GEMINI_MODEL,
-                contents = user_prompt,
-            )
-            response_text = gemini_response.text.strip()
-        
-        except Exception as e:
-            print(f"Gemini API Hatası: {e}")
+    try: 
+        # 429 ve geçici hatalarda PDF yeniden işlenmeden yalnızca LLM çağrısı tekrarlanır
+        gemini_response = await gemini_scheduler.call(send)
+        record_llm_usage(gemini_response, len(user_prompt))
+        response_text = gemini_response.text.strip()
+    
+    except Exception as e:
+        print(f"Gemini API Hatası: {e}")
+        if is_throttled(e):
             raise HTTPException(
-                status_code=500,
-                detail="Gemini API çağrısında hata oluştu."
+                status_code=429,
+                detail="Gemini kotası aşıldı. Lütfen bir süre sonra tekrar deneyin.",
+                headers={"Retry-After": "60"}
             )
+        raise HTTPException(
+            status_code=500,
+            detail="Gemini API çağrısında hata oluştu."
+        )
 
+    with stage("validation"):
     # JSON kod bloğu varsa temizle
         if response_text.startswith("```json"):
             response_text = response_text.replace("```json", "").replace("```", "").strip()
@@ -123,30 +223,99 @@ async def upload_pdf_and_extract_text(file: UploadFile = File(...)):
             response_text = response_text.replace("```", "").strip()
         
     # JSON'u parse et
-        summary_dict = json.loads(response_text)
+        try:
+            summary_dict = json.loads(response_text)
+        except json.JSONDecodeError:
+            print(f"LLM Yanıtı: {response_text}")
+            raise
 
     # Pydantic modeli ile doğrula
         validated_summary = ArticleSummary(**summary_dict)
 
-        return JSONResponse(content={
-            "filename": file.filename,
-            "text_length": len(clean_text),
-            "summary": validated_summary.model_dump(),
-            "status" : "Success",
-            "model_used": GEMINI_MODEL,
-            "extracted_text_sample": clean_text[:300] + "..."
-        })
+    result = {
+        "text_length": len(clean_text),
+        "summary": validated_summary.model_dump(),
+        "status" : "Success",
+        "model_used": GEMINI_MODEL,
+        "extracted_text_sample": clean_text[:300] + "..."
+    }
+    if normalization:
+        result["normalization"] = normalization
+    await asyncio.to_thread(summary_cache.set, cache_key, result)
+    return result
+
+@app.post("/upload-pdf")
+async def upload_pdf_and_extract_text(
+    file: UploadFile = File(...),
+    timings: bool = Query(False, description="Aşama sürelerini (ms) yanıta 'timings' alanı olarak ekler."),
+):
+    try:
+        await asyncio.to_thread(_gemini_client)
+    except GeminiUnavailableError:
+        raise HTTPException(
+            status_code=503,
+            detail="LLM (Mistral) modeli başlatılamadı. Sunucu loglarını kontrol edin."
+        )
+
+    # 1. Dosya Kontrolü 
+    if file.content_type != "application/pdf":
+        raise HTTPException(
+            status_code=400,
+            detail="Yalnızca PDF formatındaki dosyalar kabul edilir."
+        )
+    
+    pdf = None
+    try:
+    # 2.Dosya içeriğini belleğe almadan geçici dosyaya yaz (boyut sınırı uygulanır)
+        try:
+            with stage("upload"):
+                pdf = await spool_upload(file)
+        except UploadTooLargeError as e:
+            raise HTTPException(
+                status_code=413,
+                detail=str(e)
+            )
+        memory = {"upload_bytes": pdf.size}
+
+    # Aynı PDF daha önce özetlendiyse pdfplumber ve LLM adımları atlanır
+        cache_key = make_cache_key(pdf.sha256, GEMINI_MODEL, PROMPT_VERSION)
+        with stage("cache"):
+            cached = await asyncio.to_thread(summary_cache.get, cache_key)
+        if cached is not None:
+            CACHE_REQUESTS.inc(result="hit")
+            content = {"filename": file.filename, **cached, "cache": "hit", "memory": memory}
+        else:
+        # Aynı PDF şu anda başka bir istek için işleniyorsa o işin sonucu (hata dahil) beklenir
+        # İş PDF'i kendi referansından okur: bu istek iptal edilip dosyasını silse de bekleyenler etkilenmez
+            result, shared = await summary_flight.run(
+                cache_key, with_own_reference(pdf, lambda own: _summarize_pdf(own, cache_key))
+            )
+            CACHE_REQUESTS.inc(result="shared" if shared else "miss")
+
+            content = {
+                "filename": file.filename, **result, "cache": "shared" if shared else "miss", "memory": memory
+            }
+
+        # Sürecin ömrü boyunca ulaştığı en yüksek bellek (bu isteğe özgü değildir)
+        memory["process_peak_rss_mb"] = peak_rss_mb()
+        if timings:
+            content["timings"] = current_timings().as_dict()
+        return JSONResponse(content=content)
     
     # Gemini API hataları yerine genel ve JSON hataları yakalanır
+    except HTTPException as e:
+        FAILURES.inc(type=f"http_{e.status_code}")
+        raise
     except json.JSONDecodeError as e:
         print(f"JSON Parse Hatası: {e}")
-        print(f"LLM Yanıtı: {response_text if 'response_text' in locals() else 'Yanıt alınamadı'}")
+        FAILURES.inc(type="JSONDecodeError")
         raise HTTPException(
             status_code=500, 
             detail="LLM hatalı formatta yanıt verdi. Lütfen tekrar deneyin."
         )
     except Exception as e:
         print(f"Genel Hata: {type(e).__name__} - {e}")
+        FAILURES.inc(type=type(e).__name__)
         import traceback
         traceback.print_exc()
         raise HTTPException(
@@ -155,4 +324,6 @@ async def upload_pdf_and_extract_text(file: UploadFile = File(...)):
         )
     finally:
         await file.close()
+        if pdf is not None:
+            pdf.close()
 
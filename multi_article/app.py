@@ -1,12 +1,14 @@
 import streamlit as st
 import requests
 import json
+import base64
 from io import BytesIO
-from typing import List, Dict
+from typing import List, Dict, Callable, Optional
 import pdfplumber
 from PIL import Image
 
 API_URL = "http://127.0.0.1:8000/summarize-pdfs" 
+STREAM_API_URL = "http://127.0.0.1:8000/summarize-pdfs/stream"
 PREVIEW_API_URL = "http://127.0.0.1:8000/preview-pdf"
 
 st.set_page_config(
@@ -18,41 +20,49 @@ st.set_page_config(
 if 'uploaded_files_data' not in st.session_state:
     st.session_state.uploaded_files_data = {}
 
-def display_summary_in_sidebar():
+def display_summary_in_sidebar(target=None):
     """
     Session state'te cache'lenen özetleri yan panelde gösterir.
+    target verilirse (örn. st.sidebar.empty().container()) içerik oraya yeniden çizilir.
     """
-    st.sidebar.title("📚 Analiz Sonuçları")
+    sidebar = target if target is not None else st.sidebar
+    sidebar.title("📚 Analiz Sonuçları")
 
     all_results = []
     for filename, data in st.session_state.uploaded_files_data.items():
         result = data.get("summary_cached")
         if result is not None:
             all_results.append(result)
+        elif data.get("summary_partial"):
+            # Özet akışla geliyor: şimdiye kadar tamamlanan alanlar gösterilir
+            all_results.append({"filename": filename, "status": "Streaming", "summary": data["summary_partial"]})
 
     if not all_results:
-        st.sidebar.info("Henüz özetlenmiş makale yok.")
+        sidebar.info("Henüz özetlenmiş makale yok.")
         return
 
     success_count = sum(1 for item in all_results if item.get("status") == "Success")
-    fail_count = len(all_results) - success_count
+    fail_count = sum(1 for item in all_results if item.get("status") not in ("Success", "Streaming"))
 
     if success_count > 0:
-        st.sidebar.success(f"{success_count} makale başarıyla özetlendi.")
+        sidebar.success(f"{success_count} makale başarıyla özetlendi.")
     if fail_count > 0:
-        st.sidebar.error(f"{fail_count} makalede hata oluştu.")
+        sidebar.error(f"{fail_count} makalede hata oluştu.")
 
-    st.sidebar.markdown("---")
+    sidebar.markdown("---")
 
     for result in all_results:
         filename = result.get("filename", "Bilinmeyen Dosya")
         status = result.get("status")
 
-        with st.sidebar.expander(f"{'✅' if status == 'Success' else '❌'} {filename}"):
-            if status == "Success":
+        icon = {"Success": "✅", "Streaming": "⏳"}.get(status, "❌")
+        with sidebar.expander(f"{icon} {filename}", expanded=status == "Streaming"):
+            if status in ("Success", "Streaming"):
                 summary_data = result["summary"]
+                # Akış sürerken henüz üretilmemiş alanlar
+                pending = "⏳" if status == "Streaming" else None
 
-                category = summary_data.get("kategori", "Bilinmiyor")
+                category = summary_data.get("kategori", pending or "Bilinmiyor")
                 st.markdown(
                     f"**🏷️ Kategori:** "
                     f"<span style='background-color:#007bff; color:white; padding: 3px 6px; "
@@ -60,15 +70,15 @@ def display_summary_in_sidebar():
                     unsafe_allow_html=True,
                 )
 
-                st.info(summary_data.get("ozet_genel", "Genel özet çıkarılamadı."))
+                st.info(summary_data.get("ozet_genel", pending or "Genel özet çıkarılamadı."))
 
-                st.markdown("**Metodoloji:** " + summary_data.get("metodoloji", "Yok"))
-                st.markdown("**Veri Seti:** " + summary_data.get("veri_seti", "Yok"))
-                st.markdown("**Sonuçlar:** " + summary_data.get("sonuclar", "Yok"))
+                st.markdown("**Metodoloji:** " + summary_data.get("metodoloji", pending or "Yok"))
+                st.markdown("**Veri Seti:** " + summary_data.get("veri_seti", pending or "Yok"))
+                st.markdown("**Sonuçlar:** " + summary_data.get("sonuclar", pending or "Yok"))
             else:
                 st.error(result.get("detail", "Bilinmeyen Hata."))
 
-        st.sidebar.markdown("---")
+        sidebar.markdown("---")
 
 def generate_pdf_preview(file_obj):
     """
@@ -99,44 +109,92 @@ def generate_pdf_preview(file_obj):
         st.warning(f"Önizleme oluşturulamadı: {str(e)}")
         return None
 
-def send_files_to_api(files_to_process: List[Dict]):
-    """Seçili dosyaları FastAPI'ye gönderir ve özetleri alır."""
-    multi_part_files = [
-        ("files", (data["file"].name, data["file"].getvalue(), "application/pdf"))
-        for data in files_to_process
-    ]
+def fetch_previews(files_data: List[Dict]) -> None:
+    """
+    Önizlemesi olmayan kartların PDF'lerini tek istekte API'ye gönderir. Sunucu ilk sayfaları
+    doğrudan hedef genişlikte ve paralel çizer, içerik hash'i ile önbelleğe alır.
+    API'ye ulaşılamazsa kartlar generate_pdf_preview ile yerelde çizilir.
+    """
+    missing = [data for data in files_data if data.get("preview_image") is None]
+    if not missing:
+        return
+
+    multi_part_files = []
+    for data in missing:
+        data["file"].seek(0)
+        multi_part_files.append(("files", (data["file"].name, data["file"], "application/pdf")))
+
+    try:
+        response = requests.post(PREVIEW_API_URL, files=multi_part_files, timeout=120)
+        response.raise_for_status()
+        # Sonuçlar yükleme sırasıyla döner
+        for data, result in zip(missing, response.json()):
+            if result.get("status") == "Success":
+                data["preview_image"] = base64.b64decode(result["image"])
+    except (requests.exceptions.RequestException, ValueError):
+        # Yerel önizlemeye düşülür
+        pass
+
+def send_files_to_api(
+    files_to_process: List[Dict],
+    on_result: Optional[Callable[[Dict], None]] = None,
+    on_field: Optional[Callable[[Dict], None]] = None,
+):
+    """
+    Seçili dosyaları FastAPI'nin akış (NDJSON) uç noktasına gönderir.
+    Her dosyanın sonucu hazır olur olmaz on_result ile bildirilir; tüm sonuçlar döner.
+    on_field verilirse özet alanları (önce kategori) model ürettikçe tek tek bildirilir.
+    """
+    # Dosya nesneleri doğrudan verilir; requests içeriği kopyalamadan akış halinde okur
+    multi_part_files = []
+    for data in files_to_process:
+        data["file"].seek(0)
+        multi_part_files.append(("files", (data["file"].name, data["file"], "application/pdf")))
 
     st.info(
         f"Seçili **{len(files_to_process)}** makale analiz için gönderiliyor. "
-        "Lütfen bekleyin..."
+        "Sonuçlar hazır oldukça yan panelde görünecek..."
     )
+    progress = st.progress(0.0, text="Makaleler analiz ediliyor...")
 
-    with st.spinner(
-        "Makaleler analiz ediliyor ve yapılandırılmış özetler çıkarılıyor..."
-    ):
-        try:
-            response = requests.post(API_URL, files=multi_part_files)
-
-            if response.status_code == 200:
-                data = response.json()
-                st.success("Analiz tamamlandı. Sonuçlar yan panelde gösteriliyor.")
-                return data
-            else:
+    results = []
+    try:
+        params = {"fields": "true"} if on_field is not None else None
+        with requests.post(STREAM_API_URL, files=multi_part_files, params=params, stream=True) as response:
+            if response.status_code != 200:
                 st.error(
                     f"API Sunucu Hatası ({response.status_code}): "
                     f"{response.json().get('detail', 'Bilinmeyen sunucu hatası.')}"
                 )
                 return None
 
-        except requests.exceptions.ConnectionError:
-            st.error(
-                "Bağlantı Hatası: Lütfen FastAPI sunucusunun (uvicorn) "
-                "arka planda çalıştığından emin olun."
-            )
-            return None
-        except Exception as e:
-            st.error(f"Beklenmedik bir hata oluştu: {e}")
-            return None
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                result = json.loads(line)
+                if result.get("event") == "field":
+                    on_field(result)
+                    continue
+                results.append(result)
+                if on_result is not None:
+                    on_result(result)
+                progress.progress(
+                    len(results) / len(files_to_process),
+                    text=f"{len(results)}/{len(files_to_process)} makale tamamlandı: {result.get('filename')}",
+                )
+
+        st.success("Analiz tamamlandı. Sonuçlar yan panelde gösteriliyor.")
+        return results
+
+    except requests.exceptions.ConnectionError:
+        st.error(
+            "Bağlantı Hatası: Lütfen FastAPI sunucusunun (uvicorn) "
+            "arka planda çalıştığından emin olun."
+        )
+        return results or None
+    except Exception as e:
+        st.error(f"Beklenmedik bir hata oluştu: {e}")
+        return results or None
 
 def main():
     st.title("🔬 Çoklu Literatür Analiz Asistanı")
@@ -172,6 +230,11 @@ def main():
 
         st.subheader("Makale Listesi")
 
+        # Yeni kartların önizlemeleri tek toplu istekle sunucudan alınır
+        if any(data.get("preview_image") is None for data in st.session_state.uploaded_files_data.values()):
+            with st.spinner("Önizlemeler oluşturuluyor..."):
+                fetch_previews(list(st.session_state.uploaded_files_data.values()))
+
         # Kart sayısı ayarı
         N_CARDS_PER_ROW = 4
         items = list(st.session_state.uploaded_files_data.items())
@@ -202,7 +265,7 @@ def main():
                         unsafe_allow_html=True,
                     )
 
-                    # --- PDF ÖNİZLEME (pdf2image ile) ---
+                    # --- PDF ÖNİZLEME (sunucu önizlemesi yoksa yerelde çizilir) ---
                     if data.get("preview_image") is None:
                         with st.spinner("Önizleme oluşturuluyor..."):
                             preview = generate_pdf_preview(data["file"])
@@ -231,6 +294,26 @@ def main():
             if data["selected"] and data.get("summary_cached") is None
         ]
 
+        # Yan panel, akış sırasında her sonuçta yeniden çizilebilmesi için yer tutucu ile oluşturulur
+        sidebar_placeholder = st.sidebar.empty()
+
+        def cache_result(result: Dict):
+            filename = result.get("filename")
+            if filename in st.session_state.uploaded_files_data:
+                st.session_state.uploaded_files_data[filename][
+                    "summary_cached"
+                ] = result
+                st.session_state.uploaded_files_data[filename].pop("summary_partial", None)
+            display_summary_in_sidebar(sidebar_placeholder.container())
+
+        def cache_field(event: Dict):
+            # Doğrulanmamış ara alanlar; dosyanın sonucu gelince yerini kesin özete bırakır
+            filename = event.get("filename")
+            if filename in st.session_state.uploaded_files_data:
+                partial = st.session_state.uploaded_files_data[filename].setdefault("summary_partial", {})
+                partial[event["field"]] = event["value"]
+            display_summary_in_sidebar(sidebar_placeholder.container())
+
         if st.button("🚀 Seçili Makaleleri Özetle", type="primary"):
             if not any(
                 d["selected"]
@@ -241,18 +324,11 @@ def main():
                 if not selected_files_to_process:
                     st.info("Seçili makalelerin hepsi için özet mevcut.")
                 else:
-                    summaries = send_files_to_api(selected_files_to_process)
-
-                    if summaries:
-                        for result in summaries:
-                            filename = result.get("filename")
-                            if filename in st.session_state.uploaded_files_data:
-                                st.session_state.uploaded_files_data[filename][
-                                    "summary_cached"
-                                ] = result
+                    # Sonuçlar geldikçe summary_cached ve yan panel dosya dosya güncellenir
+                    send_files_to_api(selected_files_to_process, on_result=cache_result, on_field=cache_field)
 
         # Sidebar'da sonuçları göster
-        display_summary_in_sidebar()
+        display_summary_in_sidebar(sidebar_placeholder.container())
 
 
 if __name__ == "__main__":
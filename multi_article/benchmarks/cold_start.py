@@ -0,0 +1,157 @@
+"""
+Soğuk başlatma ölçümü. Her uygulama için iki değer raporlanır:
+
+    import_s       – Uygulama modülünün temiz bir yorumlayıcıda içe aktarılma süresi
+    serve          – uvicorn'un --workers N ile başlatılmasından itibaren:
+                     first_live_s  : ilk /health/live yanıtı (bağlantı kabul ediliyor)
+                     first_ready_s : ilk /health/ready = 200 (ısınma bitti)
+                     all_ready_s   : N farklı worker sürecinin hazır yanıt verdiği an
+
+Sunucular geçici bir klasördeki önbellek/iş dosyalarıyla, rastgele bir portta başlatılır ve
+ölçüm sonunda kapatılır. Hazır olma, Gemini istemcisinin kurulabilmesini gerektirir;
+API anahtarı tanımlı değilse --placeholder-key ile sahte bir anahtar verilebilir
+(ölçüm sırasında Gemini API'sine istek atılmaz).
+
+Kullanım:
+    python benchmarks/cold_start.py [--workers 1 4] [--app multi|root|all] [--placeholder-key]
+                                    [--output cold_start.json]
+"""
+import os
+import sys
+import json
+import time
+import socket
+import shutil
+import argparse
+import tempfile
+import subprocess
+import urllib.error
+import urllib.request
+from typing import Any, Dict, Optional
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.dirname(BENCHMARK_DIR)
+ROOT_DIR = os.path.dirname(APP_DIR)
+APPS = {"multi": APP_DIR, "root": ROOT_DIR}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _get(url: str) -> Optional[Dict[str, Any]]:
+    """JSON yanıtı ve durum kodunu döner; bağlantı kurulamazsa None."""
+    try:
+        with urllib.request.urlopen(url, timeout=2) as response:
+            return {**json.load(response), "http_status": response.status}
+    except urllib.error.HTTPError as e:
+        return {**json.load(e), "http_status": e.code}
+    except (urllib.error.URLError, ConnectionError, socket.timeout):
+        return None
+
+
+def measure_import(app_dir: str, env: Dict[str, str]) -> float:
+    code = "import time; t = time.perf_counter(); import main; print(time.perf_counter() - t)"
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=app_dir, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return round(float(output.strip().splitlines()[-1]), 3)
+
+
+def measure_serve(app_dir: str, workers: int, env: Dict[str, str], timeout: float) -> Dict[str, Any]:
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}"
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--workers", str(workers),
+         "--log-level", "warning"],
+        cwd=app_dir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+    )
+    result: Dict[str, Any] = {"workers": workers, "first_live_s": None, "first_ready_s": None, "all_ready_s": None}
+    ready_pids = set()
+    try:
+        while time.perf_counter() - started < timeout:
+            if server.poll() is not None:
+                result["error"] = server.stderr.read()[-2000:]
+                break
+            elapsed = round(time.perf_counter() - started, 3)
+            if result["first_live_s"] is None:
+                if _get(base + "/health/live") is not None:
+                    result["first_live_s"] = elapsed
+                else:
+                    time.sleep(0.01)
+                continue
+            ready = _get(base + "/health/ready")
+            if ready is not None and ready["http_status"] == 200:
+                result["first_ready_s"] = result["first_ready_s"] or elapsed
+                ready_pids.add(ready["pid"])
+                if len(ready_pids) >= workers:
+                    result["all_ready_s"] = elapsed
+                    break
+            elif ready is not None:
+                result["last_readiness"] = ready
+            time.sleep(0.01)
+        else:
+            result["error"] = f"{timeout} sn içinde tüm worker'lar hazır olmadı."
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Uygulama import süresi ve çoklu worker soğuk başlatma ölçümü.")
+    parser.add_argument("--app", choices=["multi", "root", "all"], default="all")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4], help="Ölçülecek worker sayıları")
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--placeholder-key", action="store_true",
+                        help="GOOGLE_API_KEY tanımlı değilse hazır olma kontrolü için sahte anahtar kullan")
+    parser.add_argument("--output", help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="pdf_cold_start_")
+    env = dict(os.environ)
+    for name, filename in [
+        ("SUMMARY_CACHE_PATH", "summary_cache.sqlite3"),
+        ("JOBS_DB_PATH", "jobs.sqlite3"),
+        ("JOBS_DIR", "jobs"),
+        ("PREVIEW_CACHE_PATH", "preview_cache.sqlite3"),
+        ("CORPUS_INDEX_PATH", "corpus_index.sqlite3"),
+        ("NEAR_DUPLICATE_INDEX_PATH", "near_duplicates.sqlite3"),
+    ]:
+        env[name] = os.path.join(work_dir, filename)
+    if args.placeholder_key and not (env.get("GOOGLE_API_KEY") or env.get("GEMINI_API_KEY")):
+        env["GOOGLE_API_KEY"] = "cold-start-placeholder"
+
+    apps = list(APPS) if args.app == "all" else [args.app]
+    report: Dict[str, Any] = {"python": sys.version.split()[0], "cpu_count": os.cpu_count(), "apps": {}}
+    try:
+        for name in apps:
+            app_dir = APPS[name]
+            entry = {"import_s": measure_import(app_dir, env), "serve": []}
+            for workers in args.workers:
+                entry["serve"].append(measure_serve(app_dir, workers, env, args.timeout))
+            report["apps"][name] = entry
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    print(f"{'Uygulama':<8} {'import sn':>10} {'worker':>7} {'ilk live':>9} {'ilk ready':>10} {'tümü ready':>11}")
+    for name, entry in report["apps"].items():
+        for serve in entry["serve"]:
+            print(
+                f"{name:<8} {entry['import_s']:>10} {serve['workers']:>7} {str(serve['first_live_s']):>9} "
+                f"{str(serve['first_ready_s']):>10} {str(serve['all_ready_s']):>11}"
+                + (f"  HATA: {serve['error'][:200]}" if serve.get("error") else "")
+            )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
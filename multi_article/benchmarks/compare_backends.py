@@ -0,0 +1,125 @@
+"""
+PDF metin çıkarma arka uçlarını (pdfplumber / pdfminer / pdfium) bir PDF klasörü
+üzerinde hız ve çıktı kalitesi açısından karşılaştırır.
+
+Kalite, pdfplumber çıktısına göre kelime düzeyinde F1 skoru ile ölçülür.
+EXTRACTION_BACKEND / EXTRACTION_FAST_BACKEND seçimi bu sonuçlara göre yapılmalıdır.
+
+Kullanım:
+    python benchmarks/compare_backends.py <pdf_klasörü> [--output sonuc.json]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+from collections import Counter
+from typing import Dict, Any, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extraction_backends import BACKENDS
+from pdf_extraction import MAX_PAGES, MIN_TEXT_CHARS, PdfExtractionEngine
+
+REFERENCE_BACKEND = "pdfplumber"
+
+
+def token_f1(reference: str, candidate: str) -> float:
+    """İki metnin kelime torbaları arasındaki F1 skoru (1.0 = aynı kelimeler)."""
+    ref_counts = Counter(reference.lower().split())
+    cand_counts = Counter(candidate.lower().split())
+    if not ref_counts and not cand_counts:
+        return 1.0
+    overlap = sum((ref_counts & cand_counts).values())
+    if overlap == 0:
+        return 0.0
+    precision = overlap / sum(cand_counts.values())
+    recall = overlap / sum(ref_counts.values())
+    return 2 * precision * recall / (precision + recall)
+
+
+def benchmark(pdf_paths: List[str], max_pages: int = MAX_PAGES) -> Dict[str, Any]:
+    # Havuzsuz motor: arka uçların saf tek çekirdek maliyeti ölçülür
+    engines = {
+        name: PdfExtractionEngine(max_workers=0, max_pages=max_pages, backend=name)
+        for name in BACKENDS
+    }
+    stats = {name: {"seconds": 0.0, "pages": 0, "chars": 0, "f1": [], "failures": 0, "below_min": 0} for name in BACKENDS}
+    documents = []
+
+    for path in pdf_paths:
+        with open(path, "rb") as f:
+            contents = f.read()
+        outputs = {}
+        for name, engine in engines.items():
+            started = time.perf_counter()
+            try:
+                pages = engine.extract_pages(contents, backend=name)
+            except Exception as e:
+                stats[name]["failures"] += 1
+                outputs[name] = None
+                print(f"[{os.path.basename(path)}] {name} hata: {type(e).__name__} - {e}")
+                continue
+            elapsed = time.perf_counter() - started
+            text = " ".join(" ".join(pages).split())
+            outputs[name] = text
+            stats[name]["seconds"] += elapsed
+            stats[name]["pages"] += len(pages)
+            stats[name]["chars"] += len(text)
+            if len(text) < MIN_TEXT_CHARS:
+                stats[name]["below_min"] += 1
+
+        reference = outputs.get(REFERENCE_BACKEND)
+        document = {"file": os.path.basename(path)}
+        for name, text in outputs.items():
+            if text is None or reference is None:
+                continue
+            score = token_f1(reference, text)
+            stats[name]["f1"].append(score)
+            document[name] = {"chars": len(text), "f1": round(score, 4)}
+        documents.append(document)
+
+    summary = {}
+    for name, s in stats.items():
+        summary[name] = {
+            "documents": len(pdf_paths),
+            "pages": s["pages"],
+            "seconds": round(s["seconds"], 4),
+            "pages_per_sec": round(s["pages"] / s["seconds"], 2) if s["seconds"] else None,
+            "chars": s["chars"],
+            "mean_f1_vs_pdfplumber": round(sum(s["f1"]) / len(s["f1"]), 4) if s["f1"] else None,
+            "failures": s["failures"],
+            "below_min_text": s["below_min"],
+        }
+    return {"summary": summary, "documents": documents}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PDF metin çıkarma arka uçlarını karşılaştırır.")
+    parser.add_argument("pdf_dir", help="PDF dosyalarının bulunduğu klasör")
+    parser.add_argument("--max-pages", type=int, default=MAX_PAGES)
+    parser.add_argument("--output", help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args()
+
+    pdf_paths = sorted(
+        os.path.join(root, name)
+        for root, _, names in os.walk(args.pdf_dir)
+        for name in names
+        if name.lower().endswith(".pdf")
+    )
+    if not pdf_paths:
+        sys.exit(f"{args.pdf_dir} içinde PDF bulunamadı.")
+
+    result = benchmark(pdf_paths, args.max_pages)
+
+    print(f"{'Arka uç':<12}{'sayfa/sn':>10}{'F1':>8}{'hata':>6}{'<500':>6}")
+    for name, s in result["summary"].items():
+        print(f"{name:<12}{s['pages_per_sec'] or 0:>10}{s['mean_f1_vs_pdfplumber'] or 0:>8}{s['failures']:>6}{s['below_min_text']:>6}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,381 @@
+"""
+Uçtan uca yük testi. Gerçek FastAPI uygulamaları uvicorn ile ayrı süreçte başlatılır; Gemini
+çağrıları yerel sahte sunucuya (mock_gemini.py) gider, yani test tamamen çevrimdışıdır.
+
+Her hedef uç nokta için eşzamanlılık kademeli artırılır (kapalı döngü: N istemcinin her biri
+yanıtı alınca yeni istek gönderir). Her kademede --duration saniye boyunca:
+
+    throughput_rps  – Saniyedeki başarılı istek
+    pages_per_sec   – Saniyede işlenen PDF sayfası
+    latency_ms      – p50 / p95 / p99 / ortalama / en büyük gecikme
+    first_field_ms  – Yalnızca summarize_pdfs_stream: ilk özet alanının gelme süresi (algılanan gecikme)
+    errors          – HTTP durum koduna göre başarısız istekler
+    llm             – Sahte Gemini sunucusunun gördüğü çağrı, 429 ve 5xx sayıları
+
+Doygunluk noktası: en yüksek verimin %(100 - --saturation-tolerance) kadarına ulaşılan en düşük
+eşzamanlılık. Bu noktadan sonra eşzamanlılığı artırmak verimi artırmaz, yalnızca gecikmeyi
+uzatır. Hata oranı --max-error-rate'i aşan kademe aşırı yüklü sayılır ve test o hedef için durur.
+
+Her istek, PDF'in sonuna benzersiz bir yorum satırı eklenerek gönderilir. Böylece içerik hash'i
+değişir; özet önbelleği ve eşzamanlı istek birleştirme devreye girmez. Yakın kopya tespiti
+kapatılır (NEAR_DUPLICATE_REUSE=0). Her başarılı istek bir Gemini çağrısı yapar.
+
+--query hedef yollarına sorgu parametreleri ekler (örn. "summary_fields=kategori&max_output_tokens=64"
+ile yalnızca sınıflandırma isteği). --ms-per-output-token ile sahte sunucunun yanıt süresi çıktı
+uzunluğuna bağlanır; böylece dar alan seçiminin ve çıktı bütçesinin gecikmeye etkisi ölçülebilir.
+
+Kullanım:
+    python benchmarks/load_test.py [--target upload_pdf summarize_pdfs summarize_pdfs_stream]
+                                   [--concurrency 1 2 4 8 16 32]
+                                   [--duration 15] [--workers 1] [--latency-ms 800] [--latency-sigma 0.3]
+                                   [--ms-per-output-token 0] [--query "summary_fields=kategori"]
+                                   [--throttle-rate 0] [--rpm 0] [--error-rate 0]
+                                   [--output load_test.json] [--csv load_test.csv]
+"""
+import os
+import sys
+import csv
+import json
+import time
+import uuid
+import socket
+import shutil
+import asyncio
+import argparse
+import platform
+import tempfile
+import subprocess
+from typing import Any, Dict, List, Optional
+
+import httpx
+import numpy as np
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.dirname(BENCHMARK_DIR)
+ROOT_DIR = os.path.dirname(APP_DIR)
+sys.path.insert(0, BENCHMARK_DIR)
+
+from synthetic_corpus import LAYOUTS, generate_corpus  # noqa: E402
+
+# Hedef adı -> (uygulama klasörü, yol, form alanı)
+TARGETS = {
+    "upload_pdf": (ROOT_DIR, "/upload-pdf", "file"),
+    "summarize_pdfs": (APP_DIR, "/summarize-pdfs", "files"),
+    "summarize_pdfs_stream": (APP_DIR, "/summarize-pdfs/stream?fields=true", "files"),
+}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_until(url: str, process: subprocess.Popen, timeout: float) -> None:
+    """Adres 200 dönene kadar bekler; süreç kapanır veya süre dolarsa hata fırlatır."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Süreç beklenmedik şekilde kapandı: {process.stderr.read()[-2000:]}")
+        try:
+            if httpx.get(url, timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f"{url} {timeout} sn içinde hazır olmadı.")
+
+
+def _stop(process: subprocess.Popen) -> None:
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def latency_stats(samples: List[float]) -> Dict[str, Optional[float]]:
+    """Saniye cinsinden örneklerden milisaniye cinsinden p50/p95/p99, ortalama ve en büyük değer."""
+    if not samples:
+        return {"p50": None, "p95": None, "p99": None, "mean": None, "max": None}
+    ms = np.asarray(samples) * 1000
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {
+        "p50": round(float(p50), 2),
+        "p95": round(float(p95), 2),
+        "p99": round(float(p99), 2),
+        "mean": round(float(ms.mean()), 2),
+        "max": round(float(ms.max()), 2),
+    }
+
+
+def unique_pdf(data: bytes) -> bytes:
+    """PDF'in sonuna yorum ekler: içerik aynı kalır, hash her istekte farklı olur."""
+    return data + f"\n%load-test {uuid.uuid4().hex}\n".encode()
+
+
+async def run_level(
+    base: str, path: str, field: str, documents: List[Dict], batch_size: int, concurrency: int, duration: float
+) -> Dict[str, Any]:
+    """Tek eşzamanlılık kademesini kapalı döngüde çalıştırır."""
+    samples: List[float] = []
+    first_fields: List[float] = []
+    statuses: Dict[str, int] = {}
+    pages = 0
+    cursor = 0
+    deadline = time.perf_counter() + duration
+
+    async def client_loop(http: httpx.AsyncClient):
+        nonlocal pages, cursor
+        while time.perf_counter() < deadline:
+            group = [documents[(cursor + i) % len(documents)] for i in range(batch_size)]
+            cursor += batch_size
+            files = [
+                (field, (os.path.basename(document["path"]), unique_pdf(document["data"]), "application/pdf"))
+                for document in group
+            ]
+            started = time.perf_counter()
+            first_field = None
+            try:
+                async with http.stream("POST", path, files=files) as response:
+                    status = str(response.status_code)
+                    if response.status_code == 200 and "/stream" in path:
+                        # NDJSON: alan satırları ('event': 'field') ve dosya başına sonuç satırları
+                        items = []
+                        async for line in response.aiter_lines():
+                            if not line:
+                                continue
+                            item = json.loads(line)
+                            if item.get("event") == "field":
+                                first_field = first_field or time.perf_counter() - started
+                            else:
+                                items.append(item)
+                    elif response.status_code == 200:
+                        # /summarize-pdfs dosya başına sonuç listesi döner
+                        body = json.loads(await response.aread())
+                        items = body if isinstance(body, list) else [body]
+                    if status == "200" and any(item.get("status") != "Success" for item in items):
+                        # Dosyalardan biri bile başarısızsa istek başarısızdır
+                        status = "200_failed"
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            elapsed = time.perf_counter() - started
+            if status == "200":
+                samples.append(elapsed)
+                if first_field is not None:
+                    first_fields.append(first_field)
+                pages += sum(document["pages"] for document in group)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    started = time.perf_counter()
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base, limits=limits, timeout=600) as http:
+        await asyncio.gather(*(client_loop(http) for _ in range(concurrency)))
+    wall = time.perf_counter() - started
+    total = sum(statuses.values())
+    failed = total - len(samples)
+    return {
+        "concurrency": concurrency,
+        "requests": total,
+        "succeeded": len(samples),
+        "seconds": round(wall, 3),
+        "throughput_rps": round(len(samples) / wall, 3),
+        "pages_per_sec": round(pages / wall, 2),
+        "latency_ms": latency_stats(samples),
+        **({"first_field_ms": latency_stats(first_fields)} if first_fields else {}),
+        "error_rate": round(failed / total, 4) if total else 0.0,
+        "status_codes": statuses,
+    }
+
+
+def find_saturation(levels: List[Dict[str, Any]], tolerance: float, max_error_rate: float) -> Optional[Dict[str, Any]]:
+    """En yüksek verimin (1 - tolerance) katına ulaşan en düşük eşzamanlılık kademesini döner."""
+    healthy = [level for level in levels if level["error_rate"] <= max_error_rate and level["throughput_rps"]]
+    if not healthy:
+        return None
+    peak = max(level["throughput_rps"] for level in healthy)
+    level = next(level for level in healthy if level["throughput_rps"] >= peak * (1 - tolerance))
+    return {
+        "concurrency": level["concurrency"],
+        "throughput_rps": level["throughput_rps"],
+        "peak_throughput_rps": peak,
+        "latency_p95_ms": level["latency_ms"]["p95"],
+    }
+
+
+def _mock_stats(mock: str) -> Dict[str, int]:
+    return httpx.get(mock + "/mock/stats", timeout=5).json()
+
+
+def with_query(path: str, query: Optional[str]) -> str:
+    if not query:
+        return path
+    return f"{path}{'&' if '?' in path else '?'}{query.lstrip('?&')}"
+
+
+def run_target(name: str, args, env: Dict[str, str], documents: List[Dict], mock: str) -> Dict[str, Any]:
+    app_dir, path, field = TARGETS[name]
+    path = with_query(path, args.query)
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--workers", str(args.workers),
+         "--log-level", "warning"],
+        cwd=app_dir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+    )
+    levels = []
+    try:
+        _wait_until(base + "/health/ready", server, timeout=120)
+        for concurrency in args.concurrency:
+            before = _mock_stats(mock)
+            level = asyncio.run(
+                run_level(base, path, field, documents, args.batch_size, concurrency, args.duration)
+            )
+            after = _mock_stats(mock)
+            level["llm"] = {
+                key: after[key] - before[key] for key in ("requests", "ok", "throttled", "errors")
+            }
+            levels.append(level)
+            latency = level["latency_ms"]
+            print(
+                f"{name:<22}{concurrency:>6}{level['throughput_rps']:>9}{level['pages_per_sec']:>10}"
+                f"{latency['p50'] or 0:>10}{latency['p95'] or 0:>10}{latency['p99'] or 0:>10}"
+                f"{level['error_rate'] * 100:>8.1f}{level['llm']['throttled']:>6}"
+                + (f"  ilk alan p50 {level['first_field_ms']['p50']} ms" if "first_field_ms" in level else ""),
+                flush=True,
+            )
+            if level["error_rate"] > args.max_error_rate:
+                print(f"{name}: hata oranı %{level['error_rate'] * 100:.1f}, aşırı yük; sonraki kademeler atlandı.")
+                break
+    finally:
+        _stop(server)
+    return {
+        "endpoint": path,
+        "levels": levels,
+        "saturation": find_saturation(levels, args.saturation_tolerance, args.max_error_rate),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sahte Gemini sunucusuyla çevrimdışı uçtan uca yük testi.")
+    parser.add_argument("--target", nargs="+", choices=list(TARGETS), default=list(TARGETS))
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--duration", type=float, default=15, help="Kademe başına süre (sn)")
+    parser.add_argument("--batch-size", type=int, default=1, help="/summarize-pdfs isteği başına PDF sayısı")
+    parser.add_argument("--workers", type=int, default=1, help="Uygulama için uvicorn worker sayısı")
+    parser.add_argument("--layouts", nargs="+", choices=list(LAYOUTS), default=["short", "two_column", "long"],
+                        help="Sentetik derlemden kullanılacak yerleşimler")
+    parser.add_argument("--corpus", help="Sentetik derlemin oluşturulacağı klasör")
+    parser.add_argument("--latency-ms", type=float, default=800.0, help="Sahte Gemini gecikmesinin medyanı")
+    parser.add_argument("--latency-sigma", type=float, default=0.3, help="Log-normal gecikme yayılımı")
+    parser.add_argument("--ms-per-output-token", type=float, default=0.0,
+                        help="Sahte sunucuda çıktı token'ı başına eklenen gecikme (ms)")
+    parser.add_argument("--query", help="Hedef yollarına eklenecek sorgu parametreleri (örn. summary_fields=kategori)")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Rastgele 429 olasılığı")
+    parser.add_argument("--rpm", type=int, default=0, help="Sahte sunucunun dakikalık kotası (0: sınırsız)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="500/503 olasılığı")
+    parser.add_argument("--retry-delay-s", type=float, default=1.0, help="429 yanıtındaki RetryInfo süresi")
+    parser.add_argument("--max-error-rate", type=float, default=0.05,
+                        help="Bu oranı aşan kademe aşırı yüklü sayılır ve test durur")
+    parser.add_argument("--saturation-tolerance", type=float, default=0.1)
+    parser.add_argument("--output", help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument("--csv", help="Verim-gecikme eğrisinin yazılacağı CSV dosyası")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="pdf_load_test_")
+    env = dict(os.environ)
+    for name, filename in [
+        ("SUMMARY_CACHE_PATH", "summary_cache.sqlite3"),
+        ("JOBS_DB_PATH", "jobs.sqlite3"),
+        ("JOBS_DIR", "jobs"),
+        ("PREVIEW_CACHE_PATH", "preview_cache.sqlite3"),
+        ("CORPUS_INDEX_PATH", "corpus_index.sqlite3"),
+        ("NEAR_DUPLICATE_INDEX_PATH", "near_duplicates.sqlite3"),
+    ]:
+        env[name] = os.path.join(work_dir, filename)
+    mock_port = _free_port()
+    mock = f"http://127.0.0.1:{mock_port}"
+    # Gerçek API anahtarı sahte sunucuya bile gönderilmez
+    env.pop("GEMINI_API_KEY", None)
+    env.update(GOOGLE_API_KEY="load-test", GEMINI_BASE_URL=mock, WEB_CONCURRENCY=str(args.workers))
+    # Derlemdeki PDF'ler tekrar tekrar gönderilir; yakın kopya olarak özetleri yeniden kullanılmasın
+    env["NEAR_DUPLICATE_REUSE"] = "0"
+    # İstemci tarafı hız sınırı yalnızca açıkça istenirse uygulanır; kotayı sahte sunucu (--rpm) belirler
+    env.setdefault("GEMINI_RPM", "0")
+
+    mock_server = subprocess.Popen(
+        [sys.executable, os.path.join(BENCHMARK_DIR, "mock_gemini.py"), "--port", str(mock_port),
+         "--latency-ms", str(args.latency_ms), "--latency-sigma", str(args.latency_sigma),
+         "--ms-per-output-token", str(args.ms_per_output_token),
+         "--throttle-rate", str(args.throttle_rate), "--rpm", str(args.rpm),
+         "--error-rate", str(args.error_rate), "--retry-delay-s", str(args.retry_delay_s), "--seed", "7"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+    )
+    report: Dict[str, Any] = {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "workers": args.workers,
+            "duration_s": args.duration,
+            "batch_size": args.batch_size,
+            "query": args.query,
+        },
+        "mock_gemini": {
+            "latency_ms": args.latency_ms,
+            "latency_sigma": args.latency_sigma,
+            "ms_per_output_token": args.ms_per_output_token,
+            "throttle_rate": args.throttle_rate,
+            "rpm": args.rpm,
+            "error_rate": args.error_rate,
+        },
+        "targets": {},
+    }
+    try:
+        _wait_until(mock + "/mock/stats", mock_server, timeout=30)
+        corpus = [
+            document for document in generate_corpus(args.corpus or os.path.join(work_dir, "corpus"), copies=3)
+            if document["layout"] in args.layouts
+        ]
+        for document in corpus:
+            with open(document["path"], "rb") as f:
+                document["data"] = f.read()
+        report["corpus"] = {"documents": len(corpus), "layouts": args.layouts}
+
+        print(f"{'Hedef':<22}{'eşz.':>6}{'istek/sn':>9}{'sayfa/sn':>10}{'p50 ms':>10}{'p95 ms':>10}"
+              f"{'p99 ms':>10}{'hata %':>8}{'429':>6}")
+        for name in args.target:
+            report["targets"][name] = run_target(name, args, env, corpus, mock)
+    finally:
+        _stop(mock_server)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    for name, target in report["targets"].items():
+        saturation = target["saturation"]
+        if saturation:
+            print(
+                f"{name}: doygunluk {saturation['concurrency']} eşzamanlı istekte "
+                f"({saturation['throughput_rps']} istek/sn, p95 {saturation['latency_p95_ms']} ms; "
+                f"en yüksek {saturation['peak_throughput_rps']} istek/sn)"
+            )
+        else:
+            print(f"{name}: doygunluk noktası bulunamadı (başarılı kademe yok).")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.csv:
+        with open(args.csv, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["target", "concurrency", "throughput_rps", "pages_per_sec",
+                             "p50_ms", "p95_ms", "p99_ms", "error_rate", "llm_throttled"])
+            for name, target in report["targets"].items():
+                for level in target["levels"]:
+                    latency = level["latency_ms"]
+                    writer.writerow([name, level["concurrency"], level["throughput_rps"], level["pages_per_sec"],
+                                     latency["p50"], latency["p95"], latency["p99"], level["error_rate"],
+                                     level["llm"]["throttled"]])
+
+
+if __name__ == "__main__":
+    main()
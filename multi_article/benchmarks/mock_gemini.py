@@ -0,0 +1,253 @@
+"""
+Gemini generate_content API'sinin yerel, ağ kullanmayan taklidi (yük testi için).
+
+Uygulamalar GEMINI_BASE_URL=http://127.0.0.1:<port> ile bu sunucuya yönlendirilir; google-genai
+istemcisi gerçek API ile aynı HTTP isteğini gönderir. Yanıt, istekteki yapılandırılmış çıktı
+şemasına (responseSchema / responseJsonSchema) veya şema yoksa istemde verilen JSON şablonuna göre
+doldurulmuş geçerli bir JSON'dur. streamGenerateContent çağrılarında yanıt, gecikme parçalara
+yayılarak SSE ile parça parça gönderilir. generationConfig.maxOutputTokens verilmişse metin alanları
+bütçeye sığacak kadar kısaltılır (talimata uyan model gibi); sığmazsa yanıt MAX_TOKENS ile kesilir.
+Her çağrıda:
+
+    gecikme  – medyanı --latency-ms, yayılımı --latency-sigma olan log-normal dağılım; üstüne
+               üretilen çıktı token'ı başına --ms-per-output-token (çıktı uzunluğuna bağlı süre)
+    429      – --throttle-rate olasılıkla veya --rpm kotası aşıldığında RESOURCE_EXHAUSTED
+               (RetryInfo ile --retry-delay-s)
+    5xx      – --error-rate olasılıkla 500 INTERNAL / 503 UNAVAILABLE
+
+GET /mock/stats sayaçları döner (toplam, başarılı, 429, 5xx).
+
+Kullanım:
+    python benchmarks/mock_gemini.py [--port 8090] [--latency-ms 800] [--latency-sigma 0.3]
+                                     [--ms-per-output-token 0] [--throttle-rate 0] [--rpm 0]
+                                     [--error-rate 0] [--seed 7]
+"""
+import json
+import time
+import random
+import asyncio
+import argparse
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+_STATUS_NAMES = {429: "RESOURCE_EXHAUSTED", 500: "INTERNAL", 503: "UNAVAILABLE"}
+# Akış yanıtında parça başına karakter sayısı
+STREAM_CHUNK_CHARS = 40
+# Metin alanlarına yazılan yer tutucu
+FAKE_TEXT = "yük testi yanıtı " * 8
+CHARS_PER_TOKEN = 4
+
+
+def _resolve(schema: Dict[str, Any], root: Dict[str, Any]) -> Dict[str, Any]:
+    ref = schema.get("$ref")
+    if not ref:
+        return schema
+    node: Any = root
+    for part in ref.lstrip("#/").split("/"):
+        node = node.get(part, {})
+    return node
+
+
+def fake_value(schema: Dict[str, Any], root: Optional[Dict[str, Any]] = None, text: str = FAKE_TEXT) -> Any:
+    """JSON şemasına (veya Gemini Schema nesnesine) uyan yer tutucu bir değer üretir."""
+    root = root or schema
+    schema = _resolve(schema, root)
+    kind = str(schema.get("type", "object" if "properties" in schema else "string")).lower()
+    if kind == "object":
+        return {name: fake_value(field, root, text) for name, field in schema.get("properties", {}).items()}
+    if kind == "array":
+        return [fake_value(schema.get("items", {}), root, text) for _ in range(max(1, schema.get("minItems", 1)))]
+    if kind in ("integer", "number"):
+        return 1
+    if kind == "boolean":
+        return True
+    if schema.get("enum"):
+        return schema["enum"][0]
+    return text
+
+
+def _prompt_template(text: str) -> Optional[Dict[str, Any]]:
+    """İstem metnindeki ilk JSON nesnesini (şema veya örnek şablon) bulur."""
+    decoder = json.JSONDecoder()
+    start = text.find("{")
+    while start != -1:
+        try:
+            value, _ = decoder.raw_decode(text, start)
+        except json.JSONDecodeError:
+            start = text.find("{", start + 1)
+            continue
+        if isinstance(value, dict) and value:
+            return value
+        start = text.find("{", start + 1)
+    return None
+
+
+def response_payload(body: Dict[str, Any]) -> Dict[str, Any]:
+    """generateContent isteği için yapılandırılmış çıktıyı dolduran yanıt gövdesini üretir."""
+    config = body.get("generationConfig") or {}
+    schema = config.get("responseJsonSchema") or config.get("responseSchema")
+    prompt = "".join(
+        part.get("text", "") for content in body.get("contents", []) for part in content.get("parts", [])
+    )
+    template = None if schema else (_prompt_template(prompt) or {"ozet": ""})
+
+    def render(value_text: str) -> str:
+        if schema:
+            output = fake_value(schema, text=value_text)
+        elif "properties" in template:
+            output = fake_value(template, text=value_text)
+        else:
+            output = {key: fake_value({}, text=value_text) for key in template}
+        return json.dumps(output, ensure_ascii=False)
+
+    text = render(FAKE_TEXT)
+    finish_reason = "STOP"
+    max_tokens = config.get("maxOutputTokens")
+    if max_tokens and len(text) // CHARS_PER_TOKEN > max_tokens:
+        # Metin alanları bütçeye göre kısaltılır; JSON iskeleti bile sığmıyorsa yanıt kesilir
+        skeleton = len(render(""))
+        strings = max(1, (len(text) - skeleton) // len(FAKE_TEXT))
+        room = (max_tokens * CHARS_PER_TOKEN - skeleton) // strings
+        text = render(FAKE_TEXT[:max(0, room)])
+        if len(text) // CHARS_PER_TOKEN > max_tokens:
+            text = text[:max_tokens * CHARS_PER_TOKEN]
+            finish_reason = "MAX_TOKENS"
+    return {
+        "candidates": [
+            {"content": {"role": "model", "parts": [{"text": text}]}, "finishReason": finish_reason, "index": 0}
+        ],
+        "usageMetadata": {
+            "promptTokenCount": len(prompt) // 4,
+            "candidatesTokenCount": len(text) // 4,
+            "totalTokenCount": (len(prompt) + len(text)) // 4,
+        },
+        "modelVersion": "mock",
+    }
+
+
+def stream_payloads(payload: Dict[str, Any], chunk_chars: int = STREAM_CHUNK_CHARS) -> List[Dict[str, Any]]:
+    """Yanıt gövdesini metni chunk_chars karakterlik parçalara bölünmüş akış yanıtlarına ayırır."""
+    text = payload["candidates"][0]["content"]["parts"][0]["text"]
+    pieces = [text[i:i + chunk_chars] for i in range(0, len(text), chunk_chars)] or [""]
+    chunks = []
+    for index, piece in enumerate(pieces):
+        last = index == len(pieces) - 1
+        candidate: Dict[str, Any] = {"content": {"role": "model", "parts": [{"text": piece}]}, "index": 0}
+        if last:
+            candidate["finishReason"] = payload["candidates"][0]["finishReason"]
+        chunk: Dict[str, Any] = {"candidates": [candidate], "modelVersion": payload["modelVersion"]}
+        if last:
+            chunk["usageMetadata"] = payload["usageMetadata"]
+        chunks.append(chunk)
+    return chunks
+
+
+def _error(code: int, message: str, retry_delay: Optional[float] = None) -> JSONResponse:
+    error: Dict[str, Any] = {"code": code, "message": message, "status": _STATUS_NAMES[code]}
+    if retry_delay is not None:
+        error["details"] = [{"@type": "type.googleapis.com/google.rpc.RetryInfo", "retryDelay": f"{retry_delay}s"}]
+    return JSONResponse({"error": error}, status_code=code)
+
+
+def create_app(
+    latency_ms: float = 800.0,
+    latency_sigma: float = 0.3,
+    throttle_rate: float = 0.0,
+    rpm: int = 0,
+    error_rate: float = 0.0,
+    retry_delay_s: float = 1.0,
+    seed: Optional[int] = None,
+    ms_per_output_token: float = 0.0,
+) -> FastAPI:
+    app = FastAPI(title="Sahte Gemini API")
+    rng = random.Random(seed)
+    stats = {"requests": 0, "ok": 0, "throttled": 0, "errors": 0, "in_flight": 0, "max_in_flight": 0}
+    window: deque = deque()
+
+    def over_quota() -> bool:
+        # Son 60 sn'deki kabul edilen istekler (kayan pencere)
+        now = time.monotonic()
+        while window and now - window[0] > 60:
+            window.popleft()
+        if rpm and len(window) >= rpm:
+            return True
+        window.append(now)
+        return False
+
+    async def occupied(seconds: float) -> None:
+        # Yanıt üretiliyormuş gibi bekler; eşzamanlı üretilen yanıt sayısı izlenir
+        stats["in_flight"] += 1
+        stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            stats["in_flight"] -= 1
+
+    @app.get("/mock/stats")
+    async def mock_stats():
+        return stats
+
+    @app.post("/{api_version}/models/{target}")
+    async def generate_content(api_version: str, target: str, request: Request):
+        body = await request.json()
+        stats["requests"] += 1
+        if rng.random() < throttle_rate or over_quota():
+            stats["throttled"] += 1
+            return _error(429, "Resource has been exhausted (e.g. check quota).", retry_delay_s)
+        # Medyanı latency_ms olan log-normal gecikme: LLM yanıt sürelerinin sağa çarpık dağılımı
+        latency = latency_ms / 1000 * rng.lognormvariate(0, latency_sigma)
+        if rng.random() < error_rate:
+            stats["errors"] += 1
+            await occupied(latency)
+            code = rng.choice([500, 503])
+            return _error(code, "An internal error has occurred." if code == 500 else "The model is overloaded.")
+        stats["ok"] += 1
+        payload = response_payload(body)
+        # Yanıt süresi çıktı uzunluğuyla büyür: kısa (ör. yalnızca kategori) yanıtlar daha çabuk gelir
+        latency += payload["usageMetadata"]["candidatesTokenCount"] * ms_per_output_token / 1000
+        if not target.endswith(":streamGenerateContent"):
+            await occupied(latency)
+            return payload
+
+        chunks = stream_payloads(payload)
+
+        async def events():
+            # Gecikme parçalara eşit yayılır: ilk parça toplam sürenin 1/n'inde gelir
+            for chunk in chunks:
+                await occupied(latency / len(chunks))
+                yield f"data: {json.dumps(chunk, ensure_ascii=False)}\r\n\r\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Yerel sahte Gemini generate_content sunucusu.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency-ms", type=float, default=800.0, help="Yanıt gecikmesinin medyanı")
+    parser.add_argument("--latency-sigma", type=float, default=0.3, help="Log-normal gecikmenin yayılımı (0: sabit)")
+    parser.add_argument("--ms-per-output-token", type=float, default=0.0,
+                        help="Üretilen çıktı token'ı başına eklenen gecikme (ms)")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Rastgele 429 olasılığı")
+    parser.add_argument("--rpm", type=int, default=0, help="Dakikalık istek kotası; aşılınca 429 (0: sınırsız)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="500/503 olasılığı")
+    parser.add_argument("--retry-delay-s", type=float, default=1.0, help="429 yanıtındaki RetryInfo süresi")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    import uvicorn
+
+    app = create_app(
+        args.latency_ms, args.latency_sigma, args.throttle_rate, args.rpm, args.error_rate, args.retry_delay_s, args.seed,
+        args.ms_per_output_token,
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
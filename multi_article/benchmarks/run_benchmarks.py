@@ -0,0 +1,341 @@
+"""
+Çevrimdışı performans kıyaslaması. Sentetik bir PDF derlemi üzerinde dört aşamayı ölçer:
+
+    extraction     – _extract_text_from_pdf (sayfa tarama + temizleme, süreç havuzu dahil)
+    cleaning       – metin temizleme/normalleştirme adımı (TEXT_NORMALIZATION=0 ise clean_extracted_text)
+    upload_pdf     – Kök uygulamanın /upload-pdf uç noktası (uçtan uca)
+    summarize_pdfs – multi_article uygulamasının /summarize-pdfs uç noktası (uçtan uca)
+
+Sayfa/sn, derlemdeki belge sayfalarına göre hesaplanır (bütçe dolunca atlanan sayfalar dahil).
+Gemini çağrıları ağ kullanmayan sahte bir istemciyle yapılır; özet önbelleği devre dışıdır,
+yani her istek metin çıkarma ve model adımlarından geçer. Sonuçlar (sayfa/sn, p50/p95/p99
+gecikme, en yüksek bellek) JSON olarak yazılır; --baseline ile önceki bir çalıştırmayla
+karşılaştırılır.
+
+Kullanım:
+    python benchmarks/run_benchmarks.py [--corpus <pdf_klasörü>] [--iterations 3]
+                                        [--llm-latency-ms 0] [--output sonuc.json]
+                                        [--baseline onceki.json]
+"""
+import os
+import io
+import sys
+import json
+import time
+import asyncio
+import platform
+import shutil
+import argparse
+import tempfile
+import contextlib
+import importlib.util
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+APP_DIR = os.path.dirname(BENCHMARK_DIR)
+ROOT_DIR = os.path.dirname(APP_DIR)
+sys.path.insert(0, APP_DIR)
+
+# Uygulama modülleri içe aktarılmadan önce: kalıcı dosyalar geçici klasöre yazılır
+WORK_DIR = tempfile.mkdtemp(prefix="pdf_benchmark_")
+os.environ["SUMMARY_CACHE_PATH"] = os.path.join(WORK_DIR, "summary_cache.sqlite3")
+os.environ["JOBS_DB_PATH"] = os.path.join(WORK_DIR, "jobs.sqlite3")
+os.environ["JOBS_DIR"] = os.path.join(WORK_DIR, "jobs")
+os.environ["PREVIEW_CACHE_PATH"] = os.path.join(WORK_DIR, "preview_cache.sqlite3")
+os.environ["CORPUS_INDEX_PATH"] = os.path.join(WORK_DIR, "corpus_index.sqlite3")
+os.environ["NEAR_DUPLICATE_INDEX_PATH"] = os.path.join(WORK_DIR, "near_duplicates.sqlite3")
+# Sahte istemci kotaya tabi değildir; istemci tarafı hız sınırı ölçümü bozmasın
+os.environ.setdefault("GEMINI_RPM", "0")
+
+from synthetic_corpus import generate_corpus  # noqa: E402
+from summary_cache import SummaryCache  # noqa: E402
+from uploads import peak_rss_mb  # noqa: E402
+
+# Raporlanan karşılaştırma metrikleri: (aşama alanı, yüksek değer daha mı iyi)
+_COMPARED_METRICS = [("pages_per_sec", True), ("latency_ms.p50", False), ("latency_ms.p95", False)]
+
+
+class _StubResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class StubGeminiClient:
+    """
+    google-genai istemcisinin kullanılan kısmını taklit eder (models / aio.models).
+    Her çağrı, şemadaki tüm alanları dolduran geçerli bir JSON döner.
+    """
+
+    def __init__(self, fields: List[str], latency_ms: float = 0.0):
+        self._text = json.dumps({name: "benchmark" for name in fields})
+        self._latency = latency_ms / 1000
+        self.calls = 0
+        self.models = self
+        self.aio = _AsyncStub(self)
+
+    def generate_content(self, **kwargs) -> _StubResponse:
+        self.calls += 1
+        if self._latency:
+            time.sleep(self._latency)
+        return _StubResponse(self._text)
+
+
+class _AsyncStub:
+    def __init__(self, stub: StubGeminiClient):
+        self._stub = stub
+        self.models = self
+
+    async def generate_content(self, **kwargs) -> _StubResponse:
+        self._stub.calls += 1
+        if self._stub._latency:
+            await asyncio.sleep(self._stub._latency)
+        return _StubResponse(self._stub._text)
+
+
+def _load_module(name: str, path: str):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _prepare_app(module, llm_latency_ms: float) -> StubGeminiClient:
+    """Uygulama modülünün Gemini istemcisini sahtesiyle değiştirir ve önbelleği kapatır."""
+    stub = StubGeminiClient(list(module.ArticleSummary.model_fields), llm_latency_ms)
+    module.client = stub
+    # max_entries=0: her yazma tüm kayıtları siler, okuma hiçbir zaman isabet etmez
+    module.summary_cache = SummaryCache(os.environ["SUMMARY_CACHE_PATH"], max_entries=0)
+    return stub
+
+
+def latency_stats(samples: List[float]) -> Dict[str, Optional[float]]:
+    """Saniye cinsinden örneklerden milisaniye cinsinden p50/p95/p99, ortalama ve en büyük değer."""
+    if not samples:
+        return {"p50": None, "p95": None, "p99": None, "mean": None, "max": None}
+    ms = np.asarray(samples) * 1000
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {
+        "p50": round(float(p50), 2),
+        "p95": round(float(p95), 2),
+        "p99": round(float(p99), 2),
+        "mean": round(float(ms.mean()), 2),
+        "max": round(float(ms.max()), 2),
+    }
+
+
+def _stage_result(samples: List[float], pages: int, documents: int, **extra) -> Dict[str, Any]:
+    seconds = sum(samples)
+    return {
+        "documents": documents,
+        "pages": pages,
+        "seconds": round(seconds, 4),
+        "pages_per_sec": round(pages / seconds, 2) if seconds else None,
+        "latency_ms": latency_stats(samples),
+        "peak_rss_mb": peak_rss_mb(),
+        **extra,
+    }
+
+
+def bench_extraction(app, corpus: List[Dict], iterations: int) -> Dict[str, Any]:
+    samples, by_layout, pages = [], {}, 0
+    for _ in range(iterations):
+        for document in corpus:
+            started = time.perf_counter()
+            try:
+                app._extract_text_from_pdf(document["path"], char_budget=app.MAX_CHARACTERS)
+            except ValueError:
+                # Metin katmanı olmayan (taranmış) PDF'ler hata ile döner; süre yine de sayılır
+                pass
+            elapsed = time.perf_counter() - started
+            samples.append(elapsed)
+            by_layout.setdefault(document["layout"], []).append(elapsed)
+            pages += document["pages"]
+    layouts = {
+        layout: latency_stats(layout_samples) for layout, layout_samples in by_layout.items()
+    }
+    return _stage_result(samples, pages, len(corpus) * iterations, by_layout=layouts)
+
+
+def bench_cleaning(app, corpus: List[Dict], iterations: int) -> Dict[str, Any]:
+    from pdf_extraction import clean_extracted_text
+    from text_normalization import normalize_page_texts
+
+    normalize = app.extraction_engine.normalize
+    # Ham sayfa metinleri bir kez çıkarılır; yalnızca temizleme adımı ölçülür
+    raw_documents = []
+    for document in corpus:
+        try:
+            raw_documents.append(app.extraction_engine.extract_pages(document["path"]))
+        except ValueError:
+            continue
+    samples, pages, characters, saved = [], 0, 0, 0
+    for _ in range(iterations):
+        for page_texts in raw_documents:
+            started = time.perf_counter()
+            if normalize:
+                _, stats = normalize_page_texts(page_texts)
+                saved += stats["chars_saved"]
+            else:
+                clean_extracted_text(page_texts)
+            samples.append(time.perf_counter() - started)
+            pages += len(page_texts)
+            characters += sum(len(text) for text in page_texts)
+    seconds = sum(samples)
+    return _stage_result(
+        samples, pages, len(raw_documents) * iterations,
+        chars_per_sec=round(characters / seconds) if seconds else None,
+        chars_saved_per_doc=round(saved / (len(raw_documents) * iterations)) if normalize and raw_documents else None,
+    )
+
+
+def bench_endpoint(
+    app, corpus: List[Dict], iterations: int, path: str, field: str, batch: bool
+) -> Dict[str, Any]:
+    from fastapi.testclient import TestClient
+
+    samples, statuses, pages = [], {}, 0
+    with TestClient(app.app) as http:
+        for _ in range(iterations):
+            groups = [corpus] if batch else [[document] for document in corpus]
+            for group in groups:
+                handles = [open(document["path"], "rb") for document in group]
+                try:
+                    files = [
+                        (field, (os.path.basename(document["path"]), handle, "application/pdf"))
+                        for document, handle in zip(group, handles)
+                    ]
+                    started = time.perf_counter()
+                    response = http.post(path, files=files)
+                    samples.append(time.perf_counter() - started)
+                finally:
+                    for handle in handles:
+                        handle.close()
+                statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+                pages += sum(document["pages"] for document in group)
+    return _stage_result(samples, pages, len(corpus) * iterations, requests=len(samples), status_codes=statuses)
+
+
+def compare(result: Dict[str, Any], baseline: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """İki çalıştırmanın aşama metriklerini karşılaştırır; yüzde değişim ve gerileme bayrağı döner."""
+    comparison = {}
+    for stage, current in result["stages"].items():
+        previous = baseline.get("stages", {}).get(stage)
+        if not previous:
+            continue
+        for metric, higher_is_better in _COMPARED_METRICS:
+            new, old = current, previous
+            for key in metric.split("."):
+                new, old = (new or {}).get(key), (old or {}).get(key)
+            if not new or not old:
+                continue
+            change = (new - old) / old * 100
+            comparison[f"{stage}.{metric}"] = {
+                "baseline": old,
+                "current": new,
+                "change_pct": round(change, 1),
+                "regression": change < 0 if higher_is_better else change > 0,
+            }
+    return comparison
+
+
+def run(corpus: List[Dict], iterations: int, llm_latency_ms: float, stages: List[str]) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    # Uygulamalar istek başına log yazar; kıyaslama çıktısını kirletmemesi için bastırılır
+    with contextlib.redirect_stdout(io.StringIO()):
+        multi_app = _load_module("multi_article_main", os.path.join(APP_DIR, "main.py"))
+        multi_stub = _prepare_app(multi_app, llm_latency_ms)
+        root_app = _load_module("root_main", os.path.join(ROOT_DIR, "main.py"))
+        root_stub = _prepare_app(root_app, llm_latency_ms)
+
+        if "extraction" in stages or "cleaning" in stages:
+            multi_app.extraction_engine.start()
+            try:
+                if "extraction" in stages:
+                    results["extraction"] = bench_extraction(multi_app, corpus, iterations)
+                if "cleaning" in stages:
+                    results["cleaning"] = bench_cleaning(multi_app, corpus, iterations)
+            finally:
+                multi_app.extraction_engine.shutdown()
+        if "upload_pdf" in stages:
+            results["upload_pdf"] = bench_endpoint(root_app, corpus, iterations, "/upload-pdf", "file", batch=False)
+        if "summarize_pdfs" in stages:
+            results["summarize_pdfs"] = bench_endpoint(multi_app, corpus, iterations, "/summarize-pdfs", "files", batch=True)
+
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "extraction_backend": multi_app.extraction_engine.backend,
+            "text_normalization": multi_app.extraction_engine.normalize,
+            "extraction_workers": multi_app.extraction_engine.max_workers,
+            "iterations": iterations,
+            "llm_latency_ms": llm_latency_ms,
+        },
+        "corpus": {
+            "documents": len(corpus),
+            "pages": sum(document["pages"] for document in corpus),
+            "layouts": sorted({document["layout"] for document in corpus}),
+        },
+        "stages": results,
+        "llm_calls": multi_stub.calls + root_stub.calls,
+        "memory": {
+            "peak_rss_mb": peak_rss_mb(),
+            "peak_rss_children_mb": _children_peak_rss_mb(),
+        },
+    }
+
+
+def _children_peak_rss_mb() -> Optional[float]:
+    """Süreç havuzu worker'larının en yüksek bellek kullanımı (MB); desteklenmiyorsa None."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 1)
+
+
+def main():
+    stage_names = ["extraction", "cleaning", "upload_pdf", "summarize_pdfs"]
+    parser = argparse.ArgumentParser(description="Metin çıkarma, temizleme ve uçtan uca gecikme kıyaslaması.")
+    parser.add_argument("--corpus", help="Mevcut bir PDF klasörü yerine sentetik derlem oluşturulacak/okunacak klasör")
+    parser.add_argument("--copies", type=int, default=3, help="Sentetik derlemde yerleşim başına PDF sayısı")
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="Sahte Gemini çağrısı başına eklenen gecikme")
+    parser.add_argument("--stages", nargs="+", choices=stage_names, default=stage_names)
+    parser.add_argument("--output", help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument("--baseline", help="Karşılaştırılacak önceki sonuç JSON dosyası")
+    args = parser.parse_args()
+
+    try:
+        corpus = generate_corpus(args.corpus or os.path.join(WORK_DIR, "corpus"), args.copies)
+        result = run(corpus, args.iterations, args.llm_latency_ms, args.stages)
+    finally:
+        shutil.rmtree(WORK_DIR, ignore_errors=True)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            result["comparison"] = compare(result, json.load(f))
+
+    print(f"{'Aşama':<16}{'sayfa/sn':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'RSS MB':>9}")
+    for stage, s in result["stages"].items():
+        latency = s["latency_ms"]
+        print(
+            f"{stage:<16}{s['pages_per_sec'] or 0:>10}{latency['p50'] or 0:>10}"
+            f"{latency['p95'] or 0:>10}{latency['p99'] or 0:>10}{s['peak_rss_mb'] or 0:>9}"
+        )
+    for metric, change in result.get("comparison", {}).items():
+        flag = "  GERİLEME" if change["regression"] else ""
+        print(f"{metric}: {change['baseline']} -> {change['current']} ({change['change_pct']:+}%){flag}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Kıyaslama (benchmark) için sentetik makale PDF'leri üretir. Harici bir kütüphane gerekmez;
+PDF dosyaları doğrudan yazılır ve aynı seed ile her çalıştırmada birebir aynı derlem oluşur.
+
+Yerleşimler:
+    short       – Tek sütunlu, birkaç sayfalık kısa makale
+    long        – Tek sütunlu uzun makale; sonunda kaynakça bölümü bulunur
+    two_column  – Konferans makalesi gibi iki sütunlu sayfalar
+    scanned     – Yalnızca görüntüden oluşan (metin katmanı olmayan) taranmış sayfalar
+
+Kullanım:
+    python benchmarks/synthetic_corpus.py <çıktı_klasörü> [--copies 3] [--seed 7]
+"""
+import os
+import sys
+import zlib
+import random
+import argparse
+from typing import Dict, List, Tuple
+
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842  # A4, punto
+FONT_SIZE = 9
+LINE_HEIGHT = 11
+LINES_PER_PAGE = 64
+
+# Yerleşim adı -> sayfa sayısı
+LAYOUTS: Dict[str, int] = {
+    "short": 4,
+    "long": 40,
+    "two_column": 8,
+    "scanned": 6,
+}
+
+_WORDS = (
+    "we propose a novel method for learning robust representations from noisy data the model "
+    "is trained on a large dataset and evaluated on several benchmarks results show that our "
+    "approach outperforms the baseline in accuracy precision and recall the architecture uses "
+    "attention layers with residual connections and the training procedure relies on stochastic "
+    "gradient descent with a cosine schedule experiments on image and text corpora confirm the "
+    "improvement we also analyze the effect of data augmentation regularization and model size"
+).split()
+
+_HEADER = "Journal of Synthetic Benchmarks, Vol. 1"
+
+
+def _sentence(rng: random.Random) -> str:
+    words = [rng.choice(_WORDS) for _ in range(rng.randint(8, 18))]
+    return " ".join(words).capitalize() + "."
+
+
+def _paragraph_lines(rng: random.Random, line_chars: int, count: int) -> List[str]:
+    """Belirtilen genişlikte, kelime sınırından kırılmış count adet metin satırı üretir."""
+    lines: List[str] = []
+    current = ""
+    while len(lines) < count:
+        for word in _sentence(rng).split():
+            if len(current) + len(word) + 1 > line_chars:
+                lines.append(current)
+                current = ""
+            current = f"{current} {word}" if current else word
+    return lines[:count]
+
+
+def _escape(text: str) -> bytes:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)").encode("latin-1")
+
+
+def _text_stream(columns: List[Tuple[int, List[str]]], page_number: int) -> bytes:
+    """Her sütun (x konumu, satırlar) için metin çizen sayfa içerik akışı; üst/alt bilgi dahil."""
+    parts = [b"BT /F1 %d Tf %d TL" % (FONT_SIZE, LINE_HEIGHT)]
+    parts.append(b"1 0 0 1 50 %d Tm (%s) Tj" % (PAGE_HEIGHT - 40, _escape(_HEADER)))
+    for x, lines in columns:
+        parts.append(b"1 0 0 1 %d %d Tm" % (x, PAGE_HEIGHT - 70))
+        parts.extend(b"(%s) Tj T*" % _escape(line) for line in lines)
+    parts.append(b"1 0 0 1 %d 30 Tm (%d) Tj" % (PAGE_WIDTH // 2, page_number))
+    parts.append(b"ET")
+    return b"\n".join(parts)
+
+
+def _scanned_image(rng: random.Random) -> bytes:
+    """Taranmış sayfayı andıran gri tonlu gürültü (satır bantları + kağıt dokusu)."""
+    width, height = PAGE_WIDTH // 2, PAGE_HEIGHT // 2
+    rows = []
+    for y in range(height):
+        ink = 40 < y < height - 40 and (y // 6) % 2 == 0
+        rows.append(bytes(
+            rng.randint(60, 120) if ink and rng.random() < 0.45 else rng.randint(225, 255)
+            for _ in range(width)
+        ))
+    return b"".join(rows)
+
+
+def make_pdf(layout: str, pages: int, seed: int) -> bytes:
+    """Verilen yerleşimde ve sayfa sayısında sentetik bir makale PDF'i üretir."""
+    if layout not in LAYOUTS:
+        raise ValueError(f"Bilinmeyen yerleşim: {layout}")
+    rng = random.Random(f"{layout}:{seed}")
+
+    objects: List[bytes] = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    def add_stream(dictionary: bytes, data: bytes) -> int:
+        return add(b"<< %s /Length %d >>\nstream\n" % (dictionary, len(data)) + data + b"\nendstream")
+
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    pages_id = len(objects) + 1
+    add(b"")  # /Pages nesnesi sayfalar yazıldıktan sonra doldurulur
+    page_ids = []
+
+    for number in range(1, pages + 1):
+        resources = b"/Font << /F1 %d 0 R >>" % font
+        if layout == "scanned":
+            image = add_stream(
+                b"/Type /XObject /Subtype /Image /Width %d /Height %d /ColorSpace /DeviceGray "
+                b"/BitsPerComponent 8 /Filter /FlateDecode" % (PAGE_WIDTH // 2, PAGE_HEIGHT // 2),
+                zlib.compress(_scanned_image(rng)),
+            )
+            resources = b"/XObject << /Im1 %d 0 R >>" % image
+            content = b"q %d 0 0 %d 0 0 cm /Im1 Do Q" % (PAGE_WIDTH, PAGE_HEIGHT)
+        elif layout == "two_column":
+            columns = [(50, _paragraph_lines(rng, 52, LINES_PER_PAGE)),
+                       (310, _paragraph_lines(rng, 52, LINES_PER_PAGE))]
+            content = _text_stream(columns, number)
+        else:
+            lines = _paragraph_lines(rng, 105, LINES_PER_PAGE)
+            if layout == "long" and number == pages - 2:
+                # Son sayfalar kaynakça: sayfa taraması burada durmalı
+                lines = ["References"] + [f"[{i}] A. Author. {_sentence(rng)}" for i in range(1, 40)]
+            content = _text_stream([(50, lines)], number)
+        contents = add_stream(b"", content)
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] /Contents %d 0 R /Resources << %s >> >>"
+            % (pages_id, PAGE_WIDTH, PAGE_HEIGHT, contents, resources)
+        ))
+
+    objects[pages_id - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % i for i in page_ids), len(page_ids)
+    )
+    catalog = add(b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id)
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    output += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, catalog, xref
+    )
+    return bytes(output)
+
+
+def generate_corpus(directory: str, copies: int = 3, seed: int = 7) -> List[Dict]:
+    """
+    Her yerleşimden copies adet (farklı içerikli) PDF yazar.
+    [{"path", "layout", "pages", "bytes"}] listesi döner.
+    """
+    os.makedirs(directory, exist_ok=True)
+    corpus = []
+    for layout, pages in LAYOUTS.items():
+        for copy in range(copies):
+            path = os.path.join(directory, f"{layout}_{copy + 1}.pdf")
+            data = make_pdf(layout, pages, seed + copy)
+            with open(path, "wb") as f:
+                f.write(data)
+            corpus.append({"path": path, "layout": layout, "pages": pages, "bytes": len(data)})
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Kıyaslama için sentetik PDF derlemi üretir.")
+    parser.add_argument("output_dir", help="PDF'lerin yazılacağı klasör")
+    parser.add_argument("--copies", type=int, default=3, help="Yerleşim başına PDF sayısı")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    corpus = generate_corpus(args.output_dir, args.copies, args.seed)
+    for document in corpus:
+        print(f"{document['path']}  {document['layout']:<11} {document['pages']:>3} sayfa  {document['bytes']:>9} bayt")
+    if not corpus:
+        sys.exit("Derlem boş.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,404 @@
+"""
+Toplu klasör işleme (backfill). Bir klasördeki (alt klasörler dahil) PDF'leri sunucu
+uygulamasının _extract_text_from_pdf ve _get_gemini_summary fonksiyonlarıyla özetler.
+
+İşlem, sınırlı kuyruklarla bağlı aşamalardan oluşan bir üretici/tüketici hattıdır:
+
+    tarama -> metin çıkarma (--parse-workers) -> özetleme (--llm-workers) -> yazma
+
+Sıradaki dosyaların metni, süren LLM çağrılarıyla eşzamanlı çıkarılır. Kuyruklar dolunca
+önceki aşama bekler; bellekte en fazla --queue-size kadar çıkarılmış metin tutulur.
+Gemini çağrıları sunucuyla aynı kota/yeniden deneme zamanlayıcısından (GEMINI_RPM) geçer.
+
+Sonuçlar diske yazıldıkça kontrol noktasına (SQLite) işlenir. Yarıda kesilen bir çalıştırma
+aynı komutla devam eder: başarıyla işlenmiş ve o günden beri değişmemiş dosyalar atlanır,
+başarısız olanlar yeniden denenir (--skip-failed ile atlanır).
+
+Kullanım:
+    python bulk_ingest.py <pdf_klasörü> --output sonuclar.jsonl
+    python bulk_ingest.py <pdf_klasörü> --output sonuclar_parquet --format parquet
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import sqlite3
+import argparse
+from contextlib import contextmanager
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, APP_DIR)
+
+import main as summarizer  # noqa: E402
+from gemini_client import GeminiUnavailableError  # noqa: E402
+from gemini_scheduler import is_throttled  # noqa: E402
+from uploads import SpooledPdf  # noqa: E402
+
+SUMMARY_FIELDS = list(summarizer.ArticleSummary.model_fields)
+MIN_TEXT_CHARS = 500
+PARQUET_ROWS_PER_FILE = 500
+
+
+class PdfFile(NamedTuple):
+    path: str
+    relative_path: str
+    size: int
+    mtime_ns: int
+
+
+# Kuyruktaki bir kayıt: (dosya, çıktı satırı)
+Entry = Tuple[PdfFile, Dict[str, Any]]
+
+
+def find_pdfs(directory: str) -> List[PdfFile]:
+    """Klasördeki PDF'leri (alt klasörler dahil) sabit sırayla listeler."""
+    files = []
+    for root, dirs, names in os.walk(directory):
+        dirs.sort()
+        for name in sorted(names):
+            if not name.lower().endswith(".pdf"):
+                continue
+            path = os.path.join(root, name)
+            stat = os.stat(path)
+            files.append(PdfFile(path, os.path.relpath(path, directory), stat.st_size, stat.st_mtime_ns))
+    return files
+
+
+class Checkpoint:
+    """
+    İşlenen dosyaların kaydı. Bir dosya, sonucu çıktıya yazıldıktan sonra işaretlenir;
+    boyutu veya değiştirilme zamanı değişen dosyalar yeniden işlenir.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS files ("
+                " path TEXT PRIMARY KEY,"
+                " size INTEGER NOT NULL,"
+                " mtime_ns INTEGER NOT NULL,"
+                " sha256 TEXT,"
+                " status TEXT NOT NULL,"
+                " updated_at REAL NOT NULL)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def pending(self, files: List[PdfFile], skip_failed: bool = False) -> List[PdfFile]:
+        """Daha önce işlenmemiş (veya o günden beri değişmiş) dosyaları döner."""
+        with self._connect() as conn:
+            done = {
+                path: (size, mtime_ns, status)
+                for path, size, mtime_ns, status in conn.execute("SELECT path, size, mtime_ns, status FROM files")
+            }
+        skipped_statuses = {"Success", "Failed"} if skip_failed else {"Success"}
+        return [
+            pdf for pdf in files
+            if not (
+                pdf.relative_path in done
+                and done[pdf.relative_path][:2] == (pdf.size, pdf.mtime_ns)
+                and done[pdf.relative_path][2] in skipped_statuses
+            )
+        ]
+
+    def mark(self, entries: List[Entry]) -> None:
+        if not entries:
+            return
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO files (path, size, mtime_ns, sha256, status, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (pdf.relative_path, pdf.size, pdf.mtime_ns, row["sha256"], row["status"], now)
+                    for pdf, row in entries
+                ],
+            )
+
+
+class JsonlSink:
+    """
+    Sonuçları satır başına bir JSON nesnesi olarak dosyanın sonuna ekler; her satır hemen diske yazılır.
+    Satır yazıldıktan sonra, kontrol noktası işaretlenmeden süreç çökerse dosya devam eden
+    çalıştırmada yeniden işlenir. Bu durumda dosyada zaten bulunan satır (aynı yol ve hash için
+    başarılı sonuç veya aynı durum) tekrar yazılmaz, yalnızca kontrol noktasına işlenir.
+    """
+
+    def __init__(self, path: str):
+        self._written = set()
+        needs_newline = False
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    needs_newline = not line.endswith("\n")
+                    try:
+                        row = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Çökme anında yarım kalmış son satır
+                        continue
+                    self._written.add((row.get("path"), row.get("sha256"), row.get("status")))
+        self._file = open(path, "a", encoding="utf-8")
+        if needs_newline:
+            # Yarım satırın devamına yazılmasın
+            self._file.write("\n")
+
+    def add(self, entry: Entry) -> List[Entry]:
+        row = entry[1]
+        key = (row["path"], row["sha256"], row["status"])
+        if key in self._written or (row["path"], row["sha256"], "Success") in self._written:
+            return [entry]
+        self._file.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._written.add(key)
+        return [entry]
+
+    def close(self) -> List[Entry]:
+        self._file.close()
+        return []
+
+
+class ParquetSink:
+    """
+    Sonuçları bir klasöre parça parça Parquet dosyaları (part-00000.parquet ...) olarak yazar.
+    Parquet dosyası kapatılmadan okunamadığından satırlar PARQUET_ROWS_PER_FILE'lık gruplar
+    halinde yazılır ve kontrol noktasına ancak dosya tamamlandıktan sonra işlenir.
+    Klasör pyarrow / pandas ile tek bir tablo olarak okunabilir.
+    """
+
+    def __init__(self, directory: str, rows_per_file: int = PARQUET_ROWS_PER_FILE):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise SystemExit("Parquet çıktısı için pyarrow gerekli: pip install pyarrow") from e
+        self._pa, self._pq = pa, pq
+        self.directory = directory
+        self.rows_per_file = rows_per_file
+        os.makedirs(directory, exist_ok=True)
+        # Devam eden çalıştırmada önceki parçaların üzerine yazılmaz
+        self._part = sum(1 for name in os.listdir(directory) if name.startswith("part-"))
+        self._buffer: List[Entry] = []
+        self.schema = pa.schema(
+            [
+                ("path", pa.string()),
+                ("filename", pa.string()),
+                ("sha256", pa.string()),
+                ("status", pa.string()),
+                ("detail", pa.string()),
+                ("text_length", pa.int64()),
+                ("model_used", pa.string()),
+            ]
+            + [(field, pa.string()) for field in SUMMARY_FIELDS]
+            + [("processed_at", pa.float64())]
+        )
+
+    def add(self, entry: Entry) -> List[Entry]:
+        self._buffer.append(entry)
+        return self._flush() if len(self._buffer) >= self.rows_per_file else []
+
+    def _flush(self) -> List[Entry]:
+        entries, self._buffer = self._buffer, []
+        if not entries:
+            return []
+        table = self._pa.Table.from_pylist([row for _, row in entries], schema=self.schema)
+        path = os.path.join(self.directory, f"part-{self._part:05d}.parquet")
+        # Yarım kalan dosya görünmesin: önce geçici isimle yazılır
+        self._pq.write_table(table, path + ".tmp")
+        os.replace(path + ".tmp", path)
+        self._part += 1
+        return entries
+
+    def close(self) -> List[Entry]:
+        return self._flush()
+
+
+def _result_row(pdf: PdfFile, sha256: Optional[str], status: str, **fields: Any) -> Dict[str, Any]:
+    row = {
+        "path": pdf.relative_path,
+        "filename": os.path.basename(pdf.path),
+        "sha256": sha256,
+        "status": status,
+        "detail": None,
+        "text_length": None,
+        "model_used": None,
+        **{field: None for field in SUMMARY_FIELDS},
+        "processed_at": time.time(),
+    }
+    row.update(fields)
+    return row
+
+
+def _failure_detail(error: Exception) -> str:
+    if is_throttled(error):
+        return "Gemini kotası aşıldı. Lütfen bir süre sonra tekrar deneyin."
+    if isinstance(error, json.JSONDecodeError):
+        return "LLM hatalı/geçersiz JSON formatında yanıt verdi."
+    if isinstance(error, ValueError):
+        return f"Dosya işleme hatası: {error}"
+    return f"Beklenmedik bir hata oluştu: {type(error).__name__} - {error}"
+
+
+async def run_pipeline(
+    files: List[PdfFile],
+    checkpoint: Checkpoint,
+    sink,
+    parse_workers: int,
+    llm_workers: int,
+    queue_size: int,
+) -> Dict[str, int]:
+    """
+    Dosyaları aşamalı hattan geçirir; (Success / Failed) sayılarını döner.
+    Bir aşama beklenmedik şekilde çökerse (örn. çıktı yazılamıyor) diğer aşamalar iptal edilir,
+    yazılmış satırlar kontrol noktasına işlenir ve hata fırlatılır.
+    """
+    parse_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    llm_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    write_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    counts = {"Success": 0, "Failed": 0}
+    started = time.perf_counter()
+
+    async def parse():
+        while (pdf := await parse_queue.get()) is not None:
+            sha256 = None
+            try:
+                spooled = await asyncio.to_thread(SpooledPdf.from_path, pdf.path)
+                sha256 = spooled.sha256
+                text = await asyncio.to_thread(
+                    summarizer._extract_text_from_pdf, pdf.path, None, summarizer.MAX_CHARACTERS
+                )
+                if len(text) < MIN_TEXT_CHARS:
+                    raise ValueError("PDF'ten yeterli metin çıkarılamadı (Min 500 karakter gerekli).")
+            except Exception as e:
+                await write_queue.put((pdf, _result_row(pdf, sha256, "Failed", detail=_failure_detail(e))))
+                continue
+            await llm_queue.put((pdf, sha256, text))
+
+    async def summarize():
+        while (job := await llm_queue.get()) is not None:
+            pdf, sha256, text = job
+            input_text = text[:summarizer.MAX_CHARACTERS]
+            try:
+                # Senkron _get_gemini_summary thread'de, sunucuyla aynı kota zamanlayıcısı içinde çalışır
+                summary = await summarizer.gemini_scheduler.call(
+                    lambda: asyncio.to_thread(summarizer._get_gemini_summary, input_text)
+                )
+            except Exception as e:
+                row = _result_row(pdf, sha256, "Failed", detail=_failure_detail(e), text_length=len(text))
+            else:
+                row = _result_row(
+                    pdf, sha256, "Success",
+                    text_length=len(text),
+                    model_used=summarizer.GEMINI_MODEL,
+                    **summary.model_dump(),
+                )
+            await write_queue.put((pdf, row))
+
+    def record(entries: List[Entry]) -> None:
+        checkpoint.mark(entries)
+        for pdf, row in entries:
+            counts[row["status"]] += 1
+            done = counts["Success"] + counts["Failed"]
+            rate = done / max(time.perf_counter() - started, 1e-9) * 60
+            print(f"[{done}/{len(files)}] {pdf.relative_path} - {row['status']} ({rate:.1f} dosya/dk)")
+
+    async def write():
+        while (entry := await write_queue.get()) is not None:
+            record(await asyncio.to_thread(sink.add, entry))
+
+    async def feed():
+        for pdf in files:
+            await parse_queue.put(pdf)
+        for _ in parsers:
+            await parse_queue.put(None)
+        await asyncio.gather(*parsers)
+        for _ in summarizers:
+            await llm_queue.put(None)
+        await asyncio.gather(*summarizers)
+        await write_queue.put(None)
+
+    parsers = [asyncio.create_task(parse()) for _ in range(parse_workers)]
+    summarizers = [asyncio.create_task(summarize()) for _ in range(llm_workers)]
+    writer = asyncio.create_task(write())
+    tasks = parsers + summarizers + [writer, asyncio.create_task(feed())]
+    try:
+        # Bir aşama çökerse diğerleri dolu kuyruklarda sonsuza dek beklemesin: ilk hatada durulur
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        for task in done:
+            if not task.cancelled() and task.exception() is not None:
+                raise task.exception()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        # Kesintide tamponda kalan (Parquet) satırlar da yazılır ve işaretlenir
+        record(sink.close())
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bir klasördeki PDF'leri toplu olarak özetler (devam ettirilebilir).")
+    parser.add_argument("directory", help="PDF klasörü (alt klasörler dahil taranır)")
+    parser.add_argument("--output", required=True, help="JSONL dosyası veya Parquet klasörü")
+    parser.add_argument("--format", choices=["jsonl", "parquet"], default="jsonl")
+    parser.add_argument("--checkpoint", help="Kontrol noktası dosyası (varsayılan: <output>.checkpoint.sqlite3)")
+    parser.add_argument("--parse-workers", type=int, default=2, help="Aynı anda metni çıkarılan dosya sayısı")
+    parser.add_argument("--llm-workers", type=int, default=summarizer.gemini_scheduler.concurrency.maximum,
+                        help="Aynı anda özetlenen dosya sayısı (kota zamanlayıcısı ayrıca sınırlar)")
+    parser.add_argument("--queue-size", type=int, default=16, help="Aşamalar arası kuyruk uzunluğu (geri basınç)")
+    parser.add_argument("--skip-failed", action="store_true", help="Önceki çalıştırmada başarısız olan dosyaları yeniden deneme")
+    args = parser.parse_args()
+
+    try:
+        summarizer._gemini_client()
+    except GeminiUnavailableError as e:
+        raise SystemExit(f"LLM (Gemini) istemcisi başlatılamadı. Ortam değişkenlerini kontrol edin: {e}")
+    if not os.path.isdir(args.directory):
+        raise SystemExit(f"Klasör bulunamadı: {args.directory}")
+
+    checkpoint = Checkpoint(args.checkpoint or args.output.rstrip("/\\") + ".checkpoint.sqlite3")
+    all_files = find_pdfs(args.directory)
+    files = checkpoint.pending(all_files, args.skip_failed)
+    print(f"{len(all_files)} PDF bulundu, {len(all_files) - len(files)} tanesi daha önce işlenmiş; {len(files)} işlenecek.")
+    if not files:
+        return
+
+    sink = ParquetSink(args.output) if args.format == "parquet" else JsonlSink(args.output)
+    summarizer.extraction_engine.start()
+    started = time.perf_counter()
+    try:
+        counts = asyncio.run(
+            run_pipeline(
+                files, checkpoint, sink,
+                max(1, args.parse_workers), max(1, args.llm_workers), max(1, args.queue_size),
+            )
+        )
+    except KeyboardInterrupt:
+        print("Kesildi. Aynı komutla kaldığı yerden devam edilebilir.")
+        return
+    except Exception as e:
+        # Yazılmış sonuçlar kontrol noktasına işlendi; sıfırdan farklı çıkış koduyla durulur
+        raise SystemExit(
+            f"Toplu işlem durdu: {type(e).__name__} - {e}. Sorun giderildikten sonra aynı komutla devam edilebilir."
+        ) from e
+    finally:
+        summarizer.extraction_engine.shutdown()
+    elapsed = time.perf_counter() - started
+    print(
+        f"Tamamlandı: {counts['Success']} başarılı, {counts['Failed']} başarısız, "
+        f"{elapsed:.1f} sn ({len(files) / elapsed * 60:.1f} dosya/dk). Çıktı: {args.output}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+import os
+import re
+import json
+import time
+import sqlite3
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, List
+
+# Derlem ayarları ortam değişkenleri ile değiştirilebilir
+CORPUS_INDEX_PATH = os.getenv("CORPUS_INDEX_PATH", "corpus_index.sqlite3")
+CORPUS_PAGE_SIZE_MAX = 100
+
+# Aranabilir özet alanları ve BM25 ağırlıkları (kategori ve veri seti eşleşmeleri daha değerli)
+SEARCH_FIELDS = ("kategori", "veri_seti", "metodoloji", "sonuclar", "ozet_genel")
+SEARCH_WEIGHTS = (4.0, 3.0, 1.5, 1.0, 1.0)
+
+_QUERY_TERM = re.compile(r"\w+", re.UNICODE)
+
+
+def normalize_category(kategori: str) -> str:
+    """Kategori filtresi için büyük/küçük harf ve boşluk farklarını yok sayar ('nlp ' == 'NLP')."""
+    return kategori.strip().casefold()
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """
+    Kullanıcı sorgusunu güvenli bir FTS5 MATCH ifadesine çevirir: her kelime tırnaklanır
+    ve önek olarak aranır ('veri' -> 'veri', 'verisi', 'verileri'); kelimeler VE ile bağlanır.
+    FTS5 sözdizimi (OR, NEAR, sütun filtreleri) kullanıcıdan alınmaz.
+    """
+    terms = _QUERY_TERM.findall(query)
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+class CorpusIndex:
+    """
+    Üretilen özetlerin kalıcı derlemi. Her makale PDF içeriğinin hash'i ile bir kez saklanır
+    (yeniden yüklemede güncellenir). Özet alanları SQLite FTS5 tam metin indeksinde tutulur ve
+    BM25 ile sıralanır; kategori filtresi normal indeks üzerinden yapılır. LLM çağrısı gerektirmez.
+    """
+
+    def __init__(self, path: str = CORPUS_INDEX_PATH):
+        self.path = path
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS papers ("
+                " id INTEGER PRIMARY KEY,"
+                " sha256 TEXT NOT NULL UNIQUE,"
+                " filename TEXT NOT NULL,"
+                " kategori TEXT NOT NULL,"
+                " kategori_norm TEXT NOT NULL,"
+                " veri_seti TEXT NOT NULL,"
+                " metodoloji TEXT NOT NULL,"
+                " sonuclar TEXT NOT NULL,"
+                " ozet_genel TEXT NOT NULL,"
+                " metadata TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " updated_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_papers_kategori ON papers (kategori_norm, updated_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_papers_updated ON papers (updated_at)")
+            # İçeriği papers tablosunda duran (external content) FTS5 indeksi; tetikleyicilerle eşitlenir
+            fields = ", ".join(SEARCH_FIELDS)
+            new_values = ", ".join(f"new.{field}" for field in SEARCH_FIELDS)
+            old_values = ", ".join(f"old.{field}" for field in SEARCH_FIELDS)
+            conn.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS papers_fts USING fts5({fields},"
+                " content='papers', content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+            )
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS papers_ai AFTER INSERT ON papers BEGIN"
+                f" INSERT INTO papers_fts (rowid, {fields}) VALUES (new.id, {new_values}); END"
+            )
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS papers_ad AFTER DELETE ON papers BEGIN"
+                f" INSERT INTO papers_fts (papers_fts, rowid, {fields}) VALUES ('delete', old.id, {old_values}); END"
+            )
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS papers_au AFTER UPDATE ON papers BEGIN"
+                f" INSERT INTO papers_fts (papers_fts, rowid, {fields}) VALUES ('delete', old.id, {old_values});"
+                f" INSERT INTO papers_fts (rowid, {fields}) VALUES (new.id, {new_values}); END"
+            )
+
+    @contextmanager
+    def _connect(self):
+        # Her işlem için ayrı bağlantı: thread ve çoklu worker süreçleri için güvenli
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def add(self, digest: str, filename: str, summary: Dict[str, Any], metadata: Dict[str, Any]) -> None:
+        """Makalenin özetini ve metin meta verisini (uzunluk, model, örnek metin ...) ekler veya günceller."""
+        now = time.time()
+        values = {field: str(summary.get(field) or "") for field in SEARCH_FIELDS}
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO papers (sha256, filename, kategori, kategori_norm, veri_seti, metodoloji,"
+                " sonuclar, ozet_genel, metadata, created_at, updated_at)"
+                " VALUES (:sha256, :filename, :kategori, :kategori_norm, :veri_seti, :metodoloji,"
+                " :sonuclar, :ozet_genel, :metadata, :now, :now)"
+                " ON CONFLICT (sha256) DO UPDATE SET filename = excluded.filename,"
+                " kategori = excluded.kategori, kategori_norm = excluded.kategori_norm,"
+                " veri_seti = excluded.veri_seti, metodoloji = excluded.metodoloji,"
+                " sonuclar = excluded.sonuclar, ozet_genel = excluded.ozet_genel,"
+                " metadata = excluded.metadata, updated_at = excluded.updated_at",
+                {
+                    **values,
+                    "sha256": digest,
+                    "filename": filename,
+                    "kategori_norm": normalize_category(values["kategori"]),
+                    "metadata": json.dumps(metadata, ensure_ascii=False),
+                    "now": now,
+                },
+            )
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        paper = {
+            "sha256": row["sha256"],
+            "filename": row["filename"],
+            "summary": {field: row[field] for field in SEARCH_FIELDS},
+            "metadata": json.loads(row["metadata"]),
+            "created_at": row["created_at"],
+            "updated_at": row["updated_at"],
+        }
+        if "score" in row.keys():
+            # bm25() küçük (negatif) değerlerde daha iyidir; istemci için büyük = daha ilgili
+            paper["score"] = round(-row["score"], 4)
+        return paper
+
+    def get(self, digest: str) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM papers WHERE sha256 = ?", (digest,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def search(
+        self,
+        query: Optional[str] = None,
+        category: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> Dict[str, Any]:
+        """
+        Özet alanlarında tam metin arama (BM25 sırasıyla) ve/veya kategori filtresi.
+        Sorgu yoksa makaleler en yeni güncellenenden başlayarak listelenir.
+        {'total', 'limit', 'offset', 'results'} döner.
+        """
+        limit = max(1, min(limit, CORPUS_PAGE_SIZE_MAX))
+        offset = max(0, offset)
+        match = build_match_query(query) if query else None
+        conditions, params = [], []
+        if category:
+            conditions.append("p.kategori_norm = ?")
+            params.append(normalize_category(category))
+
+        if match:
+            conditions.insert(0, "papers_fts MATCH ?")
+            params.insert(0, match)
+            where = " AND ".join(conditions)
+            # CROSS JOIN birleştirme sırasını sabitler: önce FTS eşleşmeleri, sonra kategori süzgeci
+            # (aksi halde planlayıcı kategori indeksinden başlayıp her satır için MATCH çalıştırabilir)
+            source = "papers_fts CROSS JOIN papers p ON p.id = papers_fts.rowid"
+            weights = ", ".join(str(weight) for weight in SEARCH_WEIGHTS)
+            select = f"SELECT p.*, bm25(papers_fts, {weights}) AS score FROM {source} WHERE {where} ORDER BY score"
+        else:
+            where = " AND ".join(conditions) or "1"
+            source = "papers p"
+            select = f"SELECT p.* FROM {source} WHERE {where} ORDER BY p.updated_at DESC"
+
+        with self._connect() as conn:
+            total = conn.execute(f"SELECT COUNT(*) FROM {source} WHERE {where}", params).fetchone()[0]
+            rows = conn.execute(f"{select} LIMIT ? OFFSET ?", (*params, limit, offset)).fetchall()
+        return {
+            "total": total,
+            "limit": limit,
+            "offset": offset,
+            "results": [self._to_dict(row) for row in rows],
+        }
+
+    def categories(self) -> List[Dict[str, Any]]:
+        """Derlemdeki kategoriler ve makale sayıları (en kalabalıktan başlayarak)."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT MIN(kategori) AS kategori, COUNT(*) AS count FROM papers"
+                " GROUP BY kategori_norm ORDER BY count DESC, kategori_norm"
+            ).fetchall()
+        return [{"kategori": row["kategori"], "count": row["count"]} for row in rows]
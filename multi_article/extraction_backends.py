@@ -0,0 +1,130 @@
+import io
+import threading
+from contextlib import contextmanager
+from typing import Dict, Callable, Iterator, Union
+
+# PDF kaynağı: bellekteki baytlar veya diskteki dosyanın yolu (dosya belleğe kopyalanmadan açılır)
+PdfSource = Union[bytes, str]
+
+
+class PdfplumberSource:
+    """pdfplumber: yerleşim analizi yapar; en kaliteli ancak en yavaş arka uç."""
+
+    def __init__(self, source: PdfSource):
+        import pdfplumber
+
+        self._pdf = pdfplumber.open(source if isinstance(source, str) else io.BytesIO(source))
+
+    def __len__(self) -> int:
+        return len(self._pdf.pages)
+
+    def page_text(self, page_number: int) -> str:
+        page = self._pdf.pages[page_number]
+        try:
+            return page.extract_text() or ""
+        finally:
+            # Sayfanın ayrıştırılmış yerleşim nesneleri (karakter, çizgi ...) belge kapanana kadar
+            # tutulmaz; bellek kullanımı sayfa sayısıyla değil, en büyük sayfayla sınırlı kalır
+            page.close()
+
+    def close(self) -> None:
+        self._pdf.close()
+
+
+class PdfminerSource:
+    """pdfminer.six, yerleşim analizi kapalı (laparams=None): karakterler akış sırasıyla okunur."""
+
+    def __init__(self, source: PdfSource):
+        from pdfminer.pdfparser import PDFParser
+        from pdfminer.pdfdocument import PDFDocument
+        from pdfminer.pdfpage import PDFPage
+        from pdfminer.pdfinterp import PDFResourceManager
+
+        self._stream = open(source, "rb") if isinstance(source, str) else io.BytesIO(source)
+        document = PDFDocument(PDFParser(self._stream))
+        self._pages = list(PDFPage.create_pages(document))
+        self._resources = PDFResourceManager(caching=True)
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+    def page_text(self, page_number: int) -> str:
+        from pdfminer.converter import TextConverter
+        from pdfminer.pdfinterp import PDFPageInterpreter
+
+        output = io.StringIO()
+        device = TextConverter(self._resources, output, laparams=None)
+        try:
+            PDFPageInterpreter(self._resources, device).process_page(self._pages[page_number])
+        finally:
+            device.close()
+        return output.getvalue()
+
+    def close(self) -> None:
+        self._stream.close()
+
+
+# pdfium thread-safe değildir; aynı süreçte birden fazla thread kullanıyorsa sırayla çalışır
+_PDFIUM_LOCK = threading.RLock()
+
+
+class PdfiumSource:
+    """pypdfium2 (C tabanlı pdfium): düz okuma sırası metin için en hızlı arka uç."""
+
+    def __init__(self, source: PdfSource):
+        import pypdfium2 as pdfium
+
+        _PDFIUM_LOCK.acquire()
+        try:
+            self._pdf = pdfium.PdfDocument(source)
+        except Exception:
+            _PDFIUM_LOCK.release()
+            raise
+
+    def __len__(self) -> int:
+        return len(self._pdf)
+
+    def page_text(self, page_number: int) -> str:
+        page = self._pdf[page_number]
+        try:
+            textpage = page.get_textpage()
+            try:
+                return textpage.get_text_range()
+            finally:
+                textpage.close()
+        finally:
+            page.close()
+
+    def render(self, page_number: int, width: int):
+        """Sayfayı ara boyut ve küçültme olmadan doğrudan verilen genişlikte (piksel) çizer; PIL görüntüsü döner."""
+        page = self._pdf[page_number]
+        try:
+            scale = width / page.get_width()
+            return page.render(scale=scale).to_pil()
+        finally:
+            page.close()
+
+    def close(self) -> None:
+        try:
+            self._pdf.close()
+        finally:
+            _PDFIUM_LOCK.release()
+
+
+BACKENDS: Dict[str, Callable[[PdfSource], object]] = {
+    "pdfplumber": PdfplumberSource,
+    "pdfminer": PdfminerSource,
+    "pdfium": PdfiumSource,
+}
+
+
+@contextmanager
+def open_pdf(source: PdfSource, backend: str = "pdfplumber") -> Iterator:
+    """Seçilen arka uçla PDF'i açar; len(doc) ve doc.page_text(i) sağlayan bir nesne verir."""
+    if backend not in BACKENDS:
+        raise ValueError(f"Bilinmeyen PDF arka ucu: {backend}")
+    doc = BACKENDS[backend](source)
+    try:
+        yield doc
+    finally:
+        doc.close()
@@ -0,0 +1,105 @@
+import os
+import re
+from typing import List, Dict, Any, Tuple
+
+import numpy as np
+
+# Sıkıştırma ayarları ortam değişkenleri ile değiştirilebilir
+EXTRACTIVE_COMPRESSION = os.getenv("EXTRACTIVE_COMPRESSION", "0") == "1"
+EXTRACTIVE_BUDGET_CHARS = int(os.getenv("EXTRACTIVE_BUDGET_CHARS", "8000"))
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+(?=[A-ZÇĞİÖŞÜ0-9(\[])")
+_TOKEN = re.compile(r"[^\W\d_]{3,}", re.UNICODE)
+
+# Özet alanlarını (amaç, yöntem, veri seti, sonuç) besleyen cümleleri öne çıkaran ipuçları
+_BOOST_TERMS = {
+    "abstract", "propose", "proposed", "present", "introduce", "method", "methodology",
+    "approach", "model", "algorithm", "architecture", "framework", "dataset", "datasets",
+    "corpus", "benchmark", "samples", "images", "evaluate", "evaluation", "experiment",
+    "experiments", "result", "results", "accuracy", "precision", "recall", "score",
+    "outperforms", "improvement", "improves", "achieves", "state-of-the-art", "conclusion",
+    "özet", "yöntem", "veri", "sonuç", "sonuçlar", "doğruluk", "önerilen", "deney",
+}
+# Özete katkısı olmayan kurum, iletişim ve telif cümlelerini geri plana iten ipuçları
+_PENALTY_TERMS = {
+    "university", "department", "institute", "email", "copyright", "license", "licensed",
+    "permission", "preprint", "arxiv", "acknowledgments", "acknowledgements", "funded",
+    "grant", "correspondence", "conference", "proceedings", "üniversitesi", "bölümü",
+}
+_EMAIL_OR_URL = re.compile(r"\S+@\S+|https?://\S+")
+
+
+def split_sentences(text: str) -> List[str]:
+    return [s.strip() for s in _SENTENCE_SPLIT.split(text) if s.strip()]
+
+
+def _tokenize(sentence: str) -> List[str]:
+    return [t.lower() for t in _TOKEN.findall(sentence)]
+
+
+def score_sentences(sentences: List[str]) -> np.ndarray:
+    """
+    Cümleleri TF-IDF vektörlerinin belge merkezine (centroid) kosinüs benzerliği ile puanlar.
+    Amaç/yöntem/veri/sonuç ipuçları puanı artırır, kurum/telif/iletişim ipuçları düşürür.
+    """
+    tokenized = [_tokenize(s) for s in sentences]
+    vocabulary: Dict[str, int] = {}
+    for tokens in tokenized:
+        for token in tokens:
+            vocabulary.setdefault(token, len(vocabulary))
+    if not vocabulary:
+        return np.zeros(len(sentences))
+
+    counts = np.zeros((len(sentences), len(vocabulary)), dtype=np.float32)
+    for row, tokens in enumerate(tokenized):
+        for token in tokens:
+            counts[row, vocabulary[token]] += 1
+
+    document_frequency = np.count_nonzero(counts, axis=0)
+    idf = np.log((1 + len(sentences)) / (1 + document_frequency)) + 1
+    tfidf = counts * idf
+    norms = np.linalg.norm(tfidf, axis=1, keepdims=True)
+    tfidf = np.divide(tfidf, norms, out=np.zeros_like(tfidf), where=norms > 0)
+
+    centroid = tfidf.mean(axis=0)
+    centroid_norm = np.linalg.norm(centroid)
+    scores = tfidf @ (centroid / centroid_norm if centroid_norm > 0 else centroid)
+
+    for row, (sentence, tokens) in enumerate(zip(sentences, tokenized)):
+        token_set = set(tokens)
+        boost = len(token_set & _BOOST_TERMS)
+        penalty = len(token_set & _PENALTY_TERMS) + len(_EMAIL_OR_URL.findall(sentence))
+        scores[row] *= (1 + 0.25 * min(boost, 4)) / (1 + penalty)
+        # Çok kısa parçalar (başlık, sayfa numarası vb.) bilgi taşımaz
+        if len(tokens) < 5:
+            scores[row] *= 0.2
+    return scores
+
+
+def compress_text(text: str, budget_chars: int = EXTRACTIVE_BUDGET_CHARS) -> Tuple[str, Dict[str, Any]]:
+    """
+    En bilgilendirici cümleleri karakter bütçesine sığacak şekilde seçer ve metindeki
+    sırasıyla birleştirir. Sıkıştırılmış metin ve sıkıştırma istatistiklerini döner.
+    """
+    original_chars = len(text)
+    if original_chars <= budget_chars:
+        compressed = text
+    else:
+        sentences = split_sentences(text)
+        scores = score_sentences(sentences)
+        selected = []
+        used = 0
+        for index in np.argsort(-scores, kind="stable"):
+            length = len(sentences[index]) + 1
+            if used + length > budget_chars:
+                continue
+            selected.append(index)
+            used += length
+        compressed = " ".join(sentences[i] for i in sorted(selected))
+
+    stats = {
+        "original_chars": original_chars,
+        "compressed_chars": len(compressed),
+        "ratio": round(len(compressed) / original_chars, 3) if original_chars else 1.0,
+    }
+    return compressed, stats
@@ -0,0 +1,62 @@
+import os
+import time
+import threading
+from typing import Any, Optional
+
+# Kurulumu başarısız olan istemci bu süre sonra yeniden denenir (saniye)
+GEMINI_CLIENT_RETRY_SECONDS = float(os.getenv("GEMINI_CLIENT_RETRY_SECONDS", "30"))
+# Gemini API adresi; boşsa varsayılan. Yük testinde yerel sahte sunucuya yönlendirmek için kullanılır
+GEMINI_BASE_URL = os.getenv("GEMINI_BASE_URL", "")
+
+
+class GeminiUnavailableError(RuntimeError):
+    """Gemini istemcisi kurulamadığında (örn. API anahtarı eksik) fırlatılır."""
+
+
+def genai_types():
+    """google.genai.types modülünü ilk kullanımda içe aktarır (modül yüklemesi ~0.5 sn sürer)."""
+    from google.genai import types
+
+    return types
+
+
+class GeminiClientProvider:
+    """
+    google-genai'yi ve Gemini istemcisini ilk kullanımda (veya ısınma sırasında) kurar;
+    uygulama importu ucuz kalır. Kurulum başarısız olursa hata saklanır ve
+    GEMINI_CLIENT_RETRY_SECONDS sonra yeniden denenir: süreç ömrü boyunca istemcisiz kalmaz.
+    """
+
+    def __init__(self, retry_seconds: float = GEMINI_CLIENT_RETRY_SECONDS):
+        self.retry_seconds = retry_seconds
+        self._client: Optional[Any] = None
+        self._error: Optional[str] = None
+        self._failed_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def error(self) -> Optional[str]:
+        """Son kurulum hatası; istemci hazırsa None."""
+        return None if self._client is not None else self._error
+
+    def get(self) -> Any:
+        if self._client is not None:
+            return self._client
+        with self._lock:
+            if self._client is not None:
+                return self._client
+            if self._error is not None and time.monotonic() - self._failed_at < self.retry_seconds:
+                raise GeminiUnavailableError(self._error)
+            try:
+                from google import genai
+
+                options = {}
+                if GEMINI_BASE_URL:
+                    options["http_options"] = genai.types.HttpOptions(base_url=GEMINI_BASE_URL)
+                self._client = genai.Client(**options)
+            except Exception as e:
+                self._error = f"{type(e).__name__}: {e}"
+                self._failed_at = time.monotonic()
+                raise GeminiUnavailableError(self._error) from e
+            self._error = None
+            return self._client
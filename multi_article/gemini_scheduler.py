@@ -0,0 +1,224 @@
+import os
+import re
+import time
+import random
+import asyncio
+import threading
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from metrics import LLM_CONCURRENCY_LIMIT, LLM_RETRIES, stage
+
+# Kota ve yeniden deneme ayarları ortam değişkenleri ile değiştirilebilir
+GEMINI_RPM = float(os.getenv("GEMINI_RPM", "60"))  # Dakikadaki istek kotası (0 = sınırsız)
+GEMINI_BURST = int(os.getenv("GEMINI_BURST", "5"))  # Boşta birikebilecek en fazla istek hakkı
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "8"))
+GEMINI_MIN_CONCURRENCY = int(os.getenv("GEMINI_MIN_CONCURRENCY", "1"))
+GEMINI_MAX_RETRIES = int(os.getenv("GEMINI_MAX_RETRIES", "5"))
+GEMINI_BACKOFF_BASE = float(os.getenv("GEMINI_BACKOFF_BASE", "1.0"))  # saniye
+GEMINI_BACKOFF_MAX = float(os.getenv("GEMINI_BACKOFF_MAX", "30"))  # saniye
+# Çoklu worker modunda GEMINI_RPM tüm worker'ların toplam kotasıdır; her süreç kendi payını kullanır
+# (uvicorn ve gunicorn varsayılan worker sayısını WEB_CONCURRENCY'den okur)
+SERVER_WORKERS = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+
+# 429: kota aşıldı; 408/5xx: geçici sunucu hataları
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+_RETRY_DELAY = re.compile(r"^(\d+(?:\.\d+)?)s$")
+
+T = TypeVar("T")
+
+
+def error_status(error: BaseException) -> Optional[int]:
+    """google-genai (APIError.code) veya HTTP istemcisi hatalarından durum kodunu çıkarır."""
+    code = getattr(error, "code", None)
+    if isinstance(code, int):
+        return code
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_throttled(error: BaseException) -> bool:
+    return error_status(error) == 429 or getattr(error, "status", None) == "RESOURCE_EXHAUSTED"
+
+
+def _is_network_error(error: BaseException) -> bool:
+    if isinstance(error, (ConnectionError, TimeoutError, asyncio.TimeoutError)):
+        return True
+    try:
+        import httpx
+    except ImportError:
+        return False
+    return isinstance(error, httpx.TransportError)
+
+
+def retry_reason(error: BaseException) -> Optional[str]:
+    """Hata yeniden denenebilirse nedenini (throttled / server_error / network), değilse None döner."""
+    if is_throttled(error):
+        return "throttled"
+    if error_status(error) in RETRYABLE_STATUS_CODES:
+        return "server_error"
+    if _is_network_error(error):
+        return "network"
+    return None
+
+
+def server_retry_delay(error: BaseException) -> Optional[float]:
+    """Sunucunun önerdiği bekleme süresi: Retry-After başlığı veya RetryInfo.retryDelay ('12s')."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    retry_after = headers.get("retry-after") if hasattr(headers, "get") else None
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass
+    details = getattr(error, "details", None)
+    if isinstance(details, dict):
+        for detail in (details.get("error") or {}).get("details") or []:
+            match = _RETRY_DELAY.match(str(detail.get("retryDelay", "")))
+            if match:
+                return float(match.group(1))
+    return None
+
+
+class TokenBucket:
+    """
+    Dakikadaki istek kotasına göre dolan jeton kovası. Jeton yoksa bekleme süresi
+    önceden ayrılır (jetonlar eksiye düşebilir); böylece bekleyenler sırayla geçer.
+    """
+
+    def __init__(self, rate_per_minute: float = GEMINI_RPM / SERVER_WORKERS, burst: int = GEMINI_BURST):
+        self.rate = rate_per_minute / 60
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def drain(self) -> None:
+        """Kota aşıldığında (429) biriken hakları sıfırlar; sonraki istekler kota hızında dolar."""
+        with self._lock:
+            self._tokens = min(self._tokens, 0.0)
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD eşzamanlılık sınırı: her başarılı çağrıda sınır yavaşça artar (+1/sınır),
+    kısıtlamada (429) yarıya iner. Aynı kısıtlama dalgasındaki çoklu 429'lar
+    cooldown süresi içinde tek bir azaltma sayılır.
+    """
+
+    def __init__(
+        self,
+        maximum: int = GEMINI_MAX_CONCURRENCY,
+        minimum: int = GEMINI_MIN_CONCURRENCY,
+        cooldown: float = 1.0,
+    ):
+        self.maximum = max(1, maximum)
+        self.minimum = max(1, min(minimum, self.maximum))
+        self.cooldown = cooldown
+        self.limit = float(self.maximum)
+        self._in_flight = 0
+        self._last_decrease = 0.0
+        self._condition: Optional[asyncio.Condition] = None
+        LLM_CONCURRENCY_LIMIT.set(self.limit)
+
+    def _get_condition(self) -> asyncio.Condition:
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    async def acquire(self) -> None:
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self._in_flight < int(self.limit))
+            self._in_flight += 1
+
+    async def release(self) -> None:
+        condition = self._get_condition()
+        async with condition:
+            self._in_flight -= 1
+            condition.notify_all()
+
+    def on_success(self) -> None:
+        self.limit = min(self.maximum, self.limit + 1 / self.limit)
+        LLM_CONCURRENCY_LIMIT.set(round(self.limit, 2))
+
+    def on_throttle(self) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        self.limit = max(self.minimum, self.limit / 2)
+        LLM_CONCURRENCY_LIMIT.set(round(self.limit, 2))
+
+
+class GeminiScheduler:
+    """
+    Gemini çağrılarını istemci tarafında zamanlar: jeton kovası kotayı, AIMD sınırı
+    eşzamanlılığı korur; 429 ve geçici 5xx/ağ hataları jitter'lı üstel geri çekilme ile
+    yeniden denenir. PDF yeniden ayrıştırılmaz, yalnızca LLM çağrısı tekrarlanır.
+    """
+
+    def __init__(
+        self,
+        bucket: Optional[TokenBucket] = None,
+        concurrency: Optional[AdaptiveConcurrency] = None,
+        max_retries: int = GEMINI_MAX_RETRIES,
+        backoff_base: float = GEMINI_BACKOFF_BASE,
+        backoff_max: float = GEMINI_BACKOFF_MAX,
+    ):
+        self.bucket = bucket or TokenBucket()
+        self.concurrency = concurrency or AdaptiveConcurrency()
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    def backoff(self, attempt: int, error: BaseException) -> float:
+        """'Full jitter' üstel geri çekilme; sunucu bir bekleme süresi önerdiyse o alt sınırdır."""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        suggested = server_retry_delay(error)
+        return max(delay, min(suggested, self.backoff_max)) if suggested else delay
+
+    async def call(self, make_request: Callable[[], Awaitable[T]]) -> T:
+        """make_request() ile oluşturulan çağrıyı kota/eşzamanlılık sınırları içinde çalıştırır."""
+        attempt = 0
+        while True:
+            with stage("rate_limit"):
+                await self.bucket.acquire()
+                await self.concurrency.acquire()
+            try:
+                result = await make_request()
+            except Exception as e:
+                error = e
+            else:
+                self.concurrency.on_success()
+                return result
+            finally:
+                await self.concurrency.release()
+
+            reason = retry_reason(error)
+            if reason == "throttled":
+                self.concurrency.on_throttle()
+                self.bucket.drain()
+            if reason is None or attempt >= self.max_retries:
+                raise error
+            delay = self.backoff(attempt, error)
+            attempt += 1
+            LLM_RETRIES.inc(reason=reason)
+            print(f"Gemini çağrısı yeniden denenecek ({reason}, deneme {attempt}/{self.max_retries}, {delay:.1f} sn sonra): {error}")
+            await asyncio.sleep(delay)
@@ -0,0 +1,315 @@
+import os
+import json
+import hashlib
+import time
+import uuid
+import shutil
+import sqlite3
+import asyncio
+import traceback
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, List, Tuple, Callable, Awaitable
+
+from uploads import SpooledPdf
+
+# Kuyruk ayarları ortam değişkenleri ile değiştirilebilir
+JOBS_DB_PATH = os.getenv("JOBS_DB_PATH", "jobs.sqlite3")
+JOBS_DIR = os.getenv("JOBS_DIR", "jobs")
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+# Kuyrukta bekleyen dosya sayısı bu değeri aşarsa yeni işler reddedilir (backpressure)
+JOB_QUEUE_MAX_PENDING = int(os.getenv("JOB_QUEUE_MAX_PENDING", "500"))
+JOB_RETENTION_SECONDS = int(os.getenv("JOB_RETENTION_SECONDS", str(7 * 24 * 3600)))
+
+# Dosya işleyici: (dosya adı, içerik tipi, diskteki PDF) -> sonuç sözlüğü
+FileHandler = Callable[[str, str, SpooledPdf], Awaitable[Dict[str, Any]]]
+
+
+class QueueFullError(Exception):
+    """Kuyruk dolu olduğunda yeni iş kabul edilmez."""
+
+
+def _process_alive(pid: int) -> bool:
+    """Aynı makinedeki bir sürecin çalışıp çalışmadığı (kendi pid'imiz önceki bir çalıştırmadan kalmıştır)."""
+    # Windows'ta os.kill(pid, 0) süreci sonlandırır; orada tüm yarım dosyalar geri alınır
+    if pid == os.getpid() or os.name == "nt":
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _content_key(files: List[Tuple[str, str, SpooledPdf]]) -> str:
+    """İşin içerik anahtarı: dosya adları, içerik tipleri ve içerik hash'leri (sırasıyla)."""
+    digest = hashlib.sha256()
+    for filename, content_type, pdf in files:
+        digest.update(json.dumps([filename, content_type, pdf.sha256]).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class JobQueue:
+    """
+    SQLite ve disk üzerinde kalıcı tutulan iş kuyruğu.
+    Her iş birden fazla PDF içerir; dosyalar worker'lara tek tek dağıtılır.
+    Sunucu yeniden başlarsa yarıda kalan dosyalar tekrar kuyruğa alınır. Birden fazla
+    uvicorn worker'ı aynı kuyruğu paylaşabilir: her dosyayı alan sürecin pid'i tutulur ve
+    yalnızca sahibi artık çalışmayan dosyalar geri alınır.
+    """
+
+    def __init__(
+        self,
+        db_path: str = JOBS_DB_PATH,
+        jobs_dir: str = JOBS_DIR,
+        workers: int = JOB_WORKERS,
+        max_pending: int = JOB_QUEUE_MAX_PENDING,
+        retention_seconds: int = JOB_RETENTION_SECONDS,
+    ):
+        self.db_path = db_path
+        self.jobs_dir = jobs_dir
+        self.workers = workers
+        self.max_pending = max_pending
+        self.retention_seconds = retention_seconds
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        os.makedirs(self.jobs_dir, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " id TEXT PRIMARY KEY,"
+                " created_at REAL NOT NULL,"
+                " total INTEGER NOT NULL,"
+                " content_key TEXT)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS job_files ("
+                " job_id TEXT NOT NULL,"
+                " idx INTEGER NOT NULL,"
+                " filename TEXT NOT NULL,"
+                " content_type TEXT,"
+                " path TEXT NOT NULL,"
+                " status TEXT NOT NULL,"
+                " result TEXT,"
+                " updated_at REAL NOT NULL,"
+                " owner INTEGER,"
+                " PRIMARY KEY (job_id, idx))"
+            )
+            # Eski şemada (owner sütunu olmadan) oluşturulmuş veritabanları için
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(job_files)")}
+            if "owner" not in columns:
+                conn.execute("ALTER TABLE job_files ADD COLUMN owner INTEGER")
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if "content_key" not in columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN content_key TEXT")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_content_key ON jobs (content_key)")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_job_files_status ON job_files (status, updated_at)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    # --- Kuyruk işlemleri (bloklayan; asyncio.to_thread ile çağrılır) ---
+
+    def pending_count(self) -> int:
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM job_files WHERE status IN ('queued', 'running')"
+            ).fetchone()[0]
+
+    def submit(self, files: List[Tuple[str, str, SpooledPdf]]) -> str:
+        """
+        Diske alınmış yüklemeleri iş klasörüne taşır ve yeni bir iş oluşturur; iş kimliğini döner.
+        Aynı içerikle henüz bitmemiş bir iş varsa yenisi açılmaz, onun kimliği döner.
+        Kuyruk doluysa QueueFullError fırlatılır. Yeni iş açılmadıysa dosyalar çağıranda kalır.
+        """
+        content_key = _content_key(files)
+        with self._connect() as conn:
+            # Arama, doluluk kontrolü ve ekleme tek yazma kilidi altında yapılır; eşzamanlı iki
+            # gönderim aynı içerik için iki iş açamaz ve kuyruk sınırını birlikte aşamaz
+            conn.execute("BEGIN IMMEDIATE")
+            existing = conn.execute(
+                "SELECT jobs.id FROM jobs JOIN job_files ON job_files.job_id = jobs.id "
+                "WHERE jobs.content_key = ? AND job_files.status IN ('queued', 'running') LIMIT 1",
+                (content_key,),
+            ).fetchone()
+            if existing:
+                return existing[0]
+
+            pending = conn.execute(
+                "SELECT COUNT(*) FROM job_files WHERE status IN ('queued', 'running')"
+            ).fetchone()[0]
+            if pending + len(files) > self.max_pending:
+                raise QueueFullError("İş kuyruğu dolu. Lütfen daha sonra tekrar deneyin.")
+
+            job_id = uuid.uuid4().hex
+            job_dir = os.path.join(self.jobs_dir, job_id)
+            now = time.time()
+            try:
+                os.makedirs(job_dir, exist_ok=True)
+                rows = []
+                for idx, (filename, content_type, pdf) in enumerate(files):
+                    path = os.path.join(job_dir, f"{idx}.pdf")
+                    # Farklı dosya sistemleri arasında da çalışması için shutil.move
+                    shutil.move(pdf.path, path)
+                    rows.append((job_id, idx, filename, content_type, path, "queued", now))
+
+                conn.execute(
+                    "INSERT INTO jobs (id, created_at, total, content_key) VALUES (?, ?, ?, ?)",
+                    (job_id, now, len(files), content_key),
+                )
+                conn.executemany(
+                    "INSERT INTO job_files (job_id, idx, filename, content_type, path, status, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+            except BaseException:
+                # İşlem geri alınır; taşınmış dosyalar da kayıtsız kalmamaları için silinir
+                shutil.rmtree(job_dir, ignore_errors=True)
+                raise
+        return job_id
+
+    def _claim_next(self) -> Optional[Tuple[str, int, str, str, str]]:
+        """Sıradaki dosyayı 'running' olarak işaretler ve döner."""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT job_id, idx, filename, content_type, path FROM job_files "
+                "WHERE status = 'queued' ORDER BY updated_at, job_id, idx LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE job_files SET status = 'running', updated_at = ?, owner = ? WHERE job_id = ? AND idx = ?",
+                (time.time(), os.getpid(), row[0], row[1]),
+            )
+            return row
+
+    def _complete(self, job_id: str, idx: int, path: str, result: Dict[str, Any]) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE job_files SET status = 'done', result = ?, updated_at = ? "
+                "WHERE job_id = ? AND idx = ?",
+                (json.dumps(result, ensure_ascii=False), time.time(), job_id, idx),
+            )
+        # Sonuç kaydedildikten sonra PDF'e ihtiyaç kalmaz
+        if os.path.exists(path):
+            os.remove(path)
+
+    def recover(self) -> None:
+        """
+        Yeniden başlatmada yarıda kalan dosyaları kuyruğa geri alır ve eski işleri siler.
+        Başka bir canlı worker sürecinin işlediği dosyalara dokunulmaz.
+        """
+        cutoff = time.time() - self.retention_seconds
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            owners = [
+                row[0] for row in conn.execute("SELECT DISTINCT owner FROM job_files WHERE status = 'running'")
+            ]
+            orphaned = [(owner,) for owner in owners if owner is None or not _process_alive(owner)]
+            conn.executemany(
+                "UPDATE job_files SET status = 'queued', owner = NULL WHERE status = 'running' AND owner IS ?",
+                orphaned,
+            )
+            expired = [
+                row[0] for row in conn.execute("SELECT id FROM jobs WHERE created_at < ?", (cutoff,))
+            ]
+            conn.executemany("DELETE FROM job_files WHERE job_id = ?", [(j,) for j in expired])
+            conn.executemany("DELETE FROM jobs WHERE id = ?", [(j,) for j in expired])
+        for job_id in expired:
+            shutil.rmtree(os.path.join(self.jobs_dir, job_id), ignore_errors=True)
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """İşin durumunu ve dosya sayaçlarını döner; iş yoksa None."""
+        with self._connect() as conn:
+            job = conn.execute(
+                "SELECT created_at, total FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+            if job is None:
+                return None
+            counts = dict(conn.execute(
+                "SELECT status, COUNT(*) FROM job_files WHERE job_id = ? GROUP BY status", (job_id,)
+            ).fetchall())
+
+        created_at, total = job
+        done = counts.get("done", 0)
+        if done == total:
+            status = "completed"
+        elif counts.get("running", 0) > 0 or done > 0:
+            status = "running"
+        else:
+            status = "queued"
+        return {
+            "job_id": job_id,
+            "status": status,
+            "total": total,
+            "completed": done,
+            "created_at": created_at,
+        }
+
+    def results(self, job_id: str) -> List[Dict[str, Any]]:
+        """İşteki dosyaların sonuçlarını yükleme sırasıyla döner (bekleyenler 'Pending')."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT filename, status, result FROM job_files WHERE job_id = ? ORDER BY idx",
+                (job_id,),
+            ).fetchall()
+        return [
+            json.loads(result) if status == "done"
+            else {"filename": filename, "status": "Pending"}
+            for filename, status, result in rows
+        ]
+
+    # --- Worker havuzu ---
+
+    def notify(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _worker(self, handler: FileHandler) -> None:
+        while True:
+            claimed = await asyncio.to_thread(self._claim_next)
+            if claimed is None:
+                # Yeni iş gelene kadar (veya en geç 1 sn) bekle
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=1.0)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            job_id, idx, filename, content_type, path = claimed
+            try:
+                pdf = await asyncio.to_thread(SpooledPdf.from_path, path)
+                result = await handler(filename, content_type, pdf)
+            except Exception as e:
+                print(f"[{filename}] - İş kuyruğu hatası: {type(e).__name__} - {e}")
+                traceback.print_exc()
+                result = {
+                    "filename": filename,
+                    "status": "Failed",
+                    "detail": "Sunucu veya API hatası oluştu. Logları kontrol edin."
+                }
+            await asyncio.to_thread(self._complete, job_id, idx, path, result)
+
+    async def start(self, handler: FileHandler) -> None:
+        """Worker'ları başlatır; önceki çalıştırmadan kalan işler kaldığı yerden devam eder."""
+        await asyncio.to_thread(self.recover)
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._worker(handler)) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
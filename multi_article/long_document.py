@@ -0,0 +1,108 @@
+import os
+import re
+import json
+import asyncio
+from typing import List, Callable, Awaitable, Tuple
+
+from pydantic import BaseModel
+
+# Uzun belge modu ayarları ortam değişkenleri ile değiştirilebilir
+LONG_DOCUMENT_MAX_PAGES = int(os.getenv("LONG_DOCUMENT_MAX_PAGES", "60"))
+LONG_DOCUMENT_CHUNK_CHARS = int(os.getenv("LONG_DOCUMENT_CHUNK_CHARS", "15000"))
+# Bir belge için modele gönderilecek toplam girdi bütçesi (yaklaşık token)
+LONG_DOCUMENT_TOKEN_BUDGET = int(os.getenv("LONG_DOCUMENT_TOKEN_BUDGET", "60000"))
+# Aynı anda yapılacak en fazla parça (map) çağrısı
+LONG_DOCUMENT_MAX_PARALLEL = int(os.getenv("LONG_DOCUMENT_MAX_PARALLEL", "4"))
+
+CHARS_PER_TOKEN = 4  # Kaba tahmin; bütçeyi karaktere çevirmek için
+
+CHUNK_SYSTEM_PROMPT = (
+    "Sen bir yapay zeka araştırma asistanısın. "
+    "Sana bilimsel bir makalenin yalnızca bir BÖLÜMÜ veriliyor. "
+    "Bu bölümde geçen bilgileri kesinlikle ve sadece verilen JSON formatında Türkçe olarak özetle. "
+    "Bölümde bir alanla ilgili bilgi yoksa o alanı boş bırak. "
+    "Başka hiçbir açıklama, giriş veya çıkış cümlesi ekleme."
+)
+
+MERGE_SYSTEM_PROMPT = (
+    "Sen bir yapay zeka araştırma asistanısın. "
+    "Sana aynı bilimsel makalenin farklı bölümlerinden çıkarılmış kısmi özetler JSON listesi olarak veriliyor. "
+    "Bunları birleştirerek makalenin tamamı için kesinlikle ve sadece verilen JSON formatında Türkçe tek bir özet oluştur. "
+    "Tekrarları çıkar, çelişkileri makalenin sonuç bölümlerine göre çöz. "
+    "Makalenin amacını, yöntemini, veri setini ve sonuçlarını kapsayıcı ol. "
+    "Başka hiçbir açıklama, giriş veya çıkış cümlesi ekleme."
+)
+
+# (sistem prompt'u, kullanıcı metni) -> doğrulanmış özet
+SummarizeFn = Callable[[str, str], Awaitable[BaseModel]]
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def split_into_chunks(text: str, chunk_chars: int = LONG_DOCUMENT_CHUNK_CHARS) -> List[str]:
+    """Metni cümle sınırlarından bölerek en fazla chunk_chars uzunluğunda parçalara ayırır."""
+    chunks = []
+    current = []
+    current_len = 0
+    for sentence in _SENTENCE_END.split(text):
+        # Tek başına çok uzun "cümleler" (tablolar vb.) sert sınırdan bölünür
+        while len(sentence) > chunk_chars:
+            chunks.append(sentence[:chunk_chars])
+            sentence = sentence[chunk_chars:]
+        if current_len + len(sentence) + 1 > chunk_chars and current:
+            chunks.append(" ".join(current))
+            current, current_len = [], 0
+        current.append(sentence)
+        current_len += len(sentence) + 1
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def plan_chunks(
+    text: str,
+    chunk_chars: int = LONG_DOCUMENT_CHUNK_CHARS,
+    token_budget: int = LONG_DOCUMENT_TOKEN_BUDGET,
+) -> List[str]:
+    """
+    Token bütçesine sığacak parçaları seçer. Bütçe aşılırsa parçalar belge boyunca
+    eşit aralıklarla seçilir; böylece sonuç ve deney bölümleri de modele ulaşır.
+    """
+    chunks = split_into_chunks(text, chunk_chars)
+    max_chunks = max(1, (token_budget * CHARS_PER_TOKEN) // chunk_chars)
+    if len(chunks) <= max_chunks:
+        return chunks
+    step = (len(chunks) - 1) / (max_chunks - 1) if max_chunks > 1 else 0
+    return [chunks[round(i * step)] for i in range(max_chunks)]
+
+
+async def summarize_long_document(
+    text: str,
+    summarize: SummarizeFn,
+    system_prompt: str,
+    chunk_chars: int = LONG_DOCUMENT_CHUNK_CHARS,
+    token_budget: int = LONG_DOCUMENT_TOKEN_BUDGET,
+    max_parallel: int = LONG_DOCUMENT_MAX_PARALLEL,
+) -> Tuple[BaseModel, int]:
+    """
+    Map-reduce özetleme: parçalar eşzamanlı özetlenir (map), ardından kısmi özetler
+    tek bir çağrıda aynı şemaya birleştirilir (reduce). Özet ve parça sayısı döner.
+    Metin tek parçaya sığıyorsa system_prompt ile normal tek çağrı yapılır.
+    """
+    chunks = plan_chunks(text, chunk_chars, token_budget)
+    if len(chunks) == 1:
+        return await summarize(system_prompt, f"MAKALE METNİ:\n{chunks[0]}"), 1
+
+    semaphore = asyncio.Semaphore(max_parallel)
+
+    async def summarize_chunk(index: int, chunk: str) -> BaseModel:
+        async with semaphore:
+            return await summarize(
+                CHUNK_SYSTEM_PROMPT,
+                f"MAKALE BÖLÜMÜ ({index + 1}/{len(chunks)}):\n{chunk}",
+            )
+
+    partials = await asyncio.gather(*(summarize_chunk(i, c) for i, c in enumerate(chunks)))
+    merged_input = json.dumps([p.model_dump() for p in partials], ensure_ascii=False)
+    summary = await summarize(MERGE_SYSTEM_PROMPT, f"KISMİ ÖZETLER:\n{merged_input}")
+    return summary, len(chunks)
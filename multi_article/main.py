@@ -1,27 +1,68 @@
-import io
 import os
+import base64
+import asyncio
 import json
+import sqlite3
+import time
 import traceback
-from typing import List, Dict, Any
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import List, Dict, Any, Awaitable, Callable, Optional, Union, Tuple, Type
 
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field
-from fastapi import FastAPI, UploadFile, File, HTTPException
-from fastapi.responses import JSONResponse
-from google import genai
-from google.genai import types
-import pdfplumber
+from fastapi import FastAPI, UploadFile, File, HTTPException, Query
+from fastapi.responses import JSONResponse, StreamingResponse, PlainTextResponse, Response
+
+from corpus_index import CORPUS_PAGE_SIZE_MAX, CorpusIndex
+from gemini_client import GeminiClientProvider, GeminiUnavailableError, genai_types
+from extractive import EXTRACTIVE_COMPRESSION, EXTRACTIVE_BUDGET_CHARS, compress_text
+from gemini_scheduler import GeminiScheduler, is_throttled
+from job_queue import JobQueue, QueueFullError
+from metrics import (
+    CACHE_REQUESTS,
+    CONTENT_TYPE as METRICS_CONTENT_TYPE,
+    FAILURES,
+    PROCESS_PEAK_RSS_MB,
+    LLM_REQUESTS,
+    record_llm_usage,
+    render_metrics,
+    stage,
+    track_timings,
+)
+from long_document import (
+    CHUNK_SYSTEM_PROMPT,
+    MERGE_SYSTEM_PROMPT,
+    LONG_DOCUMENT_MAX_PAGES,
+    summarize_long_document,
+)
+from near_duplicates import NEAR_DUPLICATE_REUSE, NearDuplicateIndex, minhash_signature
+from packing import PACK_SHORT_ARTICLES, ArticlePacker
+from single_flight import SingleFlight
+from pdf_extraction import EXTRACTION_VERSION, PdfExtractionEngine, PdfExtractionError
+from previews import PREVIEW_FORMAT, PREVIEW_FORMATS, PREVIEW_QUALITY, PREVIEW_WIDTH, PreviewCache, preview_cache_key, render_thumbnail
+from streaming_json import JsonFieldStream
+from summary_cache import SummaryCache, make_cache_key, prompt_version
+from summary_shape import SUMMARY_MAX_OUTPUT_TOKENS, SUMMARY_MIN_OUTPUT_TOKENS, SummaryShape, parse_summary_fields
+from uploads import SpooledPdf, UploadTooLargeError, peak_rss_mb, spool_upload, with_own_reference
 
 load_dotenv()
 
 GEMINI_MODEL = "gemini-2.0-flash"
+MAX_CHARACTERS = 15000
+# Bir toplu istekte aynı anda işlenecek en fazla dosya sayısı
+SUMMARIZE_CONCURRENCY = int(os.getenv("SUMMARIZE_CONCURRENCY", "4"))
 
-try:
-    client = genai.Client()
-    print(f"Gemini modeli hazır: {GEMINI_MODEL}")
-except Exception as e:
-    print(f"Gemini istemcisi başlatılamadı. Ortam değişkenlerini kontrol edin: {e}")
-    client = None
+# Gemini istemcisi (ve google-genai importu) açılıştaki arka plan ısınmasında veya ilk kullanımda kurulur
+gemini_provider = GeminiClientProvider()
+client = None
+
+def _gemini_client():
+    """Gemini istemcisini döner; kurulamazsa GeminiUnavailableError fırlatır (bir süre sonra yeniden denenir)."""
+    global client
+    if client is None:
+        client = gemini_provider.get()
+    return client
 
 class ArticleSummary(BaseModel):
     veri_seti: str = Field(description="Çalışmada kullanılan veri setinin adı, boyutu ve kaynağı hakkında kısa bilgi.")
@@ -30,152 +71,849 @@ class ArticleSummary(BaseModel):
     kategori: str = Field(description="Makalenin ana konusunu (Örn: NLP, CV, RL, Hardware, Teorik) içeren tek kelime.")
     ozet_genel: str = Field(description="Makalenin genel amacını, yöntemini ve sonuçlarını kapsayan 3-4 cümlelik standart özet.")
 
+SYSTEM_PROMPT = (
+    "Sen bir yapay zeka araştırma asistanısın. "
+    "Görevin, sana verilen bilimsel makale metnini analiz ederek "
+    "kesinlikle ve sadece aşağıdaki JSON formatında Türkçe özet oluşturmaktır. "
+    "Başka hiçbir açıklama, giriş veya çıkış cümlesi ekleme. "
+    "Makalenin amacını, yöntemini, veri setini ve sonuçlarını kapsayıcı ol."
+    "Makalenin literatürdeki çalışmalardan farkını açıkla."
+)
+
+# Prompt, şema veya metin çıkarma ayarları (arka uç, normalleştirme) değiştiğinde önbellekteki eski özetler otomatik olarak geçersiz olur
+PROMPT_VERSION = prompt_version(
+    SYSTEM_PROMPT, json.dumps(ArticleSummary.model_json_schema(), sort_keys=True), EXTRACTION_VERSION
+)
+LONG_PROMPT_VERSION = prompt_version(PROMPT_VERSION, CHUNK_SYSTEM_PROMPT, MERGE_SYSTEM_PROMPT)
+
+# Akış modunda ve alan seçiminde alanlar bu sırayla üretilir: arayüz önce kategoriyi ve genel özeti gösterebilir.
+# Şema içeriği aynıdır, yalnızca alan sırası değişir (google-genai sırayı property_ordering'e yazar)
+STREAM_FIELD_ORDER = ["kategori", "ozet_genel", "metodoloji", "veri_seti", "sonuclar"]
+# Tüm alanlar, çıktı bütçesi yok: istekte alan seçimi veya bütçe verilmezse kullanılır
+DEFAULT_SHAPE = SummaryShape(ArticleSummary, STREAM_FIELD_ORDER)
+
+# Akış uç noktasının yanıt türü (satır başına bir JSON nesnesi)
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# (alan adı, değer) -> None; akış uç noktasında tamamlanan özet alanlarını istemciye iletir
+FieldListener = Callable[[str, Any], Awaitable[None]]
+# Dosya görevi başına ayarlanır; ayarlıysa özet akışla üretilir
+summary_field_listener: ContextVar[Optional[FieldListener]] = ContextVar("summary_field_listener", default=None)
+
+summary_cache = SummaryCache()
+preview_cache = PreviewCache()
+# Üretilen özetlerin aranabilir derlemi (FTS5 / BM25)
+corpus_index = CorpusIndex()
+# Farklı baytlarla gelen aynı makaleleri (arXiv v1/v2, yayıncı PDF'i ...) bulan MinHash/LSH indeksi
+near_duplicate_index = NearDuplicateIndex()
+extraction_engine = PdfExtractionEngine()
+job_queue = JobQueue()
+# Gemini çağrıları için jeton kovası (GEMINI_RPM), AIMD eşzamanlılık sınırı ve yeniden deneme
+gemini_scheduler = GeminiScheduler()
+# Aynı içerikli eşzamanlı istekleri tek bir çıkarma + LLM işinde birleştirir
+summary_flight = SingleFlight()
+
+def _warm_up() -> None:
+    """PDF işleme süreç havuzunu ve Gemini istemcisini ilk istekten önce hazırlar."""
+    started = time.perf_counter()
+    extraction_engine.start()
+    try:
+        _gemini_client()
+        print(f"Gemini modeli hazır: {GEMINI_MODEL}")
+    except GeminiUnavailableError as e:
+        print(f"Gemini istemcisi başlatılamadı. Ortam değişkenlerini kontrol edin: {e}")
+    print(f"Isınma tamamlandı ({time.perf_counter() - started:.2f} sn).")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Isınma arka planda yapılır: worker hemen bağlantı kabul eder (/health/live),
+    # /health/ready ısınma bitince 200 döner
+    warm_up = asyncio.create_task(asyncio.to_thread(_warm_up))
+    # Kalıcı iş kuyruğunun worker'larını başlat (yarıda kalan işler devam eder)
+    await job_queue.start(_summarize_contents)
+    yield
+    await job_queue.stop()
+    await asyncio.gather(warm_up, return_exceptions=True)
+    extraction_engine.shutdown()
+
 app = FastAPI(
     title="Çoklu Makale Özetleyici ve Analiz API'si",
-    description="Çoklu PDF yükleyerek yapılandırılmış özet ve kategori çıkaran API. Başarısız dosyalara rağmen diğerlerini işlemeye devam eder."
+    description="Çoklu PDF yükleyerek yapılandırılmış özet ve kategori çıkaran API. Başarısız dosyalara rağmen diğerlerini işlemeye devam eder.",
+    lifespan=lifespan
 )
 
+@app.middleware("http")
+async def server_timing(request, call_next):
+    """
+    İsteğin aşama sürelerini (upload, extraction, llm ...) Server-Timing başlığında döner.
+    Akış (NDJSON) yanıtlarına eklenmez: başlık ilk satırdan önce gönderilir, o anda aşamalar
+    henüz çalışmamıştır. Akışta dosya süreleri ?timings=true ile her sonuç satırında gelir.
+    """
+    with track_timings() as timings:
+        response = await call_next(request)
+    if response.headers.get("content-type", "").startswith(NDJSON_MEDIA_TYPE):
+        return response
+    response.headers["Server-Timing"] = timings.server_timing()
+    return response
+
 @app.get("/")
 def read_root():
     return {"message": "Çoklu PDF Özetleme API'si Hazır!"}
 
-def _extract_text_from_pdf(contents: bytes) -> str:
-    """PDF içeriğinden metin çıkarır ve temizler."""
-    with pdfplumber.open(io.BytesIO(contents)) as pdf:
-        extracted_text = ""
-        MAX_PAGES = 10  # İlk 10 sayfayı alarak modeli hızlandırmak ve maliyeti düşürmek
-        
-        for i, page in enumerate(pdf.pages):
-            if i >= MAX_PAGES:
-                break
-            text = page.extract_text()
-            if text:
-                extracted_text += text + "\n"
-        
-        clean_text = " ".join(extracted_text.split()).strip()
-        return clean_text
-    
-def _get_gemini_summary(input_text: str) -> ArticleSummary:
-    """Gemini API'yi çağırır ve yapılandırılmış özet döner."""
-    
-    system_prompt = (
-        "Sen bir yapay zeka araştırma asistanısın. "
-        "Görevin, sana verilen bilimsel makale metnini analiz ederek "
-        "kesinlikle ve sadece aşağıdaki JSON formatında Türkçe özet oluşturmaktır. "
-        "Başka hiçbir açıklama, giriş veya çıkış cümlesi ekleme. "
-        "Makalenin amacını, yöntemini, veri setini ve sonuçlarını kapsayıcı ol."
-        "Makalenin literatürdeki çalışmalardan farkını açıkla."
-    )
+@app.get("/health/live")
+def liveness():
+    """Süreç ayakta ve istek kabul ediyor; bağımlılıklar kontrol edilmez."""
+    return {"status": "ok", "pid": os.getpid()}
+
+@app.get("/health/ready")
+async def readiness():
+    """
+    Worker trafiğe hazır mı: PDF işleme havuzu ısındı ve Gemini istemcisi kuruldu.
+    Hazır değilse 503 döner; yük dengeleyici / orkestratör bu worker'a istek göndermez.
+    Gemini API'sine istek atılmaz.
+    """
+    if client is None and extraction_engine.ready:
+        # Isınmada kurulamayan istemci (örn. anahtar sonradan tanımlandı) yeniden denenir
+        try:
+            await asyncio.to_thread(_gemini_client)
+        except GeminiUnavailableError:
+            pass
+    checks = {"extraction_pool": extraction_engine.ready, "gemini_client": client is not None}
+    ready = all(checks.values())
+    content = {"status": "ready" if ready else "not_ready", "pid": os.getpid(), "checks": checks}
+    if gemini_provider.error:
+        content["gemini_error"] = gemini_provider.error
+    return JSONResponse(status_code=200 if ready else 503, content=content)
+
+@app.get("/metrics")
+def metrics():
+    """Aşama süreleri ve sayaçlar, Prometheus metin formatında."""
+    peak = peak_rss_mb()
+    if peak is not None:
+        PROCESS_PEAK_RSS_MB.set(peak)
+    return PlainTextResponse(render_metrics(), media_type=METRICS_CONTENT_TYPE)
+
+def _extract_text_from_pdf(
+    source: Union[bytes, str],
+    max_pages: Optional[int] = None,
+    char_budget: Optional[int] = None,
+) -> str:
+    """
+    PDF içeriğinden (bayt veya dosya yolu) metin çıkarır ve temizler (sayfalar süreç havuzunda
+    paralel işlenir). char_budget dolduğunda kalan sayfalar ayrıştırılmaz.
+    """
+    return extraction_engine.extract(source, max_pages=max_pages, char_budget=char_budget)
     
+def _summary_request(
+    user_prompt: str,
+    system_prompt: str = SYSTEM_PROMPT,
+    response_schema: Optional[Type[BaseModel]] = None,
+    shape: SummaryShape = DEFAULT_SHAPE,
+) -> Dict[str, Any]:
+    """
+    Gemini generate_content çağrısının parametrelerini hazırlar. shape daraltılmışsa şema
+    yalnızca seçili alanları içerir; prompt'a alan seçimi ve çıktı bütçesi talimatı eklenir.
+    """
+
     # Pydantic modelini kullanarak beklenen JSON yapısını oluştur
-    json_format_description = ArticleSummary.model_json_schema()
-    
-    user_prompt = (
-        f"MAKALE METNİ:\n{input_text}"
-    )
+    # (iç içe modeller, örn. paketli özet listesi, doğrudan model sınıfı olarak verilir)
+    json_format_description = response_schema or shape.model.model_json_schema()
 
     # Gemini'nin yapılandırılmış yanıt özelliğini kullan
-    response = client.models.generate_content(
+    return dict(
         model=GEMINI_MODEL,
         contents=user_prompt,
-        config=types.GenerateContentConfig(
-            system_instruction=system_prompt,
+        config=genai_types().GenerateContentConfig(
+            system_instruction=shape.system_prompt(system_prompt),
             response_mime_type="application/json",
-            response_schema=json_format_description
+            response_schema=json_format_description,
+            **shape.config_options()
         )
     )
+
+def _parse_summary(response_text: str, model: Type[BaseModel] = ArticleSummary) -> BaseModel:
+    """Gemini yanıtını (JSON string) parse eder ve Pydantic ile doğrular."""
+    with stage("validation"):
+        summary_dict = json.loads(response_text.strip())
+        return model(**summary_dict)
+
+def _check_output_budget(response, shape: SummaryShape) -> None:
+    """Yanıt çıktı bütçesinde kesildiyse (yarım JSON) anlaşılır bir hata fırlatır."""
+    if shape.max_output_tokens is None or response is None or not response.candidates:
+        return
+    if response.candidates[0].finish_reason == genai_types().FinishReason.MAX_TOKENS:
+        raise ValueError(
+            f"Özet, çıktı bütçesine ({shape.max_output_tokens} token) sığmadı; max_output_tokens değerini artırın."
+        )
+
+def _get_gemini_summary(input_text: str) -> ArticleSummary:
+    """Gemini API'yi çağırır ve yapılandırılmış özet döner."""
+    request = _summary_request(f"MAKALE METNİ:\n{input_text}")
+    with stage("llm"):
+        try:
+            response = _gemini_client().models.generate_content(**request)
+        except Exception:
+            LLM_REQUESTS.inc(status="error")
+            raise
+    record_llm_usage(response, len(request["contents"]))
+    return _parse_summary(response.text)
+
+async def _call_gemini_async(request: Dict[str, Any]):
+    """
+    Asenkron Gemini çağrısı; kota ve eşzamanlılık sınırı içinde çalışır, 429 ve geçici
+    hatalarda yeniden denenir. Süre, gönderilen karakter, token kullanımı ve hatalar kaydedilir.
+    """
+    async def send():
+        with stage("llm"):
+            try:
+                return await _gemini_client().aio.models.generate_content(**request)
+            except Exception:
+                LLM_REQUESTS.inc(status="error")
+                raise
+
+    response = await gemini_scheduler.call(send)
+    record_llm_usage(response, len(request["contents"]))
+    return response
+
+async def _generate_summary_async(
+    system_prompt: str,
+    user_prompt: str,
+    shape: SummaryShape = DEFAULT_SHAPE,
+) -> BaseModel:
+    """Asenkron istemci ile tek bir yapılandırılmış özet çağrısı yapar (event loop'u bloklamaz)."""
+    response = await _call_gemini_async(_summary_request(user_prompt, system_prompt, shape=shape))
+    _check_output_budget(response, shape)
+    return _parse_summary(response.text, shape.model)
+
+async def _get_gemini_summary_async(input_text: str, shape: SummaryShape = DEFAULT_SHAPE) -> BaseModel:
+    """_get_gemini_summary'nin asenkron istemci ile çalışan karşılığı."""
+    return await _generate_summary_async(SYSTEM_PROMPT, f"MAKALE METNİ:\n{input_text}", shape)
+
+async def _stream_gemini_summary(
+    input_text: str,
+    on_field: FieldListener,
+    shape: SummaryShape = DEFAULT_SHAPE,
+) -> BaseModel:
+    """
+    Özeti akışla üretir: JSON yanıt parça parça ayrıştırılır ve tamamlanan her alan (önce kategori)
+    on_field ile hemen bildirilir. Akış bitince nesnenin tamamı Pydantic ile doğrulanır.
+    """
+    request = _summary_request(f"MAKALE METNİ:\n{input_text}", SYSTEM_PROMPT, shape.stream_schema(), shape)
+    delivered = set()
+
+    async def send():
+        # Yeniden denemede yanıt baştan ayrıştırılır; daha önce bildirilen alanlar tekrar gönderilmez
+        parser = JsonFieldStream()
+        last_chunk = None
+        with stage("llm"):
+            try:
+                stream = await _gemini_client().aio.models.generate_content_stream(**request)
+                async for chunk in stream:
+                    last_chunk = chunk
+                    for name, value in parser.feed(chunk.text or ""):
+                        if name not in delivered:
+                            delivered.add(name)
+                            await on_field(name, value)
+            except Exception:
+                LLM_REQUESTS.inc(status="error")
+                raise
+        return parser.text, last_chunk
+
+    response_text, last_chunk = await gemini_scheduler.call(send)
+    # Token kullanımı ve bitiş nedeni akışın son parçasında gelir
+    record_llm_usage(last_chunk, len(request["contents"]))
+    _check_output_budget(last_chunk, shape)
+    return _parse_summary(response_text, shape.model)
+
+async def _generate_packed_async(system_prompt: str, user_prompt: str, response_schema: Type[BaseModel]) -> str:
+    """Birden fazla makaleyi tek çağrıda özetler; doğrulanmamış JSON yanıt metnini döner."""
+    response = await _call_gemini_async(_summary_request(user_prompt, system_prompt, response_schema))
+    return response.text
+
+# Kısa makaleleri tek bir Gemini çağrısında toplar (paketli yanıt doğrulanamazsa tek tek özetler)
+article_packer = ArticlePacker(ArticleSummary, _generate_packed_async, _get_gemini_summary_async, SYSTEM_PROMPT)
+
+async def _summarize_input(
+    input_text: str,
+    pack: bool,
+    shape: SummaryShape = DEFAULT_SHAPE,
+) -> Tuple[BaseModel, Optional[int]]:
+    """
+    Metni özetler; pack=True ise diğer kısa makalelerle paketlenir. (özet, paket boyutu) döner.
+    Alan dinleyicisi ayarlıysa (akış uç noktası) özet akışla üretilir ve paketleme yapılmaz.
+    Alan seçimi veya çıktı bütçesi verilmişse de paketleme yapılmaz (paket şeması tam özettir).
+    """
+    on_field = summary_field_listener.get()
+    if on_field is not None:
+        return await _stream_gemini_summary(input_text, on_field, shape), None
+    if pack and shape.is_default:
+        return await article_packer.summarize(input_text)
+    return await _get_gemini_summary_async(input_text, shape), None
+
+async def _find_near_duplicate(digest: str, signature, version: str) -> Optional[Dict[str, Any]]:
+    """
+    Eşiğin üzerinde benzer bir makale daha önce aynı modda özetlendiyse onun önbellekteki
+    sonucunu, eşleşme bilgisi ('near_duplicate_of') eklenmiş olarak döner; yoksa None.
+    """
+    match = await asyncio.to_thread(near_duplicate_index.find, digest, signature)
+    if match is None:
+        return None
+    match_digest, similarity = match
+    cached = await asyncio.to_thread(summary_cache.get, make_cache_key(match_digest, GEMINI_MODEL, version))
+    if cached is None:
+        return None
+    return {**cached, "near_duplicate_of": {"sha256": match_digest, "similarity": round(similarity, 3)}}
+
+def _own_summary(cached: Optional[Dict[str, Any]], near_duplicates: bool) -> Optional[Dict[str, Any]]:
+    """
+    Önbellek kaydını döner; kayıt yakın kopyadan ödünç alınmış bir özetse ve istek yakın kopya
+    kullanımını kapatmışsa None (PDF'in kendi özeti üretilir ve kaydın üzerine yazılır).
+    """
+    if cached is not None and not near_duplicates and "near_duplicate_of" in cached:
+        return None
+    return cached
+
+async def _summarize_uncached(
+    filename: str,
+    pdf: SpooledPdf,
+    version: str,
+    long_document: bool,
+    compress: bool,
+    pack: bool,
+    near_duplicates: bool,
+    shape: SummaryShape = DEFAULT_SHAPE,
+) -> Dict[str, Any]:
+    """
+    Metin çıkarma ve özetleme adımlarını çalıştırır, sonucu önbelleğe yazar ve döner.
+    Hatalar fırlatılır; aynı içeriği bekleyen tüm istekler aynı hatayı alır.
+    """
+    cache_key = make_cache_key(pdf.sha256, GEMINI_MODEL, version)
+
+    # 2. pdfplumber ile metin çıkarma ve temizleme (CPU yoğun, süreç havuzunda çalışır)
+    # Normal modda modele yalnızca ilk MAX_CHARACTERS karakter gider; bütçe dolunca tarama durur
+    max_pages = LONG_DOCUMENT_MAX_PAGES if long_document else None
+    char_budget = None if long_document or compress else MAX_CHARACTERS
+    clean_text, normalization = await asyncio.to_thread(
+        extraction_engine.extract_with_stats, pdf.path, max_pages, char_budget
+    )
     
-    # API'dan gelen metin (JSON string)
-    response_text = response.text.strip()
-    
-    # Gelen JSON'u parse et
-    summary_dict = json.loads(response_text)
+    if len(clean_text) < 500:
+        raise ValueError("PDF'ten yeterli metin çıkarılamadı (Min 500 karakter gerekli).")
+    if normalization:
+        print(f"[{filename}] - Normalleştirme ile kazanılan karakter: {normalization['chars_saved']}")
+
+    # Aynı makalenin farklı bir sürümü daha önce özetlendiyse LLM çağrısı atlanır
+    with stage("near_duplicate"):
+        signature = await asyncio.to_thread(minhash_signature, clean_text)
+        reused = await _find_near_duplicate(pdf.sha256, signature, version) if near_duplicates else None
+    if reused is not None:
+        print(f"[{filename}] - Yakın kopya bulundu (benzerlik {reused['near_duplicate_of']['similarity']}), mevcut özet kullanıldı.")
+        await asyncio.to_thread(summary_cache.set, cache_key, reused)
+        return reused
     
-    # Pydantic modeli ile doğrula
-    validated_summary = ArticleSummary(**summary_dict)
+    if long_document:
+        # 3-4. Metnin tamamı parçalara bölünür, parçalar eşzamanlı özetlenip birleştirilir
+        # Parça ve birleştirme çağrıları da yalnızca seçili alanları üretir
+        validated_summary, chunk_count = await summarize_long_document(
+            clean_text,
+            lambda system_prompt, user_prompt: _generate_summary_async(system_prompt, user_prompt, shape),
+            SYSTEM_PROMPT,
+        )
+    elif compress:
+        # 3. Modele gönderilecek metni cümle seçimiyle bütçeye indirme
+        with stage("compression"):
+            input_text, compression = await asyncio.to_thread(
+                compress_text, clean_text, EXTRACTIVE_BUDGET_CHARS
+            )
+        print(f"[{filename}] - Sıkıştırma oranı: {compression['ratio']}")
+        
+        # 4. Gemini API çağrısı ve JSON özetini alma
+        validated_summary, pack_size = await _summarize_input(input_text, pack, shape)
+    else:
+        # 3. Modele gönderilecek metni limitlendirme
+        input_text = clean_text[:MAX_CHARACTERS]
+        
+        # 4. Gemini API çağrısı ve JSON özetini alma
+        validated_summary, pack_size = await _summarize_input(input_text, pack, shape)
     
-    return validated_summary
+    # Başarılı sonuç önbelleğe yazılır ve döndürülür
+    result = {
+        "status": "Success",
+        "text_length": len(clean_text),
+        "summary": validated_summary.model_dump(),
+        "model_used": GEMINI_MODEL,
+        "extracted_text_sample": clean_text[:300] + "..."
+    }
+    if not shape.is_default:
+        result["summary_shape"] = shape.describe()
+    if normalization:
+        # Tekrar eden başlık/altbilgi, tireleme ve kaynakça kuyruğundan kazanılan karakterler
+        result["normalization"] = normalization
+    if long_document:
+        result["chunk_count"] = chunk_count
+    elif compress:
+        result["compression"] = compression
+    if not long_document and pack_size is not None:
+        result["pack_size"] = pack_size
+    await asyncio.to_thread(summary_cache.set, cache_key, result)
+    await _index_summary(filename, pdf.sha256, result, long_document, signature, searchable=not shape.partial)
+    return result
 
-@app.post("/summarize-pdfs", response_model=List[Dict[str, Any]])
-async def summarize_pdfs(files: List[UploadFile] = File(...)):
+async def _index_summary(
+    filename: str,
+    digest: str,
+    result: Dict[str, Any],
+    long_document: bool,
+    signature,
+    searchable: bool = True,
+) -> None:
     """
-    Birden fazla PDF dosyasını işler ve her biri için yapılandırılmış özet döner.
-    Hatalı dosyalar atlanır, diğer dosyalar işlenmeye devam eder.
+    Yeni özeti aranabilir derleme ve yakın kopya indeksine ekler. İndeks yazılamazsa özet yanıtı etkilenmez.
+    searchable=False ise (yalnızca bazı alanları içeren özet) derlemdeki tam özetin üzerine yazılmaz.
     """
-    if client is None:
-        raise HTTPException(
-            status_code=503,
-            detail="LLM (Gemini) istemcisi başlatılamadı. Sunucu loglarını kontrol edin."
-        )
+    metadata = {
+        key: result[key]
+        for key in ("text_length", "model_used", "extracted_text_sample", "chunk_count", "pack_size")
+        if key in result
+    }
+    metadata["long_document"] = long_document
+    try:
+        if searchable:
+            await asyncio.to_thread(corpus_index.add, digest, filename, result["summary"], metadata)
+        await asyncio.to_thread(near_duplicate_index.add, digest, signature)
+    except sqlite3.Error as e:
+        print(f"[{filename}] - Derleme eklenemedi: {e}")
 
-    all_summaries = []
-    MAX_CHARACTERS = 15000 
-    
-    for file in files:
-        filename = file.filename
+async def _summarize_contents(
+    filename: str,
+    content_type: str,
+    pdf: SpooledPdf,
+    long_document: bool = False,
+    compress: bool = EXTRACTIVE_COMPRESSION,
+    pack: bool = PACK_SHORT_ARTICLES,
+    near_duplicates: bool = NEAR_DUPLICATE_REUSE,
+    shape: SummaryShape = DEFAULT_SHAPE,
+) -> Dict[str, Any]:
+    """
+    Tek bir dosyayı işler; hata durumunda 'Failed' sonucu döner, istisna fırlatmaz.
+    long_document=True ise metin kesilmez, parçalara bölünerek map-reduce ile özetlenir.
+    compress=True ise metin, modele gönderilmeden önce en bilgilendirici cümlelere indirgenir.
+    pack=True ise kısa metinler aynı anda işlenen diğer kısa makalelerle tek çağrıda özetlenir.
+    shape yalnızca bazı alanları (ve/veya çıktı bütçesini) seçiyorsa model yalnızca onları üretir.
+    """
+
+    # Her bir dosya için bağımsız try-except bloğu
+    try:
+        print(f"[{filename}] - İşleniyor...")
         
-        # Her bir dosya için bağımsız try-except bloğu
-        try:
-            print(f"[{filename}] - İşleniyor...")
-            
-            # 1. Dosya Kontrolü
-            if file.content_type != "application/pdf":
-                raise ValueError("Yalnızca PDF formatındaki dosyalar kabul edilir.")
-            
-            # 2. Dosya içeriğini belleğe oku
-            contents = await file.read()
-            
-            # 3. pdfplumber ile metin çıkarma ve temizleme
-            clean_text = _extract_text_from_pdf(contents)
-            
-            if len(clean_text) < 500:
-                raise ValueError("PDF'ten yeterli metin çıkarılamadı (Min 500 karakter gerekli).")
-            
-            # 4. Modele gönderilecek metni limitlendirme
-            input_text = clean_text[:MAX_CHARACTERS]
-            
-            # 5. Gemini API çağrısı ve JSON özetini alma
-            validated_summary = _get_gemini_summary(input_text)
-            
-            # Başarılı sonuç listeye eklenir
-            all_summaries.append({
-                "filename": filename,
-                "status": "Success",
-                "text_length": len(clean_text),
-                "summary": validated_summary.model_dump(),
-                "model_used": GEMINI_MODEL,
-                "extracted_text_sample": clean_text[:300] + "..."
-            })
-            print(f"[{filename}] - Başarıyla tamamlandı.")
-
-        # Hata yakalama: Özelleştirilmiş ve genel hatalar
-        except ValueError as e:
-            error_detail = str(e)
-            print(f"[{filename}] - Hata (Veri Doğrulama): {error_detail}")
-            all_summaries.append({
+        # 1. Dosya Kontrolü
+        if content_type != "application/pdf":
+            raise ValueError("Yalnızca PDF formatındaki dosyalar kabul edilir.")
+
+        # Aynı PDF daha önce özetlendiyse pdfplumber ve LLM adımları atlanır
+        version = LONG_PROMPT_VERSION if long_document else PROMPT_VERSION
+        if compress and not long_document:
+            version = f"{version}:tfidf{EXTRACTIVE_BUDGET_CHARS}"
+        full_key = make_cache_key(pdf.sha256, GEMINI_MODEL, version)
+        version = shape.version(version)
+        cache_key = make_cache_key(pdf.sha256, GEMINI_MODEL, version)
+        with stage("cache"):
+            cached = _own_summary(await asyncio.to_thread(summary_cache.get, cache_key), near_duplicates)
+            if cached is None and shape.partial and shape.max_output_tokens is None:
+                # Aynı PDF'in tam özeti varsa seçili alanlar ondan alınır
+                full = _own_summary(await asyncio.to_thread(summary_cache.get, full_key), near_duplicates)
+                if full is not None:
+                    cached = {**full, "summary": shape.project(full["summary"]), "summary_shape": shape.describe()}
+        if cached is not None:
+            print(f"[{filename}] - Önbellekten döndürüldü.")
+            CACHE_REQUESTS.inc(result="hit")
+            return {"filename": filename, **cached, "cache": "hit"}
+        
+        # Aynı PDF şu anda başka bir dosya/istek için işleniyorsa o işin sonucu (hata dahil) beklenir.
+        # Yakın kopya kullanımı kapalı istekler, ödünç özet dönebilecek işlerle birleştirilmez.
+        # İş PDF'i kendi referansından okur: başlatan istek iptal edilse de bekleyenler etkilenmez
+        result, shared = await summary_flight.run(
+            cache_key if near_duplicates else f"{cache_key}:exact",
+            with_own_reference(
+                pdf,
+                lambda own: _summarize_uncached(filename, own, version, long_document, compress, pack, near_duplicates, shape),
+            ),
+        )
+        if shared:
+            CACHE_REQUESTS.inc(result="shared")
+            print(f"[{filename}] - Aynı içerikli dosyanın süren işleminin sonucu paylaşıldı.")
+            return {"filename": filename, **result, "cache": "shared"}
+        if "near_duplicate_of" in result:
+            CACHE_REQUESTS.inc(result="near_duplicate")
+            return {"filename": filename, **result, "cache": "near_duplicate"}
+        CACHE_REQUESTS.inc(result="miss")
+        print(f"[{filename}] - Başarıyla tamamlandı.")
+        return {"filename": filename, **result, "cache": "miss"}
+
+    # Hata yakalama: Özelleştirilmiş ve genel hatalar
+    except ValueError as e:
+        error_detail = str(e)
+        print(f"[{filename}] - Hata (Veri Doğrulama): {error_detail}")
+        FAILURES.inc(type=type(e).__name__)
+        return {
+            "filename": filename,
+            "status": "Failed",
+            "detail": f"Dosya işleme hatası: {error_detail}"
+        }
+    except json.JSONDecodeError:
+        error_detail = "LLM hatalı/geçersiz JSON formatında yanıt verdi."
+        print(f"[{filename}] - Hata (JSON Parse): {error_detail}")
+        FAILURES.inc(type="JSONDecodeError")
+        return {
+            "filename": filename,
+            "status": "Failed",
+            "detail": error_detail
+        }
+    except Exception as e:
+        error_detail = f"Beklenmedik bir hata oluştu: {type(e).__name__} - {e}"
+        print(f"[{filename}] - Hata (Genel): {error_detail}")
+        FAILURES.inc(type=type(e).__name__)
+        if is_throttled(e):
+            # Yeniden denemelere rağmen kota aşımı sürüyor
+            return {
                 "filename": filename,
                 "status": "Failed",
-                "detail": f"Dosya işleme hatası: {error_detail}"
-            })
-        except json.JSONDecodeError:
-            error_detail = "LLM hatalı/geçersiz JSON formatında yanıt verdi."
-            print(f"[{filename}] - Hata (JSON Parse): {error_detail}")
-            all_summaries.append({
+                "detail": "Gemini kotası aşıldı. Lütfen bir süre sonra tekrar deneyin."
+            }
+        if isinstance(e, GeminiUnavailableError):
+            # Kuyruktaki işler için: istemci kurulamadı (örn. API anahtarı eksik)
+            return {
                 "filename": filename,
                 "status": "Failed",
-                "detail": error_detail
-            })
-        except Exception as e:
-            error_detail = f"Beklenmedik bir hata oluştu: {type(e).__name__} - {e}"
-            print(f"[{filename}] - Hata (Genel): {error_detail}")
-            traceback.print_exc()
-            all_summaries.append({
+                "detail": "LLM (Gemini) istemcisi başlatılamadı. Sunucu loglarını kontrol edin."
+            }
+        traceback.print_exc()
+        return {
+            "filename": filename,
+            "status": "Failed",
+            "detail": "Sunucu veya API hatası oluştu. Logları kontrol edin."
+        }
+
+async def _process_file(
+    file: UploadFile,
+    semaphore: asyncio.Semaphore,
+    long_document: bool = False,
+    compress: bool = EXTRACTIVE_COMPRESSION,
+    pack: bool = PACK_SHORT_ARTICLES,
+    include_timings: bool = False,
+    near_duplicates: bool = NEAR_DUPLICATE_REUSE,
+    shape: SummaryShape = DEFAULT_SHAPE,
+) -> Dict[str, Any]:
+    """Yüklenen dosyayı diske alır (belleğe kopyalamadan) ve _summarize_contents ile işler."""
+    filename = file.filename
+    try:
+        # PDF olmayan dosyalar diske yazılmadan reddedilir
+        if file.content_type != "application/pdf":
+            print(f"[{filename}] - Hata (Veri Doğrulama): Yalnızca PDF formatındaki dosyalar kabul edilir.")
+            FAILURES.inc(type="ValueError")
+            return {
                 "filename": filename,
                 "status": "Failed",
-                "detail": "Sunucu veya API hatası oluştu. Logları kontrol edin."
-            })
+                "detail": "Dosya işleme hatası: Yalnızca PDF formatındaki dosyalar kabul edilir."
+            }
+        # Dosyanın aşama süreleri ayrıca toplanır (isteğin Server-Timing toplamına da eklenir)
+        with track_timings() as timings:
+            async with semaphore:
+                try:
+                    with stage("upload"):
+                        pdf = await spool_upload(file)
+                except UploadTooLargeError as e:
+                    print(f"[{filename}] - Hata (Boyut): {e}")
+                    FAILURES.inc(type="UploadTooLargeError")
+                    return {
+                        "filename": filename,
+                        "status": "Failed",
+                        "detail": f"Dosya işleme hatası: {e}"
+                    }
+                except Exception as e:
+                    # Geçici klasör dolu/yazılamıyor, istemci yükleme sırasında bağlantıyı kesti vb.:
+                    # yalnızca bu dosya başarısız olur, toplu isteğin diğer dosyaları etkilenmez
+                    print(f"[{filename}] - Hata (Yükleme): {type(e).__name__} - {e}")
+                    FAILURES.inc(type=type(e).__name__)
+                    return {
+                        "filename": filename,
+                        "status": "Failed",
+                        "detail": f"Dosya yüklenemedi: {type(e).__name__}"
+                    }
+                with pdf:
+                    result = await _summarize_contents(
+                        filename, file.content_type, pdf, long_document, compress, pack, near_duplicates, shape
+                    )
+        # Yükleme diske alındığı için süreç belleğine girmez. Sürecin en yüksek bellek kullanımı
+        # dosya başına ölçülemez (ru_maxrss süreç ömrü boyunca artar); /metrics altında raporlanır
+        result["memory"] = {"upload_bytes": pdf.size}
+        if include_timings:
+            result["timings"] = timings.as_dict()
+        return result
+    finally:
+        # Dosya okuma bittikten sonra dosya işaretçisini kapat
+        await file.close()
+
+async def _require_gemini() -> None:
+    """Gemini istemcisi kurulamıyorsa 503 döner (istemci gerekirse burada kurulur)."""
+    try:
+        await asyncio.to_thread(_gemini_client)
+    except GeminiUnavailableError:
+        raise HTTPException(
+            status_code=503,
+            detail="LLM (Gemini) istemcisi başlatılamadı. Sunucu loglarını kontrol edin."
+        )
+
+def _summary_shape(summary_fields: Optional[str], max_output_tokens: Optional[int]) -> SummaryShape:
+    """İstekteki alan seçimi ve çıktı bütçesinden özet biçimini kurar; bilinmeyen alan 422 döner."""
+    try:
+        fields = parse_summary_fields(summary_fields, STREAM_FIELD_ORDER)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    if fields is None and max_output_tokens is None:
+        return DEFAULT_SHAPE
+    return SummaryShape(ArticleSummary, STREAM_FIELD_ORDER, fields, max_output_tokens)
+
+@app.post("/summarize-pdfs", response_model=List[Dict[str, Any]])
+async def summarize_pdfs(
+    files: List[UploadFile] = File(...),
+    long_document: bool = Query(False, description="Uzun belge modu: metni kesmek yerine parçalayıp map-reduce ile özetler."),
+    compress: bool = Query(EXTRACTIVE_COMPRESSION, description="Metni modele göndermeden önce TF-IDF ile en bilgilendirici cümlelere indirger."),
+    pack: bool = Query(PACK_SHORT_ARTICLES, description="Kısa makaleleri tek bir LLM çağrısında toplar (dakikadaki istek kotasını korur)."),
+    timings: bool = Query(False, description="Her dosyanın aşama sürelerini (ms) yanıta 'timings' alanı olarak ekler."),
+    near_duplicates: bool = Query(NEAR_DUPLICATE_REUSE, description="Daha önce özetlenmiş bir makalenin yakın kopyasıysa (farklı sürüm/PDF) mevcut özeti döner, LLM çağrısı yapmaz."),
+    summary_fields: Optional[str] = Query(None, description="Üretilecek özet alanları, virgülle ayrılmış (örn. 'kategori' veya 'kategori,ozet_genel'). Boşsa tüm alanlar."),
+    max_output_tokens: Optional[int] = Query(None, ge=SUMMARY_MIN_OUTPUT_TOKENS, le=SUMMARY_MAX_OUTPUT_TOKENS, description="Özet başına çıktı bütçesi (token); alanlar buna göre kısaltılır."),
+):
+    """
+    Birden fazla PDF dosyasını eşzamanlı (en fazla SUMMARIZE_CONCURRENCY dosya) işler
+    ve her biri için yapılandırılmış özet döner. Sonuçlar yükleme sırasını korur.
+    Hatalı dosyalar atlanır, diğer dosyalar işlenmeye devam eder.
+
+    summary_fields ve max_output_tokens ile yalnızca gereken alanlar (örn. yönlendirme için
+    'kategori') kısa bir çıktı bütçesiyle üretilir; varsayılan yanıt tam özettir.
+    """
+    shape = _summary_shape(summary_fields, max_output_tokens)
+    await _require_gemini()
+
+    semaphore = asyncio.Semaphore(SUMMARIZE_CONCURRENCY)
+    all_summaries = await asyncio.gather(*(_process_file(file, semaphore, long_document, compress, pack, timings, near_duplicates, shape) for file in files))
+
+    return list(all_summaries)
+
+@app.post("/summarize-pdfs/stream")
+async def summarize_pdfs_stream(
+    files: List[UploadFile] = File(...),
+    long_document: bool = Query(False, description="Uzun belge modu: metni kesmek yerine parçalayıp map-reduce ile özetler."),
+    compress: bool = Query(EXTRACTIVE_COMPRESSION, description="Metni modele göndermeden önce TF-IDF ile en bilgilendirici cümlelere indirger."),
+    pack: bool = Query(PACK_SHORT_ARTICLES, description="Kısa makaleleri tek bir LLM çağrısında toplar (dakikadaki istek kotasını korur)."),
+    timings: bool = Query(False, description="Her dosyanın aşama sürelerini (ms) yanıta 'timings' alanı olarak ekler."),
+    near_duplicates: bool = Query(NEAR_DUPLICATE_REUSE, description="Daha önce özetlenmiş bir makalenin yakın kopyasıysa (farklı sürüm/PDF) mevcut özeti döner, LLM çağrısı yapmaz."),
+    summary_fields: Optional[str] = Query(None, description="Üretilecek özet alanları, virgülle ayrılmış (örn. 'kategori' veya 'kategori,ozet_genel'). Boşsa tüm alanlar."),
+    max_output_tokens: Optional[int] = Query(None, ge=SUMMARY_MIN_OUTPUT_TOKENS, le=SUMMARY_MAX_OUTPUT_TOKENS, description="Özet başına çıktı bütçesi (token); alanlar buna göre kısaltılır."),
+    fields: bool = Query(False, description="Özet alanlarını (önce kategori, sonra genel özet ...) üretildikçe ayrı satırlar olarak gönderir."),
+):
+    """
+    /summarize-pdfs ile aynı işlemi yapar, ancak her dosyanın sonucunu tamamlanır
+    tamamlanmaz NDJSON (satır başına bir JSON nesnesi) olarak akış halinde gönderir.
+    Sonuçlar tamamlanma sırasıyla gelir; istemci dosyaları 'filename' alanı ile eşleştirir.
+
+    fields=true ise özet LLM'den akışla alınır ve her alan tamamlanır tamamlanmaz
+    {"filename", "event": "field", "field", "value", "elapsed_ms"} satırı gönderilir.
+    Dosyanın doğrulanmış sonucu yine en sonda, alışılmış biçimde gelir. Önbellekten dönen
+    sonuçlar ve uzun belge modu için alan satırı gönderilmez.
+    summary_fields / max_output_tokens /summarize-pdfs ile aynıdır.
+    """
+    shape = _summary_shape(summary_fields, max_output_tokens)
+    await _require_gemini()
+
+    semaphore = asyncio.Semaphore(SUMMARIZE_CONCURRENCY)
+
+    async def result_stream():
+        events: asyncio.Queue = asyncio.Queue()
+
+        async def process(file: UploadFile):
+            started = time.perf_counter()
+            if fields:
+                async def on_field(name: str, value: Any):
+                    await events.put({
+                        "filename": file.filename,
+                        "event": "field",
+                        "field": name,
+                        "value": value,
+                        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+                    })
+                # Görev kendi bağlam kopyasında çalışır: dinleyici yalnızca bu dosyanın LLM çağrısına ulaşır
+                summary_field_listener.set(on_field)
+            try:
+                result = await _process_file(file, semaphore, long_document, compress, pack, timings, near_duplicates, shape)
+            except Exception as e:
+                # Akış başladıktan sonra hata fırlatılırsa istemci yarım bir gövde alır;
+                # bunun yerine yalnızca bu dosya için 'Failed' satırı gönderilir
+                print(f"[{file.filename}] - Hata (Akış): {type(e).__name__} - {e}")
+                traceback.print_exc()
+                FAILURES.inc(type=type(e).__name__)
+                result = {
+                    "filename": file.filename,
+                    "status": "Failed",
+                    "detail": "Sunucu veya API hatası oluştu. Logları kontrol edin."
+                }
+            await events.put(result)
+
+        tasks = [asyncio.create_task(process(file)) for file in files]
+        try:
+            remaining = len(tasks)
+            while remaining:
+                event = await events.get()
+                if event.get("event") != "field":
+                    remaining -= 1
+                yield json.dumps(event, ensure_ascii=False) + "\n"
         finally:
-            # Dosya okuma bittikten sonra dosya işaretçisini kapat
+            # İstemci bağlantıyı keserse kalan işler iptal edilir
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(result_stream(), media_type=NDJSON_MEDIA_TYPE)
+
+@app.post("/jobs", status_code=202)
+async def submit_job(files: List[UploadFile] = File(...)):
+    """
+    Büyük toplu işler için: dosyaları kalıcı kuyruğa alır ve hemen iş kimliği döner.
+    Durum /jobs/{job_id}, sonuçlar /jobs/{job_id}/results üzerinden alınır.
+    Kuyruk doluysa 429 döner (Retry-After başlığı ile).
+    """
+    await _require_gemini()
+
+    uploads = []
+    try:
+        # Yüklemeler belleğe alınmadan diske yazılır, ardından iş klasörüne taşınır
+        for file in files:
+            uploads.append((file.filename, file.content_type, await spool_upload(file)))
+        job_id = await asyncio.to_thread(job_queue.submit, uploads)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except QueueFullError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "30"})
+    finally:
+        for file in files:
             await file.close()
+        # Kuyruğa taşınmamış geçici dosyalar temizlenir
+        for _, _, pdf in uploads:
+            pdf.close()
+
+    job_queue.notify()
+    return await asyncio.to_thread(job_queue.status, job_id)
+
+@app.get("/jobs/{job_id}")
+async def get_job_status(job_id: str):
+    """İşin durumunu (queued / running / completed) ve ilerlemesini döner."""
+    status = await asyncio.to_thread(job_queue.status, job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="İş bulunamadı.")
+    return status
+
+@app.get("/jobs/{job_id}/results", response_model=List[Dict[str, Any]])
+async def get_job_results(job_id: str):
+    """İşteki dosyaların sonuçlarını yükleme sırasıyla döner; bitmeyenler 'Pending' görünür."""
+    if await asyncio.to_thread(job_queue.status, job_id) is None:
+        raise HTTPException(status_code=404, detail="İş bulunamadı.")
+    return await asyncio.to_thread(job_queue.results, job_id)
+
+async def _preview_file(
+    file: UploadFile,
+    semaphore: asyncio.Semaphore,
+    width: int,
+    image_format: str,
+) -> Dict[str, Any]:
+    """Dosyanın ilk sayfa önizlemesini önbellekten veya süreç havuzunda çizerek döner."""
+    filename = file.filename
+    try:
+        async with semaphore:
+            try:
+                with stage("upload"):
+                    pdf = await spool_upload(file)
+            except UploadTooLargeError as e:
+                FAILURES.inc(type="UploadTooLargeError")
+                return {"filename": filename, "status": "Failed", "detail": f"Dosya işleme hatası: {e}"}
+            with pdf:
+                # Aynı içerik + aynı boyut/format için önizleme bir kez çizilir
+                key = preview_cache_key(pdf.sha256, width, image_format, PREVIEW_QUALITY)
+                with stage("cache"):
+                    image = await asyncio.to_thread(preview_cache.get, key)
+                cache_status = "hit" if image is not None else "miss"
+                if image is None:
+                    try:
+                        with stage("preview"):
+                            image = await asyncio.to_thread(
+                                extraction_engine.run, render_thumbnail, pdf.path, width, image_format, PREVIEW_QUALITY
+                            )
+                    except Exception as e:
+                        print(f"[{filename}] - Hata (Önizleme): {e}")
+                        FAILURES.inc(type="PreviewError")
+                        detail = str(e) if isinstance(e, PdfExtractionError) else "PDF'in ilk sayfası çizilemedi."
+                        return {"filename": filename, "status": "Failed", "detail": f"Önizleme hatası: {detail}"}
+                    await asyncio.to_thread(preview_cache.set, key, image)
+        return {
+            "filename": filename,
+            "status": "Success",
+            "sha256": pdf.sha256,
+            "content_type": PREVIEW_FORMATS[image_format][1],
+            "cache": cache_status,
+            "image": base64.b64encode(image).decode("ascii"),
+        }
+    finally:
+        await file.close()
+
+@app.post("/preview-pdf", response_model=List[Dict[str, Any]])
+async def preview_pdfs(
+    files: List[UploadFile] = File(...),
+    width: int = Query(PREVIEW_WIDTH, ge=64, le=2000, description="Önizleme genişliği (piksel); sayfa doğrudan bu genişlikte çizilir."),
+    image_format: str = Query(PREVIEW_FORMAT, alias="format", pattern="^(webp|jpeg)$", description="Görüntü formatı: webp veya jpeg."),
+):
+    """
+    Yüklenen PDF'lerin ilk sayfa önizlemelerini toplu olarak üretir. Çizim, PDF işleme
+    süreç havuzunda paralel yapılır; sonuçlar içerik hash'i ile önbelleğe alınır.
+    Görüntüler base64 olarak, yükleme sırasıyla döner. LLM istemcisi gerektirmez.
+    """
+    semaphore = asyncio.Semaphore(max(1, extraction_engine.max_workers))
+    return list(await asyncio.gather(*(_preview_file(file, semaphore, width, image_format) for file in files)))
+
+@app.get("/preview-pdf/{sha256}")
+async def get_preview(sha256: str):
+    """Önbellekteki önizlemeyi içerik hash'i ile ham görüntü olarak döner (tarayıcı önbelleğine uygun)."""
+    found = await asyncio.to_thread(preview_cache.find, sha256)
+    if found is None:
+        raise HTTPException(status_code=404, detail="Önizleme bulunamadı.")
+    key, image = found
+    image_format = key.split(":")[2]
+    return Response(
+        content=image,
+        media_type=PREVIEW_FORMATS[image_format][1],
+        headers={"Cache-Control": "public, max-age=31536000, immutable"},
+    )
+
+@app.get("/corpus/search")
+async def search_corpus(
+    q: Optional[str] = Query(None, description="Özet alanlarında aranacak kelimeler (hepsi geçmeli, önek eşleşmesi)."),
+    category: Optional[str] = Query(None, description="Kategori filtresi (örn. NLP, CV, RL); büyük/küçük harf duyarsız."),
+    limit: int = Query(20, ge=1, le=CORPUS_PAGE_SIZE_MAX),
+    offset: int = Query(0, ge=0),
+):
+    """
+    Daha önce özetlenmiş makalelerde arama yapar; LLM çağrısı yapılmaz.
+    Sonuçlar BM25 ilgi puanına (sorgu yoksa en yeni güncellemeye) göre sıralanır.
+    """
+    return await asyncio.to_thread(corpus_index.search, q, category, limit, offset)
+
+@app.get("/corpus/categories")
+async def get_corpus_categories():
+    """Derlemdeki kategoriler ve her birindeki makale sayısı."""
+    return await asyncio.to_thread(corpus_index.categories)
 
-    return all_summaries
\ No newline at end of file
+@app.get("/corpus/papers/{sha256}")
+async def get_corpus_paper(sha256: str):
+    """Makalenin derlemdeki özetini ve metin meta verisini PDF içeriğinin hash'i ile döner."""
+    paper = await asyncio.to_thread(corpus_index.get, sha256)
+    if paper is None:
+        raise HTTPException(status_code=404, detail="Makale derlemde bulunamadı.")
+    return paper
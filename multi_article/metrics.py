@@ -0,0 +1,223 @@
+import time
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Prometheus metin formatında (text exposition 0.0.4) metrikler; harici bağımlılık gerektirmez.
+# Değerler süreç başınadır: birden fazla uvicorn worker'ında her worker kendi değerlerini raporlar.
+METRICS_PREFIX = "pdf_summarizer_"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    """Yalnızca artan sayaç; etiket kombinasyonu başına ayrı değer tutar."""
+
+    def __init__(self, name: str, documentation: str):
+        self.name = METRICS_PREFIX + name
+        self.documentation = documentation
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(_label_key(labels), 0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(key)} {_format_value(value)}")
+        return lines
+
+
+class Gauge:
+    """Anlık değer (artıp azalabilir)."""
+
+    def __init__(self, name: str, documentation: str):
+        self.name = METRICS_PREFIX + name
+        self.documentation = documentation
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def set(self, value: float, **labels: str) -> None:
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """Süre dağılımı (kümülatif kovalar, toplam ve adet); p50/p95 Prometheus tarafında hesaplanır."""
+
+    def __init__(self, name: str, documentation: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = METRICS_PREFIX + name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets))
+        # etiketler -> (kova sayaçları, toplam, adet)
+        self._values: Dict[LabelKey, Tuple[List[int], float, int]] = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            counts, total, count = self._values.get(key) or ([0] * len(self.buckets), 0.0, 0)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            self._values[key] = (counts, total + value, count + 1)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._values.items()):
+                for bound, bucket_count in zip(self.buckets, counts):
+                    lines.append(f"{self.name}_bucket{_format_labels(key, ('le', repr(bound)))} {bucket_count}")
+                lines.append(f"{self.name}_bucket{_format_labels(key, ('le', '+Inf'))} {count}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(total)}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {count}")
+        return lines
+
+
+REGISTRY: List = []
+
+STAGE_SECONDS = Histogram(
+    "stage_seconds",
+    "İşlem aşamalarının süresi (upload, cache, extraction, cleaning, near_duplicate, compression, rate_limit, llm, validation).",
+)
+PAGES_PARSED = Counter("pages_parsed_total", "Metni çıkarılan PDF sayfası sayısı.")
+CHARS_EXTRACTED = Counter("chars_extracted_total", "PDF'lerden çıkarılan (temizlenmiş) karakter sayısı.")
+CHARS_NORMALIZED_AWAY = Counter(
+    "chars_normalized_away_total",
+    "Metin normalleştirmede atılan karakter sayısı (tekrar eden başlık/altbilgi, tireleme, kaynakça kuyruğu).",
+)
+CHARS_SENT = Counter("chars_sent_total", "LLM'e gönderilen karakter sayısı.")
+CACHE_REQUESTS = Counter("cache_requests_total", "Özet önbelleği sorguları (result: hit / miss / shared / near_duplicate).")
+LLM_REQUESTS = Counter("llm_requests_total", "LLM çağrıları (status: success / error).")
+LLM_TOKENS = Counter("llm_tokens_total", "LLM token kullanımı (kind: prompt / output).")
+FAILURES = Counter("failures_total", "Başarısız dosya/istekler (type: hata sınıfı).")
+LLM_RETRIES = Counter("llm_retries_total", "Yeniden denenen LLM çağrıları (reason: throttled / server_error / network).")
+LLM_CONCURRENCY_LIMIT = Gauge("llm_concurrency_limit", "AIMD ile ayarlanan anlık LLM eşzamanlılık sınırı.")
+PROCESS_PEAK_RSS_MB = Gauge(
+    "process_peak_rss_mb", "Sürecin başlangıçtan beri en yüksek bellek kullanımı (MB, ru_maxrss); /metrics okunurken güncellenir."
+)
+
+
+def render_metrics() -> str:
+    """Tüm metrikleri Prometheus metin formatında döner (/metrics uç noktası için)."""
+    lines: List[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+class RequestTimings:
+    """
+    Bir isteğin (veya toplu istekteki tek bir dosyanın) aşama süreleri, milisaniye cinsinden.
+    Alt ölçümler (child) kaydettikleri süreleri üst ölçüme de ekler.
+    """
+
+    def __init__(self, parent: Optional["RequestTimings"] = None):
+        self.parent = parent
+        self.started = time.perf_counter()
+        self.stages: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self.stages[stage] = self.stages.get(stage, 0.0) + seconds * 1000
+        if self.parent is not None:
+            self.parent.add(stage, seconds)
+
+    def as_dict(self) -> Dict[str, float]:
+        timings = {stage: round(ms, 2) for stage, ms in self.stages.items()}
+        timings["total"] = round((time.perf_counter() - self.started) * 1000, 2)
+        return timings
+
+    def server_timing(self) -> str:
+        """Server-Timing başlığı değeri, örn. 'extraction;dur=120.5, llm;dur=850.1, total;dur=990.0'."""
+        return ", ".join(f"{stage};dur={ms}" for stage, ms in self.as_dict().items())
+
+
+_current_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def current_timings() -> RequestTimings:
+    """Geçerli isteğin ölçümü; istek dışında çağrılırsa boş bir ölçüm döner."""
+    return _current_timings.get() or RequestTimings()
+
+
+@contextmanager
+def track_timings() -> Iterator[RequestTimings]:
+    """
+    Bu blok içinde (ve içinden başlatılan görev/thread'lerde) ölçülen aşamaları toplayan
+    bir RequestTimings açar. İç içe çağrılırsa süreler üst ölçüme de yansır.
+    """
+    timings = RequestTimings(parent=_current_timings.get())
+    token = _current_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _current_timings.reset(token)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Bloğun süresini STAGE_SECONDS histogramına ve geçerli isteğin ölçümüne ekler."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        STAGE_SECONDS.observe(elapsed, stage=name)
+        timings = _current_timings.get()
+        if timings is not None:
+            timings.add(name, elapsed)
+
+
+def record_llm_usage(response, prompt_chars: int) -> None:
+    """Gemini yanıtındaki token kullanımını ve gönderilen karakter sayısını kaydeder."""
+    LLM_REQUESTS.inc(status="success")
+    CHARS_SENT.inc(prompt_chars)
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return
+    if getattr(usage, "prompt_token_count", None):
+        LLM_TOKENS.inc(usage.prompt_token_count, kind="prompt")
+    if getattr(usage, "candidates_token_count", None):
+        LLM_TOKENS.inc(usage.candidates_token_count, kind="output")
@@ -0,0 +1,157 @@
+import os
+import re
+import time
+import sqlite3
+import hashlib
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+# Yakın kopya tespiti ayarları ortam değişkenleri ile değiştirilebilir
+NEAR_DUPLICATE_REUSE = os.getenv("NEAR_DUPLICATE_REUSE", "1") == "1"
+# Tahmini Jaccard benzerliği bu eşiğin üzerindeyse makale yakın kopya sayılır
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.8"))
+NEAR_DUPLICATE_INDEX_PATH = os.getenv("NEAR_DUPLICATE_INDEX_PATH", "near_duplicates.sqlite3")
+MINHASH_PERMUTATIONS = int(os.getenv("MINHASH_PERMUTATIONS", "128"))
+# Bant sayısı LSH aday eşiğini belirler: (1 / bant) ** (1 / satır); 16 x 8 için ~0.71
+LSH_BANDS = int(os.getenv("LSH_BANDS", "16"))
+SHINGLE_WORDS = 5
+# İmza metnin yalnızca başından çıkarılır: normal / uzun belge / sıkıştırma modlarında
+# farklı uzunlukta çıkarılan metinler karşılaştırılabilir kalır
+SIGNATURE_MAX_CHARS = 15000
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def _permutations(count: int, seed: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    # Sabit tohum: imzalar süreçler ve yeniden başlatmalar arasında karşılaştırılabilir olmalı
+    rng = np.random.RandomState(seed)
+    a = rng.randint(1, (1 << 61) - 1, size=count, dtype=np.uint64)
+    b = rng.randint(0, (1 << 61) - 1, size=count, dtype=np.uint64)
+    return a, b
+
+
+_PERM_A, _PERM_B = _permutations(MINHASH_PERMUTATIONS)
+
+
+def shingles(text: str, size: int = SHINGLE_WORDS) -> List[str]:
+    """Metni küçük harfli kelimelere böler ve ardışık 'size' kelimelik parçalar (shingle) üretir."""
+    words = [word.lower() for word in _WORD.findall(text)]
+    if len(words) <= size:
+        return [" ".join(words)] if words else []
+    return [" ".join(words[i:i + size]) for i in range(len(words) - size + 1)]
+
+
+def minhash_signature(text: str, max_chars: int = SIGNATURE_MAX_CHARS) -> Optional[np.ndarray]:
+    """
+    Temizlenmiş metnin MinHash imzasını (MINHASH_PERMUTATIONS adet uint32) döner.
+    İki imzanın eşit konumlarının oranı, shingle kümelerinin Jaccard benzerliğini tahmin eder.
+    Metin boşsa None döner.
+    """
+    parts = set(shingles(text[:max_chars]))
+    if not parts:
+        return None
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(part.encode("utf-8"), digest_size=4).digest(), "little") for part in parts),
+        dtype=np.uint64,
+        count=len(parts),
+    )
+    # h_i(x) = (a_i * x + b_i) mod p; taşma numpy'da sarmalanır ve deterministiktir
+    with np.errstate(over="ignore"):
+        permuted = (np.outer(hashes, _PERM_A) + _PERM_B) % _MERSENNE_PRIME & _MAX_HASH
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def jaccard_estimate(first: np.ndarray, second: np.ndarray) -> float:
+    return float(np.mean(first == second))
+
+
+def _band_buckets(signature: np.ndarray, bands: int) -> Iterator[Tuple[int, int]]:
+    rows = len(signature) // bands
+    for band in range(bands):
+        chunk = signature[band * rows:(band + 1) * rows].tobytes()
+        yield band, int.from_bytes(hashlib.blake2b(chunk, digest_size=8).digest(), "little", signed=True)
+
+
+class NearDuplicateIndex:
+    """
+    Özetlenmiş makalelerin MinHash imzalarını tutan, SQLite tabanlı LSH indeksi.
+    İmza bantlara bölünür; en az bir bandı aynı kovaya düşen makaleler aday olur ve
+    adaylar imza karşılaştırmasıyla (tahmini Jaccard) doğrulanır. Tüm indeksi taramaz.
+    """
+
+    def __init__(
+        self,
+        path: str = NEAR_DUPLICATE_INDEX_PATH,
+        threshold: float = NEAR_DUPLICATE_THRESHOLD,
+        bands: int = LSH_BANDS,
+    ):
+        if MINHASH_PERMUTATIONS % bands:
+            raise ValueError("MINHASH_PERMUTATIONS, LSH_BANDS'e tam bölünmelidir.")
+        self.path = path
+        self.threshold = threshold
+        self.bands = bands
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS signatures ("
+                " sha256 TEXT PRIMARY KEY,"
+                " signature BLOB NOT NULL,"
+                " created_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS lsh_buckets ("
+                " band INTEGER NOT NULL,"
+                " bucket INTEGER NOT NULL,"
+                " sha256 TEXT NOT NULL,"
+                " PRIMARY KEY (band, bucket, sha256)) WITHOUT ROWID"
+            )
+
+    @contextmanager
+    def _connect(self):
+        # Her işlem için ayrı bağlantı: thread ve çoklu worker süreçleri için güvenli
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def add(self, digest: str, signature: np.ndarray) -> None:
+        """Makalenin imzasını indekse ekler (aynı hash tekrar eklenirse yok sayılır)."""
+        with self._connect() as conn:
+            inserted = conn.execute(
+                "INSERT OR IGNORE INTO signatures (sha256, signature, created_at) VALUES (?, ?, ?)",
+                (digest, signature.astype(np.uint32).tobytes(), time.time()),
+            ).rowcount
+            if inserted:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO lsh_buckets (band, bucket, sha256) VALUES (?, ?, ?)",
+                    [(band, bucket, digest) for band, bucket in _band_buckets(signature, self.bands)],
+                )
+
+    def find(self, digest: str, signature: np.ndarray) -> Optional[Tuple[str, float]]:
+        """
+        Eşiğin üzerindeki en benzer makaleyi (hash, tahmini Jaccard) döner, yoksa None.
+        Aynı hash'e sahip kayıt (birebir aynı dosya) sonuçlara dahil edilmez.
+        """
+        with self._connect() as conn:
+            candidates = set()
+            for band, bucket in _band_buckets(signature, self.bands):
+                rows = conn.execute(
+                    "SELECT sha256 FROM lsh_buckets WHERE band = ? AND bucket = ?", (band, bucket)
+                ).fetchall()
+                candidates.update(row[0] for row in rows)
+            candidates.discard(digest)
+            best = None
+            for candidate in candidates:
+                row = conn.execute("SELECT signature FROM signatures WHERE sha256 = ?", (candidate,)).fetchone()
+                if row is None:
+                    continue
+                similarity = jaccard_estimate(signature, np.frombuffer(row[0], dtype=np.uint32))
+                if similarity >= self.threshold and (best is None or similarity > best[1]):
+                    best = (candidate, similarity)
+        return best
@@ -0,0 +1,153 @@
+import os
+import json
+import asyncio
+from typing import List, Tuple, Callable, Awaitable, Type, Set
+
+from pydantic import BaseModel, Field, ValidationError, create_model
+
+# Paketleme ayarları ortam değişkenleri ile değiştirilebilir
+PACK_SHORT_ARTICLES = os.getenv("PACK_SHORT_ARTICLES", "0") == "1"
+# Bu uzunluktan kısa metinler (kısa makale, genişletilmiş özet) paketlenir; uzunlar tek başına gider
+PACK_ARTICLE_MAX_CHARS = int(os.getenv("PACK_ARTICLE_MAX_CHARS", "8000"))
+# Tek bir paketli çağrıdaki en fazla makale ve toplam karakter sayısı
+PACK_MAX_ARTICLES = int(os.getenv("PACK_MAX_ARTICLES", "8"))
+PACK_MAX_CHARS = int(os.getenv("PACK_MAX_CHARS", "60000"))
+# İlk makale geldikten sonra diğerlerinin pakete katılması için beklenen süre
+PACK_WAIT_MS = int(os.getenv("PACK_WAIT_MS", "50"))
+
+PACK_INSTRUCTION = (
+    " Sana birden fazla makale veriliyor; her biri 'MAKALE [id=...]' satırıyla başlar. "
+    "Her makale için ayrı bir özet üret, makaleleri birbirine karıştırma ve "
+    "her özeti ilgili makalenin id değeriyle aynen eşleştir."
+)
+
+# (sistem prompt'u, kullanıcı metni, yanıt şeması) -> JSON yanıt metni
+GenerateFn = Callable[[str, str, Type[BaseModel]], Awaitable[str]]
+# Tek makale metni -> doğrulanmış özet (paket doğrulanamazsa kullanılır)
+SummarizeOneFn = Callable[[str], Awaitable[BaseModel]]
+
+
+def make_pack_schema(summary_model: Type[BaseModel]) -> Type[BaseModel]:
+    """Özet modelini, makale kimlikleriyle eşleştirilmiş bir özet listesine saran şemayı üretir."""
+    item = create_model(
+        f"Packed{summary_model.__name__}",
+        id=(str, Field(description="Makalenin girdideki id değeri.")),
+        summary=(summary_model, ...),
+    )
+    return create_model(
+        f"Packed{summary_model.__name__}List",
+        summaries=(List[item], Field(description="Her makale için bir özet.")),
+    )
+
+
+def build_pack_prompt(texts: List[str]) -> str:
+    return "\n\n".join(f"MAKALE [id={i + 1}]:\n{text}" for i, text in enumerate(texts))
+
+
+def parse_pack_response(response_text: str, schema: Type[BaseModel], count: int) -> List[BaseModel]:
+    """
+    Paketli yanıtı doğrular ve özetleri girdi sırasına göre döner.
+    Eksik, fazla veya tekrarlanan id'ler ValueError fırlatır.
+    """
+    packed = schema.model_validate(json.loads(response_text.strip()))
+    by_id = {}
+    for entry in packed.summaries:
+        if entry.id in by_id:
+            raise ValueError(f"Paketli yanıtta tekrarlanan id: {entry.id}")
+        by_id[entry.id] = entry.summary
+    expected = [str(i + 1) for i in range(count)]
+    if sorted(by_id) != sorted(expected):
+        raise ValueError(f"Paketli yanıttaki id'ler eşleşmedi: {sorted(by_id)}")
+    return [by_id[i] for i in expected]
+
+
+class ArticlePacker:
+    """
+    Aynı anda özetlenmek istenen kısa makaleleri tek bir LLM çağrısında toplar.
+    İlk makaleden sonra PACK_WAIT_MS kadar beklenir veya paket dolunca çağrı yapılır;
+    sonuçlar id'lerle her makaleye geri dağıtılır. Paketli yanıt doğrulanamazsa
+    (geçersiz JSON, şema hatası, eksik id) paketteki makaleler tek tek özetlenir.
+    Dakikadaki istek (RPM) kotası bağlayıcı olduğunda çağrı sayısını azaltır.
+    """
+
+    def __init__(
+        self,
+        summary_model: Type[BaseModel],
+        generate: GenerateFn,
+        summarize_one: SummarizeOneFn,
+        system_prompt: str,
+        article_max_chars: int = PACK_ARTICLE_MAX_CHARS,
+        max_articles: int = PACK_MAX_ARTICLES,
+        max_chars: int = PACK_MAX_CHARS,
+        wait_ms: int = PACK_WAIT_MS,
+    ):
+        self.schema = make_pack_schema(summary_model)
+        self.generate = generate
+        self.summarize_one = summarize_one
+        self.system_prompt = system_prompt + PACK_INSTRUCTION
+        self.article_max_chars = article_max_chars
+        self.max_articles = max_articles
+        self.max_chars = max_chars
+        self.wait_seconds = wait_ms / 1000
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._pending_chars = 0
+        self._timer = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def summarize(self, text: str) -> Tuple[BaseModel, int]:
+        """Metni bir pakete ekler ve özetini bekler. (özet, paketteki makale sayısı) döner."""
+        if len(text) > self.article_max_chars:
+            return await self.summarize_one(text), 1
+
+        loop = asyncio.get_running_loop()
+        # Yeni makale paketi taşıracaksa bekleyenler önce gönderilir
+        if self._pending and self._pending_chars + len(text) > self.max_chars:
+            self._flush()
+        future = loop.create_future()
+        self._pending.append((text, future))
+        self._pending_chars += len(text)
+        if len(self._pending) >= self.max_articles:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.wait_seconds, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending, self._pending_chars = self._pending, [], 0
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            # Görev referansı tutulur, aksi halde çöp toplayıcı tarafından silinebilir
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        texts = [text for text, _ in batch]
+        futures = [future for _, future in batch]
+        pack_size = len(batch)
+        try:
+            if len(batch) == 1:
+                results = [await self.summarize_one(texts[0])]
+            else:
+                try:
+                    response_text = await self.generate(self.system_prompt, build_pack_prompt(texts), self.schema)
+                    results = parse_pack_response(response_text, self.schema, len(batch))
+                except (ValueError, ValidationError) as e:
+                    # json.JSONDecodeError da ValueError'dır
+                    print(f"Paketli yanıt doğrulanamadı, {len(batch)} makale tek tek özetlenecek: {e}")
+                    pack_size = 1
+                    results = await asyncio.gather(
+                        *(self.summarize_one(text) for text in texts), return_exceptions=True
+                    )
+        except Exception as e:
+            results = [e] * len(batch)
+
+        for future, result in zip(futures, results):
+            if future.done():
+                continue  # İsteği yapan görev iptal edilmiş
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result((result, pack_size))
@@ -0,0 +1,588 @@
+import os
+import re
+import math
+import time
+import signal
+import threading
+from contextlib import closing, contextmanager
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_EXCEPTION
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, Iterator, Tuple
+
+from extraction_backends import BACKENDS, PdfSource, open_pdf
+from metrics import CHARS_EXTRACTED, CHARS_NORMALIZED_AWAY, PAGES_PARSED, stage
+from text_normalization import NORMALIZATION_VERSION, TEXT_NORMALIZATION, normalize_page_texts
+
+MAX_PAGES = 10  # İlk 10 sayfayı alarak modeli hızlandırmak ve maliyeti düşürmek
+# Bütçe modunda bir dalgada her worker'a verilen ardışık sayfa sayısı. Her iş PDF'i yeniden açar;
+# tek sayfalık işler belge açma maliyetini sayfa sayısı kadar tekrarlar
+BUDGET_PAGES_PER_JOB = 3
+
+# Havuz ve zaman aşımı ayarları ortam değişkenleri ile değiştirilebilir (0 = havuz kapalı)
+EXTRACTION_WORKERS = int(os.getenv("EXTRACTION_WORKERS", str(min(4, os.cpu_count() or 1))))
+EXTRACTION_PAGE_TIMEOUT = float(os.getenv("EXTRACTION_PAGE_TIMEOUT", "10"))
+EXTRACTION_DOC_TIMEOUT = float(os.getenv("EXTRACTION_DOC_TIMEOUT", "60"))
+# Belge başına kaynak sınırları (0 = kapalı); yalnızca süreç havuzunda uygulanır.
+# CPU: belgenin tüm sayfaları için harcanabilecek işlemci süresi (sn). Duvar saati sınırından farkı:
+# sunucu yoğunken bekleyen belgeler cezalandırılmaz, yalnızca gerçekten ağır olanlar durdurulur.
+EXTRACTION_CPU_LIMIT = float(os.getenv("EXTRACTION_CPU_LIMIT", "30"))
+# Bellek: worker'ın bir belge parçasını işlerken ayırabileceği ek bellek (MB, RLIMIT_AS)
+EXTRACTION_MEMORY_LIMIT_MB = int(os.getenv("EXTRACTION_MEMORY_LIMIT_MB", "1024"))
+
+# Metin çıkarma arka ucu: pdfplumber | pdfminer | pdfium | auto
+# auto: önce hızlı arka uç denenir, yeterli metin çıkmazsa pdfplumber'a düşülür
+EXTRACTION_BACKEND = os.getenv("EXTRACTION_BACKEND", "auto")
+EXTRACTION_FAST_BACKEND = os.getenv("EXTRACTION_FAST_BACKEND", "pdfium")
+# Çıkarılan metni etkileyen ayarların özeti; özet önbelleğinin sürümüne katılır
+EXTRACTION_VERSION = f"{EXTRACTION_BACKEND}:normalize-{NORMALIZATION_VERSION if TEXT_NORMALIZATION else 'off'}"
+MIN_TEXT_CHARS = 500  # Endpoint'lerdeki "yeterli metin" eşiği ile aynı
+
+# Bu başlıklardan sonrası (kaynakça, ekler) özet için gerekli değildir; tarama burada durur
+BACK_MATTER_HEADING = re.compile(
+    r"^\s*(?:\d+\.?\s*)?(references|bibliography|kaynaklar|kaynakça|appendix|appendices|ekler)\s*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+
+class PdfExtractionError(ValueError):
+    """PDF metin çıkarma başarısız olduğunda (zaman aşımı, bozuk dosya vb.) fırlatılır."""
+
+
+class PdfExtractionTimeout(PdfExtractionError):
+    """Sayfa veya belge süre sınırı aşıldığında fırlatılır; başka arka uçla yeniden denenmez."""
+
+
+class PdfResourceLimitError(PdfExtractionError):
+    """Belge CPU veya bellek sınırını aştığında fırlatılır; başka arka uçla yeniden denenmez."""
+
+
+class _PageTimeout(Exception):
+    pass
+
+
+class _CpuLimit(Exception):
+    pass
+
+
+def _on_page_timeout(signum, frame):
+    raise _PageTimeout()
+
+
+def _on_cpu_limit(signum, frame):
+    raise _CpuLimit()
+
+
+def _caused_by(error: BaseException, kind: type) -> bool:
+    # pdfplumber/pdfminer, ayrıştırma sırasında oluşan istisnaları kendi türüyle sarmalayabilir
+    while error is not None:
+        if isinstance(error, kind):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def _is_page_timeout(error: BaseException) -> bool:
+    return _caused_by(error, _PageTimeout)
+
+
+def _address_space_bytes() -> Optional[int]:
+    """Sürecin kullandığı sanal adres alanı (bayt); /proc olmayan sistemlerde None."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+@contextmanager
+def resource_limits(cpu_seconds: float = 0.0, memory_mb: int = 0) -> Iterator[None]:
+    """
+    Bloğa CPU süresi (ITIMER_PROF) ve ek bellek (RLIMIT_AS) sınırı koyar; çıkışta eski değerlere
+    döner. Aşılırsa blok içinde _CpuLimit / MemoryError oluşur. Sınırlar tüm sürece uygulandığı
+    için yalnızca havuz worker'larında (ana thread) kullanılır; desteklenmeyen platformlarda
+    ilgili sınır atlanır.
+    """
+    in_main_thread = threading.current_thread() is threading.main_thread()
+    use_cpu = cpu_seconds > 0 and hasattr(signal, "ITIMER_PROF") and in_main_thread
+    previous_memory = None
+    if memory_mb > 0 and in_main_thread:
+        try:
+            import resource
+        except ImportError:
+            resource = None
+        current = _address_space_bytes()
+        if resource is not None and current is not None:
+            soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+            limit = current + memory_mb * 1024 * 1024
+            if hard != resource.RLIM_INFINITY:
+                limit = min(limit, hard)
+            resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+            previous_memory = (resource, soft, hard)
+    if use_cpu:
+        previous_handler = signal.signal(signal.SIGPROF, _on_cpu_limit)
+        signal.setitimer(signal.ITIMER_PROF, cpu_seconds)
+    try:
+        yield
+    finally:
+        if use_cpu:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            signal.signal(signal.SIGPROF, previous_handler)
+        if previous_memory is not None:
+            resource, soft, hard = previous_memory
+            resource.setrlimit(resource.RLIMIT_AS, (soft, hard))
+
+
+@contextmanager
+def _document_limits(cpu_limit: float, memory_limit_mb: int, backend: str) -> Iterator[None]:
+    """
+    Havuz worker'ında bir belge işi için resource_limits uygular; sınır aşımını
+    PdfResourceLimitError olarak fırlatır.
+    """
+    # pdfium bellek ayıramadığında süreci abort eder (havuzdaki diğer belgeler de düşer);
+    # bellek sınırı yalnızca Python arka uçlarına (pdfplumber / pdfminer) uygulanır
+    if backend == "pdfium":
+        memory_limit_mb = 0
+    try:
+        with resource_limits(cpu_limit, memory_limit_mb):
+            yield
+    except Exception as e:
+        if _caused_by(e, _CpuLimit):
+            raise PdfResourceLimitError(
+                f"PDF metin çıkarma CPU sınırını ({cpu_limit:g} sn) aştı; belge çok karmaşık."
+            ) from None
+        if _caused_by(e, MemoryError):
+            raise PdfResourceLimitError(
+                f"PDF metin çıkarma bellek sınırını ({memory_limit_mb} MB) aştı; belge çok karmaşık."
+            ) from None
+        raise
+
+
+def iter_page_texts(doc, page_numbers: List[int], page_timeout: float) -> Iterator[str]:
+    """
+    Sayfa metinlerini tembel (lazy) olarak üretir; tüketici durduğunda kalan sayfalar
+    hiç ayrıştırılmaz. Her sayfa için SIGALRM ile süre sınırı uygulanır, böylece tek
+    bir sayfa worker'ı kilitleyemez.
+    """
+    # SIGALRM yalnızca ana thread'de kurulabilir (worker süreçlerde görevler ana thread'de çalışır)
+    use_alarm = (
+        page_timeout > 0
+        and hasattr(signal, "SIGALRM")
+        and threading.current_thread() is threading.main_thread()
+    )
+    if use_alarm:
+        previous_handler = signal.signal(signal.SIGALRM, _on_page_timeout)
+
+    try:
+        for page_number in page_numbers:
+            if use_alarm:
+                signal.setitimer(signal.ITIMER_REAL, page_timeout)
+            try:
+                text = doc.page_text(page_number)
+            except Exception as e:
+                if not _is_page_timeout(e):
+                    raise
+                raise PdfExtractionTimeout(
+                    f"Sayfa {page_number + 1} metin çıkarma süresi ({page_timeout} sn) aşıldı."
+                ) from None
+            finally:
+                if use_alarm:
+                    signal.setitimer(signal.ITIMER_REAL, 0)
+            yield text or ""
+    finally:
+        if use_alarm:
+            signal.signal(signal.SIGALRM, previous_handler)
+
+
+def cut_back_matter(text: str) -> Tuple[str, bool]:
+    """Sayfada 'References' / 'Appendix' vb. başlığı varsa öncesini ve True döner."""
+    match = BACK_MATTER_HEADING.search(text)
+    if match is None:
+        return text, False
+    return text[:match.start()], True
+
+
+def _clean_length(text: str) -> int:
+    # clean_extracted_text sonrasında bu sayfanın metne katacağı yaklaşık karakter sayısı
+    return len(" ".join(text.split())) + 1
+
+
+def _extract_pages(
+    source: PdfSource,
+    page_numbers: List[int],
+    page_timeout: float,
+    char_budget: Optional[int] = None,
+    backend: str = "pdfplumber",
+    cpu_limit: float = 0.0,
+    memory_limit_mb: int = 0,
+) -> Tuple[List[str], bool, float]:
+    """
+    Verilen sayfaların metnini sırayla çıkarır. Kaynakça/ek başlığına gelindiğinde veya
+    char_budget dolduğunda durur. cpu_limit / memory_limit_mb verilirse (havuz worker'ında)
+    aşıldığında PdfResourceLimitError fırlatılır.
+    (sayfa metinleri, kaynakçaya ulaşıldı mı, harcanan CPU süresi) döner.
+    """
+    texts = []
+    used = 0
+    reached_back_matter = False
+    started = time.process_time()
+    with _document_limits(cpu_limit, memory_limit_mb, backend):
+        with open_pdf(source, backend) as doc:
+            with closing(iter_page_texts(doc, page_numbers, page_timeout)) as pages:
+                for text in pages:
+                    text, reached_back_matter = cut_back_matter(text)
+                    texts.append(text)
+                    used += _clean_length(text)
+                    if reached_back_matter:
+                        break
+                    if char_budget is not None and used >= char_budget:
+                        break
+    return texts, reached_back_matter, time.process_time() - started
+
+
+def _count_pages(
+    source: PdfSource,
+    backend: str = "pdfplumber",
+    cpu_limit: float = 0.0,
+    memory_limit_mb: int = 0,
+) -> Tuple[int, float]:
+    """
+    Belgeyi açıp sayfa sayısını döner. Güvenilmeyen PDF'in ilk ayrıştırması olduğu için
+    havuz worker'ında, sayfa işleriyle aynı CPU/bellek sınırları altında çalışır.
+    (sayfa sayısı, harcanan CPU süresi) döner.
+    """
+    started = time.process_time()
+    with _document_limits(cpu_limit, memory_limit_mb, backend):
+        with open_pdf(source, backend) as doc:
+            page_count = len(doc)
+    return page_count, time.process_time() - started
+
+
+def _warm_up() -> None:
+    """Worker sürecin başlatılmasını ve PDF kütüphanelerinin yüklenmesini tetikler."""
+    import pdfplumber  # noqa: F401
+    import pypdfium2  # noqa: F401
+
+
+def clean_extracted_text(page_texts: List[str]) -> str:
+    """Sayfa metinlerini birleştirir ve boşlukları normalize eder."""
+    extracted_text = "".join(text + "\n" for text in page_texts if text)
+    return " ".join(extracted_text.split()).strip()
+
+
+class PdfExtractionEngine:
+    """
+    Sıcak tutulan bir süreç havuzu üzerinde çalışan PDF metin çıkarma motoru.
+    Bir belgenin sayfaları worker'lara bölünür; aynı anda gelen belgeler de havuzu paylaşır.
+    Sayfa başına ve belge başına zaman aşımı, belge başına CPU ve bellek sınırı uygulanır:
+    sınırı aşan belge tek başına reddedilir, havuzdaki diğer belgeler etkilenmez.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = EXTRACTION_WORKERS,
+        max_pages: int = MAX_PAGES,
+        page_timeout: float = EXTRACTION_PAGE_TIMEOUT,
+        doc_timeout: float = EXTRACTION_DOC_TIMEOUT,
+        backend: str = EXTRACTION_BACKEND,
+        fast_backend: str = EXTRACTION_FAST_BACKEND,
+        cpu_limit: float = EXTRACTION_CPU_LIMIT,
+        memory_limit_mb: int = EXTRACTION_MEMORY_LIMIT_MB,
+        normalize: bool = TEXT_NORMALIZATION,
+    ):
+        if backend != "auto" and backend not in BACKENDS:
+            raise ValueError(f"Bilinmeyen PDF arka ucu: {backend}")
+        self.max_workers = max_workers
+        self.max_pages = max_pages
+        self.page_timeout = page_timeout
+        self.doc_timeout = doc_timeout
+        self.backend = backend
+        self.fast_backend = fast_backend
+        self.cpu_limit = cpu_limit
+        self.memory_limit_mb = memory_limit_mb
+        self.normalize = normalize
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.ready = False
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._pool
+
+    def _reset_pool(self) -> None:
+        # Çöken worker havuzu bozar; bir sonraki istek için yeniden oluşturulur
+        with self._lock:
+            self._pool = None
+
+    def start(self) -> None:
+        """Havuzu önceden başlatır (ilk istekte süreç açma maliyeti ödenmez)."""
+        if self.max_workers > 0:
+            pool = self._get_pool()
+            for future in [pool.submit(_warm_up) for _ in range(self.max_workers)]:
+                future.result()
+        self.ready = True
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        self.ready = False
+
+    def run(self, fn: Callable[..., Any], *args: Any, timeout: Optional[float] = None) -> Any:
+        """
+        Havuzda tek bir iş çalıştırır ve sonucunu döner (örn. sayfa önizlemesi çizimi).
+        fn modül düzeyinde tanımlı olmalıdır (süreçler arası pickle edilir).
+        """
+        if self.max_workers <= 0:
+            return fn(*args)
+        try:
+            future = self._get_pool().submit(fn, *args)
+        except BrokenProcessPool as e:
+            self._reset_pool()
+            raise PdfExtractionError("PDF işleme havuzu kullanılamıyor.") from e
+        timeout = timeout or self.doc_timeout
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError as e:
+            future.cancel()
+            raise PdfExtractionTimeout(f"PDF işleme süresi ({timeout} sn) aşıldı.") from e
+        except BrokenProcessPool as e:
+            self._reset_pool()
+            raise PdfExtractionError("PDF işlenirken worker süreci çöktü.") from e
+
+    def _run_chunks(
+        self,
+        source: PdfSource,
+        chunks: List[List[int]],
+        deadline: float,
+        backend: str,
+        cpu_limit: float = 0.0,
+        char_budget: Optional[int] = None,
+    ) -> List[Tuple[List[str], bool, float]]:
+        """
+        Sayfa parçalarını havuza gönderir ve sonuçları parça sırasıyla döner. char_budget
+        verilirse her parça, kendi metni bütçeyi doldurduğunda kalan sayfalarını atlar.
+        """
+        return self._run_jobs(
+            [
+                (_extract_pages, (source, chunk, self.page_timeout, char_budget, backend, cpu_limit, self.memory_limit_mb))
+                for chunk in chunks
+            ],
+            deadline,
+            "PDF metni çıkarılamadı",
+        )
+
+    def _run_jobs(
+        self,
+        jobs: List[Tuple[Callable[..., Any], Tuple[Any, ...]]],
+        deadline: float,
+        failure: str,
+    ) -> List[Any]:
+        """
+        Bir belgenin işlerini havuza gönderir ve sonuçları iş sırasıyla döner. İlk hata veya
+        belge süre sınırı (deadline) kalan işleri iptal eder; beklenmeyen hatalar
+        "failure: <tür>" mesajlı PdfExtractionError olur.
+        """
+        pool = self._get_pool()
+        try:
+            futures = [pool.submit(fn, *args) for fn, args in jobs]
+        except BrokenProcessPool as e:
+            self._reset_pool()
+            raise PdfExtractionError("PDF işleme havuzu kullanılamıyor.") from e
+
+        timeout = max(0.0, deadline - time.monotonic())
+        done, not_done = wait(futures, timeout=timeout, return_when=FIRST_EXCEPTION)
+        for future in not_done:
+            future.cancel()
+
+        errors = [f.exception() for f in futures if f in done and f.exception() is not None]
+        if errors:
+            error = errors[0]
+            if isinstance(error, PdfExtractionError):
+                raise error
+            if isinstance(error, BrokenProcessPool):
+                self._reset_pool()
+                raise PdfExtractionError("PDF işlenirken worker süreci çöktü.") from error
+            raise PdfExtractionError(f"{failure}: {type(error).__name__}") from error
+        if not_done:
+            raise PdfExtractionTimeout(f"PDF metin çıkarma süresi ({self.doc_timeout} sn) aşıldı.")
+
+        return [future.result() for future in futures]
+
+    def extract_pages(
+        self,
+        source: PdfSource,
+        max_pages: Optional[int] = None,
+        char_budget: Optional[int] = None,
+        backend: str = "pdfplumber",
+    ) -> List[str]:
+        """
+        İlk max_pages (verilmezse motorun varsayılanı) sayfanın ham metinlerini sayfa sırasıyla döner.
+        char_budget verilirse temiz metin bu uzunluğa ulaştığında kalan sayfalar ayrıştırılmaz;
+        kaynakça/ek başlığından sonraki sayfalar her durumda atlanır.
+        """
+        deadline = time.monotonic() + self.doc_timeout
+        page_count, cpu_used = self._page_count(source, backend, deadline)
+        return self._extract_page_range(
+            source, page_count, max_pages, char_budget, backend, 0, deadline, cpu_used
+        )[0]
+
+    def _page_count(self, source: PdfSource, backend: str, deadline: float) -> Tuple[int, float]:
+        """
+        Belgenin sayfa sayısı ve harcanan CPU süresi. PDF API sürecinde hiç açılmaz: havuz açıksa
+        sayım da havuzda, belgenin süre ve CPU/bellek sınırlarıyla yapılır.
+        """
+        if self.max_workers <= 0:
+            # Havuz kapalıysa CPU/bellek sınırı uygulanmaz (sınırlar tüm süreci etkiler)
+            try:
+                page_count, _ = _count_pages(source, backend)
+            except Exception as e:
+                raise PdfExtractionError(f"PDF açılamadı: {type(e).__name__}") from e
+            return page_count, 0.0
+        [(page_count, cpu_seconds)] = self._run_jobs(
+            [(_count_pages, (source, backend, self.cpu_limit, self.memory_limit_mb))], deadline, "PDF açılamadı"
+        )
+        return page_count, cpu_seconds
+
+    def _extract_page_range(
+        self,
+        source: PdfSource,
+        page_count: int,
+        max_pages: Optional[int],
+        char_budget: Optional[int],
+        backend: str,
+        first_page: int,
+        deadline: float,
+        cpu_used: float,
+    ) -> Tuple[List[str], bool, float]:
+        """
+        extract_pages ile aynı, ancak first_page'den başlar; sayfa sayısını (_page_count) ve
+        belgenin süre/CPU bütçesini (deadline, cpu_used) önceki çağrılardan devralır.
+        (sayfa metinleri, bütçe dolduğu için atlanan sayfa kaldı mı, toplam harcanan CPU süresi) döner.
+        """
+        max_pages = max_pages or self.max_pages
+        page_numbers = list(range(first_page, min(page_count, max_pages)))
+
+        if self.max_workers <= 0:
+            texts, reached_back_matter, _ = _extract_pages(source, page_numbers, self.page_timeout, char_budget, backend)
+            return texts, not reached_back_matter and len(texts) < len(page_numbers), cpu_used
+
+        # Tek sayfalık belgeler de havuza gider: tek bir ağır sayfa API sürecinde sınırsız çalışmaz
+        if char_budget is None:
+            # Sayfaları worker sayısı kadar ardışık parçaya böl, hepsini tek dalgada işle
+            chunk_size = max(1, math.ceil(len(page_numbers) / self.max_workers))
+            waves = [[page_numbers[i:i + chunk_size] for i in range(0, len(page_numbers), chunk_size)]]
+        else:
+            # Bütçe varsa her dalgada her worker ardışık BUDGET_PAGES_PER_JOB sayfa işler;
+            # bütçe dolunca sonraki dalgalar hiç başlatılmaz
+            wave_size = self.max_workers * BUDGET_PAGES_PER_JOB
+            waves = [
+                [
+                    page_numbers[j:j + BUDGET_PAGES_PER_JOB]
+                    for j in range(i, min(i + wave_size, len(page_numbers)), BUDGET_PAGES_PER_JOB)
+                ]
+                for i in range(0, len(page_numbers), wave_size)
+            ]
+
+        page_texts = []
+        used = 0
+        for index, wave in enumerate(waves):
+            # Kalan CPU bütçesi dalgadaki parçalara bölünür: parçalar paralel çalıştığı için belgenin
+            # toplam harcaması hiçbir anda belge sınırını aşamaz
+            cpu_left = (self.cpu_limit - cpu_used) / len(wave) if self.cpu_limit > 0 else 0.0
+            budget_left = None if char_budget is None else char_budget - used
+            results = self._run_chunks(source, wave, deadline, backend, cpu_left, budget_left)
+            cpu_used += sum(cpu_seconds for _, _, cpu_seconds in results)
+            if self.cpu_limit > 0 and cpu_used >= self.cpu_limit:
+                raise PdfResourceLimitError(
+                    f"PDF metin çıkarma CPU sınırını ({self.cpu_limit:g} sn) aştı; belge çok karmaşık."
+                )
+            for chunk, (texts, reached_back_matter, _) in zip(wave, results):
+                page_texts.extend(texts)
+                used += sum(_clean_length(text) for text in texts)
+                if reached_back_matter:
+                    return page_texts, False, cpu_used
+                if len(texts) < len(chunk):
+                    # Parça bütçeyi tek başına doldurup erken durdu; sayfalar ardışık kalsın diye
+                    # dalganın sonraki parçaları kullanılmaz (devam çağrısı buradan sürer)
+                    return page_texts, True, cpu_used
+            if char_budget is not None and used >= char_budget:
+                return page_texts, index < len(waves) - 1, cpu_used
+        return page_texts, False, cpu_used
+
+    def backend_chain(self) -> List[str]:
+        """Denenecek arka uçlar, sırasıyla."""
+        if self.backend == "auto":
+            return [self.fast_backend, "pdfplumber"] if self.fast_backend != "pdfplumber" else ["pdfplumber"]
+        return [self.backend]
+
+    def extract(
+        self,
+        source: PdfSource,
+        max_pages: Optional[int] = None,
+        char_budget: Optional[int] = None,
+    ) -> str:
+        """PDF içeriğinden metin çıkarır ve temizler (bkz. extract_with_stats)."""
+        return self.extract_with_stats(source, max_pages, char_budget)[0]
+
+    def extract_with_stats(
+        self,
+        source: PdfSource,
+        max_pages: Optional[int] = None,
+        char_budget: Optional[int] = None,
+    ) -> Tuple[str, Dict[str, int]]:
+        """
+        PDF içeriğinden metin çıkarır ve temizler. Hızlı arka uç MIN_TEXT_CHARS'tan az
+        metin üretirse (veya hata verirse) sıradaki arka uca (pdfplumber) düşülür.
+        char_budget temiz (normalleştirilmiş) metne uygulanır: normalleştirme metni bütçenin
+        altına indirdiyse bütçe dolana kadar sonraki sayfalar da çıkarılır.
+        Temiz metin ve normalleştirme istatistiklerini (chars_saved vb.) döner;
+        normalleştirme kapalıysa istatistikler boştur.
+        """
+        chain = self.backend_chain()
+        for index, backend in enumerate(chain):
+            is_last = index == len(chain) - 1
+            try:
+                deadline = time.monotonic() + self.doc_timeout
+                with stage("extraction"):
+                    # Sayfa sayısı belge başına bir kez alınır; devam çağrıları onu kullanır
+                    page_count, cpu_used = self._page_count(source, backend, deadline)
+                    page_texts, more, cpu_used = self._extract_page_range(
+                        source, page_count, max_pages, char_budget, backend, 0, deadline, cpu_used
+                    )
+                text, stats = self._clean(page_texts)
+                # Sayfalar ham uzunluğa göre bütçelenir; tekrar eden başlıklar, kaynakça vb.
+                # atıldıktan sonra eksik kalan kısım kadar sayfa daha çıkarılır
+                while more and char_budget is not None and len(text) < char_budget:
+                    with stage("extraction"):
+                        extra, more, cpu_used = self._extract_page_range(
+                            source, page_count, max_pages, char_budget - len(text), backend,
+                            len(page_texts), deadline, cpu_used,
+                        )
+                    page_texts.extend(extra)
+                    text, stats = self._clean(page_texts)
+            except PdfExtractionError as e:
+                if is_last or isinstance(e, (PdfExtractionTimeout, PdfResourceLimitError)):
+                    raise
+                print(f"{backend} ile metin çıkarılamadı, pdfplumber deneniyor: {e}")
+                continue
+            PAGES_PARSED.inc(len(page_texts), backend=backend)
+            if len(text) >= MIN_TEXT_CHARS or is_last:
+                CHARS_EXTRACTED.inc(len(text))
+                CHARS_NORMALIZED_AWAY.inc(stats.get("chars_saved", 0))
+                return text, stats
+
+    def _clean(self, page_texts: List[str]) -> Tuple[str, Dict[str, int]]:
+        with stage("cleaning"):
+            if self.normalize:
+                return normalize_page_texts(page_texts)
+            return clean_extracted_text(page_texts), {}
+
+    def extract_many(self, documents: List[PdfSource]) -> List[str]:
+        """Bir toplu işteki belgeleri aynı anda havuza dağıtır; sonuçlar giriş sırasını korur."""
+        if not documents:
+            return []
+        with ThreadPoolExecutor(max_workers=len(documents)) as executor:
+            return list(executor.map(self.extract, documents))
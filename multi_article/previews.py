@@ -0,0 +1,106 @@
+import io
+import os
+import time
+import sqlite3
+from contextlib import contextmanager
+from typing import Optional, Tuple
+
+from extraction_backends import PdfSource, open_pdf
+
+# Önizleme ayarları ortam değişkenleri ile değiştirilebilir
+PREVIEW_WIDTH = int(os.getenv("PREVIEW_WIDTH", "400"))  # piksel
+PREVIEW_FORMAT = os.getenv("PREVIEW_FORMAT", "webp")  # webp | jpeg
+PREVIEW_QUALITY = int(os.getenv("PREVIEW_QUALITY", "70"))
+PREVIEW_CACHE_PATH = os.getenv("PREVIEW_CACHE_PATH", "preview_cache.sqlite3")
+PREVIEW_CACHE_MAX_ENTRIES = int(os.getenv("PREVIEW_CACHE_MAX_ENTRIES", "20000"))
+
+PREVIEW_FORMATS = {"webp": ("WEBP", "image/webp"), "jpeg": ("JPEG", "image/jpeg")}
+
+
+def render_thumbnail(
+    source: PdfSource,
+    width: int = PREVIEW_WIDTH,
+    image_format: str = PREVIEW_FORMAT,
+    quality: int = PREVIEW_QUALITY,
+) -> bytes:
+    """
+    PDF'in ilk sayfasını pdfium ile doğrudan hedef genişlikte çizer ve sıkıştırılmış
+    WebP/JPEG baytları döner. Yüksek çözünürlükte çizip küçültme adımı yoktur.
+    Süreç havuzunda çalıştırılabilmesi için modül düzeyindedir.
+    """
+    pil_format, _ = PREVIEW_FORMATS[image_format]
+    with open_pdf(source, "pdfium") as doc:
+        if len(doc) == 0:
+            raise ValueError("PDF'te sayfa bulunamadı.")
+        image = doc.render(0, width)
+    buffer = io.BytesIO()
+    image.convert("RGB").save(buffer, format=pil_format, quality=quality)
+    return buffer.getvalue()
+
+
+def preview_cache_key(digest: str, width: int, image_format: str, quality: int) -> str:
+    """Önizleme önbellek anahtarı: PDF içeriğinin hash'i + çizim parametreleri."""
+    return f"{digest}:{width}:{image_format}:{quality}"
+
+
+class PreviewCache:
+    """
+    PDF içeriğinin hash'i ile adreslenen, SQLite tabanlı kalıcı önizleme önbelleği.
+    Boyut sınırı aşıldığında en eski erişilen kayıtlar silinir.
+    """
+
+    def __init__(self, path: str = PREVIEW_CACHE_PATH, max_entries: int = PREVIEW_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS previews ("
+                " key TEXT PRIMARY KEY,"
+                " data BLOB NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_previews_accessed ON previews (accessed_at)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        # Her işlem için ayrı bağlantı: thread ve çoklu worker süreçleri için güvenli
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT data FROM previews WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE previews SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        return row[0]
+
+    def set(self, key: str, data: bytes) -> None:
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO previews (key, data, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, sqlite3.Binary(data), now, now),
+            )
+            conn.execute(
+                "DELETE FROM previews WHERE key IN ("
+                " SELECT key FROM previews ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def find(self, digest: str) -> Optional[Tuple[str, bytes]]:
+        """Hash'e ait en son erişilen önizlemeyi (anahtar, baytlar) döner."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT key, data FROM previews WHERE key >= ? AND key < ? ORDER BY accessed_at DESC LIMIT 1",
+                (f"{digest}:", f"{digest};"),
+            ).fetchone()
+        return (row[0], row[1]) if row else None
@@ -0,0 +1,44 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+
+class SingleFlight:
+    """
+    Aynı anahtarla (örn. PDF içeriğinin hash'i) eşzamanlı gelen işleri tek bir işte birleştirir.
+    İlk çağrı işi başlatır; iş sürerken gelen kopyalar aynı sonucu (hata dahil) bekler.
+    Bir anahtarın işi bittiğinde kaydı silinir; sonraki çağrılar yeni iş başlatır
+    (tamamlanmış sonuçlar için özet önbelleği kullanılır).
+
+    İş ayrı bir görevde çalışır ve bekleyenlerin iptali onu iptal etmez. Ancak iş, başlatan
+    isteğe ait kaynakları (örn. isteğin sonunda silinen geçici dosya) kullanıyorsa istek iptal
+    edildiğinde bu kaynaklar iş sürerken kaybolur; iş kendi kaynaklarına sahip olmalıdır
+    (yüklenen PDF için uploads.with_own_reference). Yalnızca aynı süreç (worker) içindeki
+    istekleri birleştirir.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._inflight)
+
+    async def run(self, key: str, work: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Anahtar için süren bir iş varsa onu bekler, yoksa work() ile başlatır.
+        (sonuç, başka bir isteğin sonucu mu paylaşıldı) döner; işin hatası aynen fırlatılır.
+        """
+        task = self._inflight.get(key)
+        shared = task is not None
+        if task is None:
+            task = asyncio.ensure_future(work())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        # shield: bekleyenlerden birinin iptali işi (ve diğer bekleyenleri) iptal etmez
+        return await asyncio.shield(task), shared
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Tüm bekleyenler iptal edildiyse hata hiç okunmamış olur; uyarı basılmasını engeller
+        if not task.cancelled():
+            task.exception()
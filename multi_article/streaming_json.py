@@ -0,0 +1,76 @@
+import json
+from typing import Any, List, Optional, Tuple
+
+
+class JsonFieldStream:
+    """
+    Parça parça gelen bir JSON nesnesinin üst düzey alanlarını, değeri tamamlanır tamamlanmaz
+    döner (örn. akışla üretilen LLM yanıtı). Gelen her karakter bir kez taranır; parçalar
+    anahtar/string ortasında veya kaçış karakterinde bölünebilir.
+
+    Yalnızca tamamlanan alanları bildirir; nesnenin tamamının geçerliliği (ve şema doğrulaması)
+    akış bitince 'text' üzerinden ayrıca yapılmalıdır.
+    """
+
+    def __init__(self):
+        self._parts: List[str] = []
+        self._buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._key: Optional[str] = None
+        self._token_start: Optional[int] = None
+        self._expect_key = True
+
+    @property
+    def text(self) -> str:
+        """Şu ana kadar gelen yanıt metninin tamamı."""
+        return "".join(self._parts) + self._buffer
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Yeni parçayı ekler; bu parçayla tamamlanan (alan, değer) çiftlerini sırasıyla döner."""
+        completed: List[Tuple[str, Any]] = []
+        self._buffer += chunk
+        buffer = self._buffer
+        pos = self._pos
+        while pos < len(buffer):
+            char = buffer[pos]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._expect_key:
+                        self._key = json.loads(buffer[self._token_start:pos + 1])
+                        self._token_start = None
+            elif char == '"':
+                self._in_string = True
+                if self._depth == 1 and self._expect_key:
+                    self._token_start = pos
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]" or (char == "," and self._depth == 1):
+                if self._depth == 1 and self._key is not None and self._token_start is not None:
+                    completed.append((self._key, json.loads(buffer[self._token_start:pos])))
+                    self._key = None
+                    self._token_start = None
+                if char == ",":
+                    self._expect_key = True
+                else:
+                    self._depth -= 1
+            elif char == ":" and self._depth == 1:
+                self._expect_key = False
+                self._token_start = pos + 1
+            pos += 1
+
+        # Tamamlanmış önek bellekte tekrar taranmaz: yalnızca süren değer/anahtar tamponda kalır
+        keep = self._token_start if self._token_start is not None else pos
+        self._parts.append(buffer[:keep])
+        self._buffer = buffer[keep:]
+        self._pos = pos - keep
+        if self._token_start is not None:
+            self._token_start -= keep
+        return completed
@@ -0,0 +1,102 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+from contextlib import contextmanager
+from typing import Optional, Dict, Any
+
+# Önbellek ayarları ortam değişkenleri ile değiştirilebilir
+SUMMARY_CACHE_PATH = os.getenv("SUMMARY_CACHE_PATH", "summary_cache.sqlite3")
+SUMMARY_CACHE_TTL_SECONDS = int(os.getenv("SUMMARY_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+SUMMARY_CACHE_MAX_ENTRIES = int(os.getenv("SUMMARY_CACHE_MAX_ENTRIES", "10000"))
+
+
+def content_hash(contents: bytes) -> str:
+    """PDF baytlarının SHA-256 özetini döner."""
+    return hashlib.sha256(contents).hexdigest()
+
+
+def prompt_version(*parts: str) -> str:
+    """Prompt ve şema metinlerinden kısa bir sürüm kimliği üretir."""
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()[:12]
+
+
+def make_cache_key(digest: str, model: str, version: str) -> str:
+    """Önbellek anahtarı: PDF içeriğinin hash'i (content_hash) + model adı + prompt/şema sürümü."""
+    return f"{digest}:{model}:{version}"
+
+
+class SummaryCache:
+    """
+    PDF içeriğinin hash'i ile adreslenen, SQLite tabanlı kalıcı özet önbelleği.
+    Süresi dolan (TTL) kayıtlar ve en eski erişilen kayıtlar (boyut sınırı) silinir.
+    """
+
+    def __init__(
+        self,
+        path: str = SUMMARY_CACHE_PATH,
+        ttl_seconds: int = SUMMARY_CACHE_TTL_SECONDS,
+        max_entries: int = SUMMARY_CACHE_MAX_ENTRIES,
+    ):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS summaries ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_summaries_accessed ON summaries (accessed_at)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        # Her işlem için ayrı bağlantı: thread ve çoklu worker süreçleri için güvenli
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Anahtara ait geçerli kaydı döner, yoksa veya süresi dolmuşsa None."""
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value, created_at FROM summaries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created_at = row
+            if now - created_at > self.ttl_seconds:
+                conn.execute("DELETE FROM summaries WHERE key = ?", (key,))
+                return None
+            conn.execute(
+                "UPDATE summaries SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+        return json.loads(value)
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """Kaydı yazar ve TTL / boyut sınırına göre eski kayıtları temizler."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO summaries (key, value, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), now, now),
+            )
+            conn.execute(
+                "DELETE FROM summaries WHERE created_at < ?", (now - self.ttl_seconds,)
+            )
+            conn.execute(
+                "DELETE FROM summaries WHERE key IN ("
+                " SELECT key FROM summaries ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
@@ -0,0 +1,106 @@
+import os
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from pydantic import BaseModel, create_model
+
+# İstekle verilebilecek çıktı bütçesi sınırları (token). Alt sınırın altında JSON iskeleti bile sığmaz
+SUMMARY_MIN_OUTPUT_TOKENS = int(os.getenv("SUMMARY_MIN_OUTPUT_TOKENS", "32"))
+SUMMARY_MAX_OUTPUT_TOKENS = int(os.getenv("SUMMARY_MAX_OUTPUT_TOKENS", "8192"))
+
+# Türkçe metinde kelime başına kaba token tahmini; bütçe prompt'ta kelime olarak verilir
+TOKENS_PER_WORD = 2
+# Alan başına JSON anahtarı, tırnak ve ayraçların yaklaşık token maliyeti
+FIELD_OVERHEAD_TOKENS = 8
+
+FIELD_SELECTION_INSTRUCTION = " Yalnızca şemadaki alanları üret ({fields}); diğer konuları özetleme."
+OUTPUT_BUDGET_INSTRUCTION = " Yanıtın tamamı en fazla {words} kelime olsun; alanları buna göre kısa tut."
+
+_selection_models: Dict[Tuple[Type[BaseModel], Tuple[str, ...]], Type[BaseModel]] = {}
+
+
+def parse_summary_fields(value: Optional[str], available: List[str]) -> Optional[Tuple[str, ...]]:
+    """'kategori,ozet_genel' biçimindeki seçimi doğrular; boşsa None (tüm alanlar). Bilinmeyen alan ValueError fırlatır."""
+    if not value or not value.strip():
+        return None
+    names = [name.strip() for name in value.split(",") if name.strip()]
+    unknown = [name for name in names if name not in available]
+    if unknown:
+        raise ValueError(f"Bilinmeyen özet alanı: {', '.join(unknown)}. Geçerli alanlar: {', '.join(available)}")
+    return tuple(names)
+
+
+def _selection_model(model: Type[BaseModel], fields: Tuple[str, ...]) -> Type[BaseModel]:
+    # Alan tanımları (tip, açıklama) tam modelden kopyalanır; aynı seçim için model bir kez üretilir
+    key = (model, fields)
+    if key not in _selection_models:
+        _selection_models[key] = create_model(
+            f"{model.__name__}_{'_'.join(fields)}",
+            **{name: (model.model_fields[name].annotation, model.model_fields[name]) for name in fields},
+        )
+    return _selection_models[key]
+
+
+class SummaryShape:
+    """
+    Bir özet çağrısında üretilecek alanlar ve çıktı bütçesi. Varsayılan biçim (tüm alanlar,
+    bütçe yok) mevcut tam özetle birebir aynıdır. Daraltılmış biçimde yanıt şeması ve prompt
+    yalnızca seçili alanları içerir; bütçe hem prompt'a hem max_output_tokens'a yansır.
+    """
+
+    def __init__(
+        self,
+        model: Type[BaseModel],
+        order: List[str],
+        fields: Optional[Tuple[str, ...]] = None,
+        max_output_tokens: Optional[int] = None,
+    ):
+        # Alanlar her zaman 'order' sırasıyla üretilir (önce kategori): seçimin yazılış sırası önemsizdir
+        selected = tuple(name for name in order if fields is None or name in fields)
+        self.partial = len(selected) < len(order)
+        self.fields = selected
+        self.max_output_tokens = max_output_tokens
+        self.model = _selection_model(model, selected) if self.partial else model
+        self.order = order
+
+    @property
+    def is_default(self) -> bool:
+        return not self.partial and self.max_output_tokens is None
+
+    def stream_schema(self) -> Dict[str, Any]:
+        """Akış modunda kullanılan, alanları üretim sırasına dizilmiş JSON şeması."""
+        schema = self.model.model_json_schema()
+        schema["properties"] = {name: schema["properties"][name] for name in self.fields}
+        return schema
+
+    def system_prompt(self, base: str) -> str:
+        """Temel sistem prompt'una alan seçimi ve çıktı bütçesi talimatlarını ekler."""
+        prompt = base
+        if self.partial:
+            prompt += FIELD_SELECTION_INSTRUCTION.format(fields=", ".join(self.fields))
+        if self.max_output_tokens is not None:
+            words = (self.max_output_tokens - FIELD_OVERHEAD_TOKENS * len(self.fields)) // TOKENS_PER_WORD
+            prompt += OUTPUT_BUDGET_INSTRUCTION.format(words=max(len(self.fields), words))
+        return prompt
+
+    def config_options(self) -> Dict[str, Any]:
+        """GenerateContentConfig'e eklenecek ayarlar."""
+        return {} if self.max_output_tokens is None else {"max_output_tokens": self.max_output_tokens}
+
+    def version(self, base: str) -> str:
+        """Önbellek sürümü: varsayılan biçimde değişmez, aksi halde seçim ve bütçe eklenir."""
+        if self.partial:
+            base = f"{base}:fields={'+'.join(self.fields)}"
+        if self.max_output_tokens is not None:
+            base = f"{base}:out{self.max_output_tokens}"
+        return base
+
+    def project(self, summary: Dict[str, Any]) -> Dict[str, Any]:
+        """Tam özetten yalnızca seçili alanları alır (önbellekteki tam özet yeniden kullanılırken)."""
+        return {name: summary[name] for name in self.fields}
+
+    def describe(self) -> Dict[str, Any]:
+        """Yanıta eklenen biçim bilgisi."""
+        described: Dict[str, Any] = {"fields": list(self.fields)}
+        if self.max_output_tokens is not None:
+            described["max_output_tokens"] = self.max_output_tokens
+        return described
@@ -0,0 +1,18 @@
+import os
+import sys
+import tempfile
+
+# Önbellek/indeks dosyaları her test oturumu için geçici bir klasörde oluşturulur (main import edilmeden önce)
+_WORK_DIR = tempfile.mkdtemp(prefix="multi_article_tests_")
+for _name in (
+    "SUMMARY_CACHE_PATH",
+    "PREVIEW_CACHE_PATH",
+    "CORPUS_INDEX_PATH",
+    "NEAR_DUPLICATE_INDEX_PATH",
+    "JOBS_DB_PATH",
+):
+    os.environ[_name] = os.path.join(_WORK_DIR, f"{_name.lower()}.sqlite3")
+os.environ["JOBS_DIR"] = os.path.join(_WORK_DIR, "jobs")
+os.environ.setdefault("GOOGLE_API_KEY", "test")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,34 @@
+import os
+import threading
+
+from job_queue import JobQueue
+from uploads import SpooledPdf
+
+
+def test_concurrent_submits_of_same_content_share_one_job(tmp_path):
+    queue = JobQueue(db_path=str(tmp_path / "jobs.sqlite3"), jobs_dir=str(tmp_path / "jobs"))
+    barrier = threading.Barrier(8)
+    job_ids = []
+    uploads = []
+
+    def submit(n: int):
+        path = tmp_path / f"upload-{n}.pdf"
+        path.write_bytes(b"%PDF-1.4")
+        pdf = SpooledPdf(str(path), 8, "d" * 64)
+        uploads.append(pdf)
+        barrier.wait()
+        job_ids.append(queue.submit([("a.pdf", "application/pdf", pdf)]))
+
+    threads = [threading.Thread(target=submit, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(set(job_ids)) == 1
+    assert queue.status(job_ids[0])["total"] == 1
+    assert os.listdir(tmp_path / "jobs") == [job_ids[0]]
+    # Yeni iş açmayan gönderimlerin dosyaları çağıranda kalır ve temizlenebilir
+    for pdf in uploads:
+        pdf.close()
+    assert not [name for name in os.listdir(tmp_path) if name.startswith("upload-")]
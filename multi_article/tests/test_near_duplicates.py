@@ -0,0 +1,62 @@
+import asyncio
+import random
+
+import main
+from uploads import SpooledPdf
+
+VOCABULARY = [
+    "model", "data", "transformer", "attention", "loss", "accuracy", "benchmark", "layer",
+    "training", "token", "image", "reward", "policy", "graph", "node",
+]
+
+
+def _article(seed: int) -> str:
+    rng = random.Random(seed)
+    return " ".join(rng.choice(VOCABULARY) for _ in range(2000))
+
+
+def test_disabled_near_duplicates_ignore_borrowed_summary(monkeypatch):
+    original = _article(1)
+    # Aynı makalenin tek kelimesi değişmiş ikinci sürümü
+    revised = original.replace("model", "revised", 1)
+    texts = {"a" * 64: original, "b" * 64: revised}
+    llm_calls = []
+
+    def extract_with_stats(path, max_pages, char_budget):
+        return texts[path], {}
+
+    async def summarize_input(text, pack, shape):
+        llm_calls.append(text)
+        summary = {name: f"{name}-{len(llm_calls)}" for name in main.STREAM_FIELD_ORDER}
+        return main.ArticleSummary(**summary), None
+
+    monkeypatch.setattr(main.extraction_engine, "extract_with_stats", extract_with_stats)
+    monkeypatch.setattr(main, "_summarize_input", summarize_input)
+
+    def summarize(digest: str, near_duplicates: bool):
+        pdf = SpooledPdf(digest, len(texts[digest]), digest, owned=False)
+        return asyncio.run(main._summarize_contents(
+            f"{digest[0]}.pdf", "application/pdf", pdf,
+            compress=False, pack=False, near_duplicates=near_duplicates,
+        ))
+
+    first = summarize("a" * 64, near_duplicates=True)
+    assert first["cache"] == "miss"
+
+    borrowed = summarize("b" * 64, near_duplicates=True)
+    assert borrowed["cache"] == "near_duplicate"
+    assert borrowed["summary"] == first["summary"]
+    assert len(llm_calls) == 1
+
+    # Ödünç özet önbellekte olsa da yakın kopya kullanımı kapalıyken PDF'in kendi özeti üretilir
+    own = summarize("b" * 64, near_duplicates=False)
+    assert own["cache"] == "miss"
+    assert "near_duplicate_of" not in own
+    assert own["summary"] != first["summary"]
+    assert len(llm_calls) == 2
+
+    # Kendi özeti ödünç kaydın yerini alır
+    again = summarize("b" * 64, near_duplicates=True)
+    assert again["cache"] == "hit"
+    assert again["summary"] == own["summary"]
+    assert len(llm_calls) == 2
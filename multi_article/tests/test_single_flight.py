@@ -0,0 +1,60 @@
+import asyncio
+import os
+import threading
+
+import main
+from uploads import SpooledPdf
+
+SHA256 = "c" * 64
+
+
+def test_waiter_survives_leader_cancellation(monkeypatch, tmp_path):
+    text = "we propose a method and report accuracy on the benchmark dataset " * 40
+    extraction_started = threading.Event()
+    release_extraction = threading.Event()
+
+    def extract_with_stats(path, max_pages, char_budget):
+        # Dosya, başlatan istek iptal edildikten sonra okunur
+        extraction_started.set()
+        release_extraction.wait(timeout=10)
+        with open(path, encoding="utf-8") as f:
+            return f.read(), {}
+
+    async def summarize_input(input_text, pack, shape):
+        summary = {name: name for name in main.STREAM_FIELD_ORDER}
+        return main.ArticleSummary(**summary), None
+
+    monkeypatch.setattr(main.extraction_engine, "extract_with_stats", extract_with_stats)
+    monkeypatch.setattr(main, "_summarize_input", summarize_input)
+
+    def spooled(name: str) -> SpooledPdf:
+        path = tmp_path / name
+        path.write_text(text, encoding="utf-8")
+        return SpooledPdf(str(path), len(text), SHA256)
+
+    async def request(pdf: SpooledPdf):
+        # _process_file gibi: istek bitince (iptal dahil) geçici dosya silinir
+        with pdf:
+            return await main._summarize_contents(
+                pdf.path, "application/pdf", pdf, compress=False, pack=False, near_duplicates=False
+            )
+
+    async def scenario():
+        leader = asyncio.create_task(request(spooled("leader.pdf")))
+        await asyncio.to_thread(extraction_started.wait, 10)
+        waiter = asyncio.create_task(request(spooled("waiter.pdf")))
+        await asyncio.sleep(0.05)
+
+        leader.cancel()
+        await asyncio.gather(leader, return_exceptions=True)
+        assert leader.cancelled()
+        assert not (tmp_path / "leader.pdf").exists()
+
+        release_extraction.set()
+        return await waiter
+
+    result = asyncio.run(scenario())
+    assert result["status"] == "Success", result
+    assert result["cache"] == "shared"
+    # İşin kendi referansı iş bitince silinir
+    assert os.listdir(tmp_path) == []
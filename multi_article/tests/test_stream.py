@@ -0,0 +1,30 @@
+import json
+
+from fastapi.testclient import TestClient
+
+import main
+
+
+def test_stream_reports_unexpected_error_as_failed_line(monkeypatch):
+    async def process_file(file, *args):
+        if file.filename == "bad.pdf":
+            raise RuntimeError("beklenmedik hata")
+        return {"filename": file.filename, "status": "Success"}
+
+    async def require_gemini():
+        return None
+
+    monkeypatch.setattr(main, "_process_file", process_file)
+    monkeypatch.setattr(main, "_require_gemini", require_gemini)
+
+    client = TestClient(main.app)
+    files = [
+        ("files", ("good.pdf", b"%PDF-1.4", "application/pdf")),
+        ("files", ("bad.pdf", b"%PDF-1.4", "application/pdf")),
+    ]
+    with client.stream("POST", "/summarize-pdfs/stream", files=files) as response:
+        assert response.status_code == 200
+        lines = [json.loads(line) for line in response.iter_lines() if line]
+
+    statuses = {line["filename"]: line["status"] for line in lines}
+    assert statuses == {"good.pdf": "Success", "bad.pdf": "Failed"}
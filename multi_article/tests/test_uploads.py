@@ -0,0 +1,40 @@
+import asyncio
+import io
+
+from fastapi import UploadFile
+from starlette.datastructures import Headers
+
+import main
+
+
+def _upload(filename: str, content_type: str) -> UploadFile:
+    return UploadFile(io.BytesIO(b"%PDF-1.4"), filename=filename, headers=Headers({"content-type": content_type}))
+
+
+def _process(file: UploadFile):
+    return asyncio.run(main._process_file(file, asyncio.Semaphore(1)))
+
+
+def test_spool_failure_fails_only_that_file(monkeypatch):
+    async def spool_upload(file):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(main, "spool_upload", spool_upload)
+    result = _process(_upload("a.pdf", "application/pdf"))
+    assert result["status"] == "Failed"
+    assert result["filename"] == "a.pdf"
+    assert "OSError" in result["detail"]
+
+
+def test_non_pdf_is_rejected_before_spooling(monkeypatch):
+    spooled = []
+
+    async def spool_upload(file):
+        spooled.append(file.filename)
+        raise AssertionError("PDF olmayan dosya diske yazılmamalı")
+
+    monkeypatch.setattr(main, "spool_upload", spool_upload)
+    result = _process(_upload("notes.txt", "text/plain"))
+    assert result["status"] == "Failed"
+    assert "Yalnızca PDF" in result["detail"]
+    assert spooled == []
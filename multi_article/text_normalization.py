@@ -0,0 +1,147 @@
+import os
+import re
+import math
+from collections import Counter
+from typing import Dict, List, Tuple
+
+# Çıkarılan metinden tekrar eden başlık/altbilgi, sayfa numarası, satır sonu tirelemesi ve
+# kaynakça kuyruğu temizlenir; modele giden karakter bütçesi makale metnine kalır
+TEXT_NORMALIZATION = os.getenv("TEXT_NORMALIZATION", "1") == "1"
+# Temizleme kuralları değiştiğinde artırılır (önbellekteki özetler geçersiz olur)
+NORMALIZATION_VERSION = "2"
+
+# Sayfanın başındaki/sonundaki bu kadar satır başlık/altbilgi adayıdır
+EDGE_LINES = 3
+# Bir kenar satırı sayfaların en az bu oranında (ve en az 2 sayfada) görülürse tekrar eden başlıktır
+REPEATED_LINE_RATIO = 0.5
+# Belge sonunda ardışık en az bu kadar kaynak girdisi varsa kaynakça kuyruğu atılır
+REFERENCE_TAIL_MIN_ENTRIES = 3
+# Kaynak girdileri arasında izin verilen devam satırı sayısı (çok satırlı girdiler)
+REFERENCE_ENTRY_MAX_GAP = 3
+
+_LIGATURES = {
+    "ﬀ": "ff", "ﬁ": "fi", "ﬂ": "fl", "ﬃ": "ffi", "ﬄ": "ffl",
+    "ﬅ": "st", "ﬆ": "st", "\u00ad": "",
+}
+# str.translate Unicode eşlemelerinde karakter başına yavaş; regex yalnızca eşleşmelere dokunur
+_LIGATURE = re.compile("[" + "".join(_LIGATURES) + "]")
+# pdfminer'ın eşleyemediği glifler için ürettiği "(cid:123)" kalıntıları
+_CID = re.compile(r"\(cid:\d+\)")
+_DIGITS = re.compile(r"\d+")
+_PAGE_NUMBER = re.compile(
+    r"^[-–—\s]*(?:(?:page|sayfa|p\.)\s*)?\d{1,4}(?:\s*(?:/|of|\|)\s*\d{1,4})?[-–—\s]*$", re.IGNORECASE
+)
+_BOILERPLATE = re.compile(
+    r"©|\(c\)\s*(?:19|20)\d{2}|copyright|all rights reserved|tüm hakları saklıdır|creative commons|"
+    r"licensed under|downloaded from|this article is protected",
+    re.IGNORECASE,
+)
+# "[12] A. Yazar, ... 2019." / "12. Yazar, A. ... (2019)" / "Yazar, A. B. (2019)."
+_REFERENCE_ENTRY = re.compile(
+    r"^(?:\[\d{1,3}\]|\d{1,3}\.)\s+\S.*\b(?:19|20)\d{2}[a-z]?\b"
+    r"|^[A-ZÇĞİÖŞÜ][\w'’-]+,\s+(?:[A-Z]\.\s*)+.*\((?:19|20)\d{2}[a-z]?\)"
+)
+_LOWER_START = re.compile(r"^[a-zçğıöşüâîû]")
+
+
+def _line_key(line: str) -> str:
+    # Sayfa numarası ve cilt/yıl gibi sayılar maskelenir: "Journal 12 (2021) 345" her sayfada aynı anahtarı verir
+    return _DIGITS.sub("#", line.lower())
+
+
+def _reference_tail_start(lines: List[str]) -> int:
+    """Belge sonundaki kaynak girdisi dizisinin başladığı satır indeksi; yoksa len(lines)."""
+    start = len(lines)
+    entries = 0
+    gap = 0
+    # Yalnızca kuyruk taranır: girdi olmayan satırlar REFERENCE_ENTRY_MAX_GAP'i aşınca durulur
+    for index in range(len(lines) - 1, -1, -1):
+        if _REFERENCE_ENTRY.match(lines[index]):
+            start = index
+            entries += 1
+            gap = 0
+        else:
+            gap += 1
+            if gap > REFERENCE_ENTRY_MAX_GAP:
+                break
+    return start if entries >= REFERENCE_TAIL_MIN_ENTRIES else len(lines)
+
+
+def normalize_page_texts(page_texts: List[str]) -> Tuple[str, Dict[str, int]]:
+    """
+    Sayfa metinlerini doğrusal zamanlı olarak temizler ve birleştirir (birkaç ardışık geçiş):
+
+      - ligatürler (ﬁ, ﬂ, ...), yumuşak tire ve (cid:N) kalıntıları düzeltilir
+      - sayfa başı/sonundaki tekrar eden başlık/altbilgi satırlarının yalnızca ilk görüldüğü yer
+        tutulur; sayfa numaraları ve telif/lisans satırları atılır
+      - satır sonunda tirelenmiş kelimeler birleştirilir ("repre-" + "sentation")
+      - belge sonundaki (başlıksız) kaynakça girdileri atılır
+      - boşluklar clean_extracted_text ile aynı şekilde normalize edilir
+
+    Her satır sabit sayıda işlenir; tekrar sayımı yalnızca kenar satırlarına bakar.
+    Temiz metin ve karakter istatistiklerini döner (chars_saved: eski temizliğe göre kazanç).
+    """
+    pages: List[List[str]] = []
+    original_chars = 0
+    for text in page_texts:
+        collapsed = len(" ".join((text or "").split()))
+        if collapsed:
+            original_chars += collapsed + 1
+        text = _LIGATURE.sub(lambda match: _LIGATURES[match.group()], text or "")
+        if "(cid:" in text:
+            text = _CID.sub(" ", text)
+        lines = []
+        for raw in text.splitlines():
+            line = " ".join(raw.split())
+            if line:
+                lines.append(line)
+        pages.append(lines)
+    original_chars = max(0, original_chars - 1)
+
+    # Kenar satırlarının kaç farklı sayfada geçtiği
+    edge_counts: Counter = Counter()
+    for lines in pages:
+        edges = lines if len(lines) <= 2 * EDGE_LINES else lines[:EDGE_LINES] + lines[-EDGE_LINES:]
+        edge_counts.update({_line_key(line) for line in edges})
+    threshold = max(2, math.ceil(len(pages) * REPEATED_LINE_RATIO))
+
+    kept: List[str] = []
+    # Satırın öncekine boşluksuz eklenip eklenmeyeceği; birleştirme sona bırakılır (uzun zincirler kopyalanmaz)
+    hyphenated: List[bool] = []
+    seen_repeated = set()
+    stats = {"repeated_lines": 0, "page_numbers": 0, "boilerplate_lines": 0, "hyphenations": 0}
+    for lines in pages:
+        for index, line in enumerate(lines):
+            if index < EDGE_LINES or index >= len(lines) - EDGE_LINES:
+                if _PAGE_NUMBER.match(line):
+                    stats["page_numbers"] += 1
+                    continue
+                if _BOILERPLATE.search(line):
+                    stats["boilerplate_lines"] += 1
+                    continue
+                key = _line_key(line)
+                if edge_counts[key] >= threshold:
+                    # İlk görülen yer tutulur: ilk sayfadaki başlık makale başlığı olabilir
+                    if key in seen_repeated:
+                        stats["repeated_lines"] += 1
+                        continue
+                    seen_repeated.add(key)
+            # Sayfa sınırında bölünen kelimeler de birleştirilir (önceki sayfanın son satırı)
+            joined = bool(kept) and kept[-1][-1] == "-" and kept[-1][-2:-1].isalpha() and bool(_LOWER_START.match(line))
+            if joined:
+                kept[-1] = kept[-1][:-1]
+                stats["hyphenations"] += 1
+            kept.append(line)
+            hyphenated.append(joined)
+
+    tail_start = _reference_tail_start(kept)
+    stats["reference_tail_lines"] = len(kept) - tail_start
+    del kept[tail_start:]
+
+    text = "".join(
+        line if index == 0 or hyphenated[index] else " " + line for index, line in enumerate(kept)
+    )
+    stats["original_chars"] = original_chars
+    stats["normalized_chars"] = len(text)
+    stats["chars_saved"] = max(0, original_chars - len(text))
+    return text, stats
@@ -0,0 +1,132 @@
+import os
+import sys
+import shutil
+import asyncio
+import hashlib
+import tempfile
+from typing import Any, Awaitable, Callable, Optional
+
+from fastapi import UploadFile
+
+# Yükleme ayarları ortam değişkenleri ile değiştirilebilir
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(50 * 1024 * 1024)))
+UPLOAD_SPOOL_DIR = os.getenv("UPLOAD_SPOOL_DIR") or None  # None: sistemin geçici klasörü
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+
+
+class UploadTooLargeError(ValueError):
+    """Yüklenen dosya UPLOAD_MAX_BYTES sınırını aştığında fırlatılır."""
+
+
+class SpooledPdf:
+    """
+    Diske yazılmış bir PDF. İçerik belleğe alınmaz; PDF arka uçları dosyayı yolundan açar.
+    owned=True ise close() ile geçici dosya silinir.
+    """
+
+    def __init__(self, path: str, size: int, sha256: str, owned: bool = True):
+        self.path = path
+        self.size = size
+        self.sha256 = sha256
+        self.owned = owned
+
+    @classmethod
+    def from_path(cls, path: str) -> "SpooledPdf":
+        """Diskteki mevcut bir dosyayı (silinmeyecek şekilde) sarar; hash parça parça hesaplanır."""
+        digest = hashlib.sha256()
+        size = 0
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(UPLOAD_CHUNK_BYTES), b""):
+                digest.update(chunk)
+                size += len(chunk)
+        return cls(path, size, digest.hexdigest(), owned=False)
+
+    def share(self) -> "SpooledPdf":
+        """
+        Aynı içeriğe bağımsız bir referans döner: geçici dosya aynı klasöre hard link ile bağlanır
+        (desteklenmiyorsa kopyalanır). İki referans ayrı ayrı kapatılır; biri kapatılınca diğerinin
+        dosyası silinmez. Sahiplenilmeyen dosyalar silinmediği için aynı yol paylaşılır.
+        """
+        if not self.owned:
+            return SpooledPdf(self.path, self.size, self.sha256, owned=False)
+        fd, path = tempfile.mkstemp(suffix=".pdf", dir=os.path.dirname(self.path) or None)
+        os.close(fd)
+        os.remove(path)
+        try:
+            os.link(self.path, path)
+        except OSError:
+            shutil.copyfile(self.path, path)
+        return SpooledPdf(path, self.size, self.sha256)
+
+    def read_bytes(self) -> bytes:
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def close(self) -> None:
+        if self.owned and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __enter__(self) -> "SpooledPdf":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+async def spool_upload(
+    file: UploadFile,
+    max_bytes: int = UPLOAD_MAX_BYTES,
+    directory: Optional[str] = UPLOAD_SPOOL_DIR,
+) -> SpooledPdf:
+    """
+    Yüklenen dosyayı parça parça geçici bir dosyaya yazar ve SHA-256 özetini hesaplar.
+    Bellekte aynı anda en fazla bir parça (UPLOAD_CHUNK_BYTES) tutulur.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    fd, path = tempfile.mkstemp(suffix=".pdf", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_BYTES)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(
+                        f"Dosya boyutu sınırı aşıldı (en fazla {max_bytes // (1024 * 1024)} MB)."
+                    )
+                digest.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        os.remove(path)
+        raise
+    return SpooledPdf(path, size, digest.hexdigest())
+
+
+def with_own_reference(
+    pdf: SpooledPdf, work: Callable[[SpooledPdf], Awaitable[Any]]
+) -> Callable[[], "asyncio.Future[Any]"]:
+    """
+    SingleFlight işi için: iş, PDF'in kendi referansı (share) ile ayrı bir görevde başlatılır ve
+    referans görev bittiğinde (iptal dahil) kapatılır. İşi başlatan istek iptal edilip kendi
+    geçici dosyasını silse de iş (ve onu bekleyen kopyalar) dosyayı okumaya devam eder.
+    """
+    def start() -> "asyncio.Future[Any]":
+        own = pdf.share()
+        task = asyncio.ensure_future(work(own))
+        task.add_done_callback(lambda _: own.close())
+        return task
+    return start
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Sürecin şimdiye kadarki en yüksek bellek kullanımı (MB); desteklenmiyorsa None."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux KB, macOS bayt cinsinden döner
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 1)